@@ -0,0 +1,253 @@
+"""
+Alliance Relationship Graph for Pandora Chronicles Database
+Alliances, clans and companies held in memory as compressed sparse rows
+
+Two undirected edge sets are loaded, each into its own CSR graph:
+  ties   clan - alliance it belongs to (Clan.Alliance_ID), company - clan
+         (Partnership) and company / clan - the alliance a partnership was
+         made under (Partnership.Alliance_ID)
+  wars   attacking alliance - defending alliance (War), one edge per pair
+         weighted by the number of wars they fought
+
+The neighbours of node i are indices[indptr[i]:indptr[i + 1]], with the
+matching edge weights in weights; all three are array('i'), so a graph of
+n nodes and m edges costs 4 * (n + 1 + 4m) bytes and a lookup walks one
+contiguous slice. Allies are alliances sharing a clan or partner company;
+allies of allies are two such steps away.
+
+refresh(conn) reloads an edge set when one of its tables was written
+through operations.invalidate() since it was loaded, or when it is older
+than max_age (writes by other clients), and leaves the other set as is.
+"""
+
+import threading
+import time
+from array import array
+from collections import Counter, deque
+
+DEFAULT_MAX_AGE = 300
+
+ALLIANCE, CLAN, COMPANY = "alliance", "clan", "company"
+
+TIES_TABLES = ("Alliance", "Clan", "Company", "Partnership")
+WARS_TABLES = ("Alliance", "War")
+
+
+class CSRGraph:
+    """Immutable undirected graph over hashable node keys, stored as CSR arrays."""
+
+    def __init__(self, nodes, edges):
+        """nodes: list of keys; edges: iterable of (key, key). Edges to unknown keys are skipped."""
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        pairs = Counter()
+        for a, b in edges:
+            i, j = self.index.get(a), self.index.get(b)
+            if i is None or j is None or i == j:
+                continue
+            pairs[i, j] += 1
+            pairs[j, i] += 1
+
+        counts = [0] * (len(self.nodes) + 1)
+        for i, _ in pairs:
+            counts[i + 1] += 1
+        for i in range(len(self.nodes)):
+            counts[i + 1] += counts[i]
+        ordered = sorted(pairs.items())
+        self.indptr = array("i", counts)
+        self.indices = array("i", (j for (_, j), _ in ordered))
+        self.weights = array("i", (w for _, w in ordered))
+        self._labels = None
+
+    @property
+    def edge_count(self):
+        return len(self.indices) // 2
+
+    def nbytes(self):
+        return sum(a.itemsize * len(a) for a in (self.indptr, self.indices, self.weights))
+
+    def neighbours(self, node):
+        """[(key, weight), ...] of a node, in node order."""
+        i = self.index[node]
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return [(self.nodes[j], w) for j, w in zip(self.indices[start:end], self.weights[start:end])]
+
+    def shortest_path(self, source, target):
+        """Keys on a fewest-hops path from source to target (both included), or None."""
+        s, t = self.index[source], self.index[target]
+        parent = array("i", [-1]) * len(self.nodes)
+        parent[s] = s
+        queue = deque([s])
+        while queue and parent[t] < 0:
+            i = queue.popleft()
+            for j in self.indices[self.indptr[i]:self.indptr[i + 1]]:
+                if parent[j] < 0:
+                    parent[j] = i
+                    queue.append(j)
+        if parent[t] < 0:
+            return None
+        path = [t]
+        while path[-1] != s:
+            path.append(parent[path[-1]])
+        return [self.nodes[i] for i in reversed(path)]
+
+    def component_labels(self):
+        """Component number per node index, computed once per graph."""
+        if self._labels is None:
+            labels = array("i", [-1]) * len(self.nodes)
+            label = 0
+            for root in range(len(self.nodes)):
+                if labels[root] >= 0:
+                    continue
+                labels[root] = label
+                stack = [root]
+                while stack:
+                    i = stack.pop()
+                    for j in self.indices[self.indptr[i]:self.indptr[i + 1]]:
+                        if labels[j] < 0:
+                            labels[j] = label
+                            stack.append(j)
+                label += 1
+            self._labels = labels
+        return self._labels
+
+    def components(self):
+        """Lists of keys per connected component, largest first."""
+        members = {}
+        for i, label in enumerate(self.component_labels()):
+            members.setdefault(label, []).append(self.nodes[i])
+        return sorted(members.values(), key=len, reverse=True)
+
+
+# ============================================================
+# LOADING
+# ============================================================
+def _rows(conn, sql):
+    with conn.cursor() as cur:
+        cur.execute(sql)
+        return cur.fetchall()
+
+
+def load_ties(conn):
+    """CSR graph of alliances, clans and companies joined by membership and partnerships."""
+    alliances = [(ALLIANCE, r["Alliance_ID"]) for r in _rows(conn, "SELECT Alliance_ID FROM Alliance")]
+    companies = [(COMPANY, r["Company_ID"]) for r in _rows(conn, "SELECT Company_ID FROM Company")]
+    clans = _rows(conn, "SELECT Clan_ID, Alliance_ID FROM Clan")
+    partnerships = _rows(conn, "SELECT Company_ID, Clan_ID, Alliance_ID FROM Partnership")
+
+    edges = [((CLAN, r["Clan_ID"]), (ALLIANCE, r["Alliance_ID"])) for r in clans]
+    for r in partnerships:
+        company, clan = (COMPANY, r["Company_ID"]), (CLAN, r["Clan_ID"])
+        edges.append((company, clan))
+        if r["Alliance_ID"] is not None:
+            edges.append((company, (ALLIANCE, r["Alliance_ID"])))
+            edges.append((clan, (ALLIANCE, r["Alliance_ID"])))
+    return CSRGraph(alliances + [(CLAN, r["Clan_ID"]) for r in clans] + companies, edges)
+
+
+def load_wars(conn):
+    """CSR graph of alliances joined by the wars fought between them."""
+    alliances = [r["Alliance_ID"] for r in _rows(conn, "SELECT Alliance_ID FROM Alliance")]
+    wars = _rows(conn, "SELECT Attack_Alliance_ID, Defense_Alliance_ID FROM War")
+    return CSRGraph(alliances, ((r["Attack_Alliance_ID"], r["Defense_Alliance_ID"]) for r in wars))
+
+
+EDGE_SETS = {
+    "ties": (TIES_TABLES, load_ties),
+    "wars": (WARS_TABLES, load_wars),
+}
+
+
+# ============================================================
+# ALLIANCE GRAPH
+# ============================================================
+class AllianceGraph:
+    """
+    Both edge sets, reloaded on demand by refresh(). A reload swaps in a
+    new graph, so queries running in other threads never see a half-built one.
+    """
+
+    def __init__(self, cache=None, max_age=DEFAULT_MAX_AGE):
+        self.cache = cache                # QueryCache whose invalidations mark writes
+        self.max_age = max_age
+        self._graphs = {}                 # edge set -> (graph, versions, loaded_at)
+        self._lock = threading.Lock()
+        self.reloads = 0
+
+    def _versions(self, tables):
+        return self.cache.versions(tables) if self.cache is not None else None
+
+    def stale(self):
+        """Edge sets refresh() would reload."""
+        now = time.monotonic()
+        stale = []
+        for name, (tables, _) in EDGE_SETS.items():
+            loaded = self._graphs.get(name)
+            if (loaded is None or loaded[1] != self._versions(tables)
+                    or now - loaded[2] >= self.max_age):
+                stale.append(name)
+        return stale
+
+    def refresh(self, conn, force=False):
+        """Reloads the stale edge sets, or all of them with force. Returns the names reloaded."""
+        with self._lock:
+            names = list(EDGE_SETS) if force else self.stale()
+            for name in names:
+                tables, load = EDGE_SETS[name]
+                # Taken before loading: a write racing the load marks it stale again
+                versions = self._versions(tables)
+                graph = load(conn)
+                conn.commit()             # end the read snapshot
+                self._graphs[name] = (graph, versions, time.monotonic())
+                self.reloads += 1
+        return names
+
+    def graph(self, name):
+        """The CSR graph of an edge set ("ties" or "wars") as of the last refresh."""
+        return self._graphs[name][0]
+
+    def has_alliance(self, alliance_id):
+        return alliance_id in self.graph("wars").index
+
+    def allies(self, alliance_id, depth=2):
+        """
+        {alliance_id: degree} of the alliances up to depth steps away: degree
+        1 shares a clan or partner company with the alliance, degree 2 with
+        one of those, and so on.
+        """
+        ties = self.graph("ties")
+        start = (ALLIANCE, alliance_id)
+        if start not in ties.index:
+            raise KeyError(alliance_id)
+        degree = {start: 0}
+        frontier = [start]
+        for step in range(1, depth + 1):
+            reached = []
+            for alliance in frontier:
+                for member, _ in ties.neighbours(alliance):
+                    for other, _ in ties.neighbours(member):
+                        if other[0] == ALLIANCE and other not in degree:
+                            degree[other] = step
+                            reached.append(other)
+            frontier = reached
+        del degree[start]
+        return {key[1]: d for key, d in degree.items()}
+
+    def opponents(self, alliance_id):
+        """{alliance_id: wars fought} of the alliances it attacked or defended against."""
+        return dict(self.graph("wars").neighbours(alliance_id))
+
+    def conflict_path(self, from_id, to_id):
+        """Alliance IDs on a shortest chain of wars from one alliance to another, or None."""
+        return self.graph("wars").shortest_path(from_id, to_id)
+
+    def components(self, name="ties"):
+        """Connected components of an edge set, largest first."""
+        return self.graph(name).components()
+
+    def stats(self):
+        """Size and age of each loaded edge set."""
+        now = time.monotonic()
+        return [{"Edge_Set": name, "Nodes": len(graph.nodes), "Edges": graph.edge_count,
+                 "Bytes": graph.nbytes(), "Age_Seconds": round(now - loaded_at, 1)}
+                for name, (graph, _, loaded_at) in self._graphs.items()]
@@ -0,0 +1,315 @@
+"""
+Benchmark Harness for the Pandora Chronicles read operations
+Runs the SQL behind the READ operations (the paged listings as the first
+and a deep keyset page), the windowed threat read, full-text search, the
+typeahead pickers and the delete-alliance impact preview non-interactively
+with warmup and repeats, and reports latency percentiles, throughput and
+EXPLAIN plans
+
+Usage:
+    python benchmark.py                                # current database contents
+    python benchmark.py --scales 1,100,1000 --output bench.json
+    python benchmark.py --baseline bench.json          # fail on p95 regressions
+
+--scales reloads the database with generate_data.py before each run and
+therefore DELETES all existing rows.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+
+import pymysql
+
+import generate_data
+from db_pool import create_pool
+from operations import SEARCH_LIMIT, SEARCH_MODES, TYPEAHEAD_LIMIT, like_prefix, window_hours
+from pagination import KeysetPager
+from queries import (
+    HUMANS_BY_COMPANY_SQL, NAVI_BY_CLAN_SQL, ALLIANCE_RESOURCES_SQL,
+    WAR_ACTIVE_CLANS_SQL, WAR_HISTORY_SQL, SITES_BY_ECOSYSTEM_SQL, ECOSYSTEM_THREAT_SQL,
+    ECOSYSTEM_THREAT_WINDOW_SQL, SEARCH_REPORTS_SQL, SEARCH_ALLIANCES_SQL,
+    AVAILABLE_HUMANS_SQL, AVAILABLE_NAVI_SQL,
+    AVATAR_LINKS_LISTING, NAVI_BONDED_ANIMALS_LISTING, COMPANY_CLAN_PARTNERSHIPS_LISTING,
+    ALLIANCE_IMPACT_SQL, ALLIANCE_IMPACT_ONE_SQL,
+)
+
+# ============================================================
+# BENCHMARKED OPERATIONS
+# ============================================================
+# operation -> (sql, query returning candidate IDs or None, id -> params)
+READ_BENCHMARKS = {
+    "view_humans_by_company": (
+        HUMANS_BY_COMPANY_SQL, "SELECT Company_ID FROM Company", lambda i: (i,)),
+    "view_navi_by_clan": (
+        NAVI_BY_CLAN_SQL, "SELECT Clan_ID FROM Clan", lambda i: (i,)),
+    "view_alliance_resources": (ALLIANCE_RESOURCES_SQL, None, None),
+    "view_war_active_clans": (WAR_ACTIVE_CLANS_SQL, None, lambda i: (1,)),
+    "view_war_history": (
+        WAR_HISTORY_SQL, "SELECT Alliance_ID FROM Alliance", lambda i: (i, i)),
+    "view_sites_by_ecosystem": (
+        SITES_BY_ECOSYSTEM_SQL, "SELECT Eco_ID FROM Ecosystem", lambda i: (i,)),
+    "ecosystem_threat_analysis": (ECOSYSTEM_THREAT_SQL, None, None),
+    "ecosystem_threat_window_7d": (
+        ECOSYSTEM_THREAT_WINDOW_SQL, None, lambda i: (window_hours("7d"),)),
+    "search_reports": (
+        SEARCH_REPORTS_SQL.format(mode=SEARCH_MODES["natural"], filters=""),
+        "SELECT SUBSTRING_INDEX(TRIM(Threat_Description), ' ', 1) FROM Report_Observation "
+        "WHERE Threat_Description IS NOT NULL",
+        lambda word: (word, word, SEARCH_LIMIT)),
+    "search_alliances": (
+        SEARCH_ALLIANCES_SQL.format(mode=SEARCH_MODES["natural"]),
+        "SELECT SUBSTRING_INDEX(TRIM(Objective), ' ', 1) FROM Alliance "
+        "WHERE Objective IS NOT NULL",
+        lambda word: (word, word, SEARCH_LIMIT)),
+    "available_humans": (
+        AVAILABLE_HUMANS_SQL.format(filters="AND h.L_Name LIKE %s"),
+        "SELECT LEFT(L_Name, 2) FROM Human",
+        lambda prefix: (like_prefix(str(prefix)), TYPEAHEAD_LIMIT)),
+    "available_navi": (
+        AVAILABLE_NAVI_SQL.format(filters="AND n.Name LIKE %s"),
+        "SELECT LEFT(Name, 2) FROM Navi",
+        lambda prefix: (like_prefix(str(prefix)), TYPEAHEAD_LIMIT)),
+    "delete_alliance_impact_all": (ALLIANCE_IMPACT_SQL, None, None),
+    "delete_alliance_impact": (
+        ALLIANCE_IMPACT_ONE_SQL, "SELECT Alliance_ID FROM Alliance", lambda i: (i,)),
+}
+
+# Keyset-paged listings (READ 3, 4, 6), benchmarked as the queries
+# KeysetPager issues: the first page, and the page starting
+# DEEP_PAGE_FRACTION of the way into the listing
+PAGED_LISTINGS = {
+    "view_avatar_links": AVATAR_LINKS_LISTING,
+    "view_navi_bonded_animals": NAVI_BONDED_ANIMALS_LISTING,
+    "view_company_clan_partnerships": COMPANY_CLAN_PARTNERSHIPS_LISTING,
+}
+PAGE_SIZE = 25                 # main_app.PAGE_SIZE
+DEEP_PAGE_FRACTION = 0.9
+
+# operation -> (listing, deep page?)
+PAGE_BENCHMARKS = {}
+for _name, _listing in PAGED_LISTINGS.items():
+    PAGE_BENCHMARKS[f"{_name}_first_page"] = (_listing, False)
+    PAGE_BENCHMARKS[f"{_name}_deep_page"] = (_listing, True)
+
+BENCHMARKS = list(READ_BENCHMARKS) + list(PAGE_BENCHMARKS)
+
+# Candidate IDs sampled per operation so parameterized reads vary
+MAX_SAMPLE_IDS = 1000
+
+
+# ============================================================
+# MEASUREMENT
+# ============================================================
+def percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * pct / 100.0
+    lower = int(pos)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (pos - lower)
+
+
+def sample_params(conn, id_query, build, rng):
+    """Returns a list of parameter tuples to cycle through."""
+    if build is None:
+        return [None]
+    if id_query is None:
+        return [build(None)]
+    with conn.cursor() as cur:
+        cur.execute(f"{id_query} LIMIT {MAX_SAMPLE_IDS}")
+        ids = [next(iter(row.values())) for row in cur.fetchall()]
+    if not ids:
+        return [build(0)]
+    rng.shuffle(ids)
+    return [build(i) for i in ids]
+
+
+def listing_page(conn, listing, deep):
+    """
+    (sql, [params]) of a listing's first page, or of the page that starts
+    DEEP_PAGE_FRACTION of the way in (seeking from the key of the row before it).
+    """
+    pager = KeysetPager(conn, listing, PAGE_SIZE)
+    key = None
+    if deep:
+        where = f"WHERE {listing['where']}" if listing.get("where") else ""
+        keys = ", ".join(f"{expr} AS _seek_{i}" for i, (expr, _) in enumerate(listing["sort"]))
+        order_by = ", ".join(f"{expr} {direction}" for expr, direction in listing["sort"])
+        with conn.cursor() as cur:
+            cur.execute(f"SELECT COUNT(*) AS cnt FROM {listing['from']} {where}")
+            offset = int(cur.fetchone()["cnt"] * DEEP_PAGE_FRACTION)
+            cur.execute(f"SELECT {keys} FROM {listing['from']} {where} "
+                        f"ORDER BY {order_by} LIMIT 1 OFFSET %s", (max(offset - 1, 0),))
+            row = cur.fetchone()
+        if row:
+            key = [row[f"_seek_{i}"] for i in range(len(listing["sort"]))]
+    sql, params = pager.page_query(key)
+    return sql, [params]
+
+
+def prepare(conn, name, rng):
+    """(sql, parameter sets to cycle through) of a benchmarked operation."""
+    if name in PAGE_BENCHMARKS:
+        listing, deep = PAGE_BENCHMARKS[name]
+        return listing_page(conn, listing, deep)
+    sql, id_query, build = READ_BENCHMARKS[name]
+    return sql, sample_params(conn, id_query, build, rng)
+
+
+def explain(conn, sql, params):
+    """Returns the EXPLAIN FORMAT=JSON plan for a query as a dict."""
+    with conn.cursor() as cur:
+        cur.execute("EXPLAIN FORMAT=JSON " + sql, params)
+        row = cur.fetchone()
+    return json.loads(next(iter(row.values())))
+
+
+def run_operation(conn, sql, param_sets, warmup, repeat):
+    """Executes a query warmup + repeat times and returns timing stats."""
+    timings = []
+    total_rows = 0
+    for n in range(warmup + repeat):
+        params = param_sets[n % len(param_sets)]
+        started = time.perf_counter()
+        with conn.cursor() as cur:
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+        elapsed = time.perf_counter() - started
+        if n >= warmup:
+            timings.append(elapsed)
+            total_rows += len(rows)
+
+    timings.sort()
+    total_time = sum(timings)
+    return {
+        "runs": repeat,
+        "p50_ms": round(percentile(timings, 50) * 1000, 3),
+        "p95_ms": round(percentile(timings, 95) * 1000, 3),
+        "p99_ms": round(percentile(timings, 99) * 1000, 3),
+        "mean_ms": round(total_time / repeat * 1000, 3),
+        "rows_per_run": round(total_rows / repeat, 1),
+        "rows_per_sec": round(total_rows / total_time, 1) if total_time else 0.0,
+    }
+
+
+def run_suite(conn, operations, warmup, repeat, with_explain=True, seed=42):
+    """Benchmarks every named operation against the current database."""
+    rng = random.Random(seed)
+    results = {}
+    for name in operations:
+        sql, param_sets = prepare(conn, name, rng)
+        stats = run_operation(conn, sql, param_sets, warmup, repeat)
+        if with_explain:
+            stats["explain"] = explain(conn, sql, param_sets[0])
+        results[name] = stats
+        print(f"  {name:<32} p50 {stats['p50_ms']:>9.2f}ms  p95 {stats['p95_ms']:>9.2f}ms  "
+              f"p99 {stats['p99_ms']:>9.2f}ms  {stats['rows_per_sec']:>12,.0f} rows/s",
+              file=sys.stderr)
+    return results
+
+
+def table_sizes(conn):
+    """Row counts per table, recorded alongside each run."""
+    sizes = {}
+    with conn.cursor() as cur:
+        for table in generate_data.TABLE_ORDER:
+            cur.execute(f"SELECT COUNT(*) AS cnt FROM {table}")
+            sizes[table] = cur.fetchone()["cnt"]
+    return sizes
+
+
+def find_regressions(results, baseline, tolerance):
+    """Lists operations whose p95 grew more than tolerance over the baseline."""
+    regressions = []
+    for scale, ops in results.items():
+        for name, stats in ops["operations"].items():
+            old = baseline.get(scale, {}).get("operations", {}).get(name)
+            if not old or not old["p95_ms"]:
+                continue
+            ratio = stats["p95_ms"] / old["p95_ms"]
+            if ratio > 1 + tolerance:
+                regressions.append((scale, name, old["p95_ms"], stats["p95_ms"], ratio))
+    return regressions
+
+
+# ============================================================
+# MAIN ENTRY POINT
+# ============================================================
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the READ operations.")
+    parser.add_argument("--scales",
+                        help="comma-separated scale factors to regenerate and test "
+                             "(destroys existing data); default: use current data")
+    parser.add_argument("--skew", type=float, default=1.0)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--ops", help="comma-separated subset of operations")
+    parser.add_argument("--no-explain", action="store_true")
+    parser.add_argument("--output", help="write JSON results here (default stdout)")
+    parser.add_argument("--baseline", help="earlier JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed p95 slowdown vs. baseline (0.25 = 25%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    operations = args.ops.split(",") if args.ops else BENCHMARKS
+    unknown = [op for op in operations if op not in BENCHMARKS]
+    if unknown:
+        print(f"✗ Unknown operations: {', '.join(unknown)}", file=sys.stderr)
+        sys.exit(2)
+
+    results = {}
+    pool = create_pool(pool_size=1)
+    try:
+        with pool.connection() as conn:
+            scales = [float(s) for s in args.scales.split(",")] if args.scales else [None]
+            for scale in scales:
+                label = "current" if scale is None else f"{scale:g}x"
+                if scale is not None:
+                    print(f"\nLoading scale {label}...", file=sys.stderr)
+                    generator = generate_data.DatasetGenerator(scale, args.skew)
+                    generate_data.load_into_database(conn, generator, 5000, truncate=True)
+                    with conn.cursor() as cur:
+                        for table in generate_data.TABLE_ORDER:
+                            cur.execute(f"ANALYZE TABLE {table}")
+                            cur.fetchall()
+                print(f"\nBenchmarking dataset: {label}", file=sys.stderr)
+                results[label] = {
+                    "table_rows": table_sizes(conn),
+                    "operations": run_suite(conn, operations, args.warmup, args.repeat,
+                                            not args.no_explain),
+                }
+    except pymysql.Error as e:
+        print(f"✗ Database error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        pool.close()
+
+    report = json.dumps(results, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as out:
+            out.write(report)
+        print(f"\n✓ Results written to {args.output}", file=sys.stderr)
+    else:
+        print(report)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.tolerance)
+        for scale, name, old, new, ratio in regressions:
+            print(f"✗ REGRESSION [{scale}] {name}: p95 {old:.2f}ms -> {new:.2f}ms "
+                  f"({ratio:.2f}x)", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print("✓ No p95 regressions against baseline", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
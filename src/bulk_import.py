@@ -0,0 +1,305 @@
+"""
+Bulk Import for Pandora Chronicles Database
+Loads Humans or Na'vi from CSV / JSON-lines files
+
+Input columns match the table columns:
+    humans:  F_Name, L_Name, Rank, Weapon_Type, Company_ID [, State]
+    navi:    Name, Age, Clan_ID [, State]
+State is the new Soul's state and defaults to 'Alive'.
+
+The file is streamed; every chunk of rows is validated in Python, gets its
+Soul rows from one multi-row INSERT and is inserted with multi-row
+statements in a single transaction. Rows that fail validation are reported
+with their line number and skipped. If the database rejects a chunk it is
+retried row by row, so one bad row only costs its own insert.
+
+Usage:
+    python bulk_import.py humans operatives.csv
+    python bulk_import.py navi omaticaya.jsonl --chunk-size 5000
+    python bulk_import.py humans operatives.csv --rejects rejected.jsonl
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+import weakref
+
+import pymysql
+
+from db_pool import create_pool
+
+SOUL_STATES = ("Alive", "Deceased", "Linked_to_Eywa")
+
+# kind -> target table, (column, required, type, max length), referenced table
+ENTITIES = {
+    "humans": {
+        "table": "Human",
+        "columns": [
+            ("F_Name", True, str, 100),
+            ("L_Name", True, str, 100),
+            ("Rank", False, str, 50),
+            ("Weapon_Type", False, str, 100),
+            ("Company_ID", False, int, None),
+        ],
+        "reference": ("Company_ID", "SELECT Company_ID FROM Company"),
+    },
+    "navi": {
+        "table": "Navi",
+        "columns": [
+            ("Name", True, str, 100),
+            ("Age", False, int, None),
+            ("Clan_ID", False, int, None),
+        ],
+        "reference": ("Clan_ID", "SELECT Clan_ID FROM Clan"),
+    },
+}
+
+
+class RejectedRow(ValueError):
+    """A record that cannot be imported; the message is the reason."""
+
+
+# ============================================================
+# READING
+# ============================================================
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    raise ValueError(f"cannot tell the format of {path}; pass --format")
+
+
+def read_records(stream, fmt):
+    """Yields (line_number, record dict) without loading the whole file."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, RejectedRow(f"invalid JSON: {e.msg}")
+            continue
+        if not isinstance(record, dict):
+            yield line_number, RejectedRow("expected a JSON object")
+            continue
+        yield line_number, record
+
+
+# ============================================================
+# VALIDATION
+# ============================================================
+def clean_record(record, spec, valid_refs):
+    """Returns (state, column values) or raises RejectedRow."""
+    values = []
+    for column, required, kind, max_length in spec["columns"]:
+        value = record.get(column)
+        if isinstance(value, str):
+            value = value.strip()
+        if value in (None, ""):
+            if required:
+                raise RejectedRow(f"{column} is required")
+            values.append(None)
+            continue
+        if kind is int:
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                raise RejectedRow(f"{column} must be an integer, got {value!r}")
+        else:
+            value = str(value)
+            if len(value) > max_length:
+                raise RejectedRow(f"{column} longer than {max_length} characters")
+        values.append(value)
+
+    ref_column = spec["reference"][0]
+    ref_value = values[[c[0] for c in spec["columns"]].index(ref_column)]
+    if ref_value is not None and ref_value not in valid_refs:
+        raise RejectedRow(f"unknown {ref_column} {ref_value}")
+
+    state = record.get("State") or "Alive"
+    if state not in SOUL_STATES:
+        raise RejectedRow(f"State must be one of {', '.join(SOUL_STATES)}")
+    return state, values
+
+
+# ============================================================
+# LOADING
+# ============================================================
+# connection -> @@auto_increment_increment, read once per connection
+_AUTO_INCREMENT_STEPS = weakref.WeakKeyDictionary()
+
+
+def auto_increment_step(conn):
+    """
+    Gap between the AUTO_INCREMENT values one multi-row INSERT assigns:
+    @@auto_increment_increment, 1 on a single server but e.g. 7 under
+    Group Replication.
+    """
+    step = _AUTO_INCREMENT_STEPS.get(conn)
+    if step is None:
+        with conn.cursor() as cur:
+            cur.execute("SELECT @@auto_increment_increment AS step")
+            step = _AUTO_INCREMENT_STEPS[conn] = int(cur.fetchone()["step"])
+    return step
+
+
+def insert_sql(spec):
+    columns = ", ".join(f"`{c[0]}`" for c in spec["columns"])
+    placeholders = ", ".join(["%s"] * (len(spec["columns"]) + 1))
+    return f"INSERT INTO {spec['table']} ({columns}, Soul_ID) VALUES ({placeholders})"
+
+
+def insert_chunk(conn, spec, rows):
+    """
+    Inserts [(state, values), ...] in one transaction: one multi-row Soul
+    INSERT, then the entities with multi-row statements.
+    """
+    step = auto_increment_step(conn)
+    with conn.cursor() as cur:
+        # A single multi-row INSERT gets one block of AUTO_INCREMENT values,
+        # step apart, and lastrowid is the first of them
+        cur.execute("INSERT INTO Soul (State) VALUES " + ", ".join(["(%s)"] * len(rows)),
+                    [state for state, _ in rows])
+        first_soul = cur.lastrowid
+        if cur.rowcount != len(rows):
+            raise pymysql.DataError(f"expected {len(rows)} Soul rows, got {cur.rowcount}")
+        cur.executemany(insert_sql(spec), [(*values, first_soul + i * step)
+                                           for i, (_, values) in enumerate(rows)])
+    conn.commit()
+
+
+def load_chunk(conn, spec, chunk, rejected):
+    """
+    Inserts a chunk of (line, state, values); when the database refuses the
+    chunk it is retried one row per transaction and failures are rejected.
+    Returns the number of rows imported.
+    """
+    try:
+        insert_chunk(conn, spec, [(state, values) for _, state, values in chunk])
+        return len(chunk)
+    except (pymysql.IntegrityError, pymysql.DataError):
+        conn.rollback()
+
+    imported = 0
+    for line, state, values in chunk:
+        try:
+            insert_chunk(conn, spec, [(state, values)])
+            imported += 1
+        except (pymysql.IntegrityError, pymysql.DataError) as e:
+            conn.rollback()
+            rejected.append((line, f"database error: {e.args[-1]}"))
+    return imported
+
+
+def import_records(conn, kind, records, chunk_size=1000, on_reject=None):
+    """
+    Imports (line, record) pairs into the table for kind ("humans" or "navi").
+    on_reject(line, reason, record) is called for every skipped row.
+    Returns (imported, rejected) counts.
+    """
+    spec = ENTITIES[kind]
+    with conn.cursor() as cur:
+        cur.execute(spec["reference"][1])
+        valid_refs = {row[spec["reference"][0]] for row in cur.fetchall()}
+
+    imported = 0
+    rejected_count = 0
+    chunk = []
+    records_by_line = {}
+
+    def flush():
+        nonlocal imported, rejected_count
+        rejected = []
+        imported += load_chunk(conn, spec, chunk, rejected)
+        for line, reason in rejected:
+            rejected_count += 1
+            if on_reject:
+                on_reject(line, reason, records_by_line.get(line))
+        chunk.clear()
+        records_by_line.clear()
+
+    for line, record in records:
+        try:
+            if isinstance(record, RejectedRow):
+                raise record
+            state, values = clean_record(record, spec, valid_refs)
+        except RejectedRow as e:
+            rejected_count += 1
+            if on_reject:
+                on_reject(line, str(e), record if isinstance(record, dict) else None)
+            continue
+        chunk.append((line, state, values))
+        records_by_line[line] = record
+        if len(chunk) >= chunk_size:
+            flush()
+    if chunk:
+        flush()
+    return imported, rejected_count
+
+
+def import_file(conn, kind, path, fmt=None, chunk_size=1000, on_reject=None):
+    """Streams a CSV / JSON-lines file into the database; see import_records."""
+    fmt = fmt or detect_format(path)
+    with open(path, newline="", encoding="utf-8") as stream:
+        return import_records(conn, kind, read_records(stream, fmt), chunk_size, on_reject)
+
+
+# ============================================================
+# MAIN ENTRY POINT
+# ============================================================
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import Humans or Na'vi.")
+    parser.add_argument("kind", choices=sorted(ENTITIES))
+    parser.add_argument("path", help="CSV or JSON-lines file")
+    parser.add_argument("--format", choices=["csv", "jsonl"],
+                        help="input format (default: from the file extension)")
+    parser.add_argument("--chunk-size", type=int, default=1000,
+                        help="rows per transaction")
+    parser.add_argument("--rejects",
+                        help="write rejected rows here as JSON lines")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    rejects_out = open(args.rejects, "w", encoding="utf-8") if args.rejects else None
+
+    def report(line, reason, record):
+        print(f"  ✗ line {line}: {reason}", file=sys.stderr)
+        if rejects_out:
+            rejects_out.write(json.dumps({"line": line, "reason": reason,
+                                          "record": record}) + "\n")
+
+    started = time.perf_counter()
+    pool = create_pool(pool_size=1)
+    try:
+        with pool.connection() as conn:
+            imported, rejected = import_file(conn, args.kind, args.path, args.format,
+                                             args.chunk_size, report)
+    except (OSError, ValueError, pymysql.Error) as e:
+        print(f"✗ Import failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        pool.close()
+        if rejects_out:
+            rejects_out.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"✓ Imported {imported:,} {args.kind} in {elapsed:.1f}s "
+          f"({imported / max(elapsed, 1e-9):,.0f} rows/s), {rejected:,} rejected")
+    if rejected:
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Command-line interface for Pandora Chronicles Database
+Runs any READ / WRITE operation without prompts and prints JSON lines
+
+Each operation from operations.py is a subcommand; reads print one JSON
+object per row, writes print one object describing the change. The batch
+subcommand reads requests as JSON lines and answers each on one line, all
+over a single connection:
+
+    {"id": 1, "op": "war-history", "args": {"alliance_id": 2}}
+    {"id": 2, "op": "update-company-ethics", "args": {"company_id": 1, "rating": 6.5}}
+
+Usage:
+    python cli.py war-history --alliance-id 2
+    python cli.py create-human --f-name Jake --l-name Sully --company-id 1
+    python cli.py avatar-links --limit 100 > links.jsonl
+    python cli.py batch < requests.jsonl > responses.jsonl
+"""
+
+import argparse
+import datetime
+import decimal
+import inspect
+import json
+import sys
+
+import pymysql
+
+from db_pool import create_pool
+from operations import OPERATIONS, READ, OperationError, call
+from query_log import operation, operation_tag
+
+
+def json_default(value):
+    """JSON encoding for the non-JSON types pymysql returns."""
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (datetime.date, datetime.datetime, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8", "replace")
+    raise TypeError(f"cannot encode {type(value).__name__}")
+
+
+def dumps(obj):
+    return json.dumps(obj, default=json_default, ensure_ascii=False)
+
+
+def run(conn, name, arguments):
+    """
+    Runs an operation tagged for query profiling and yields its output:
+    the rows of a read as they arrive, or the single result of a write.
+    """
+    func = OPERATIONS.get(name, (None,))[0]
+    with operation(operation_tag(func) if func else name):
+        result = call(conn, name, arguments)
+        if isinstance(result, dict):
+            yield result
+        else:
+            yield from result
+
+
+def run_batch(conn, stream, out):
+    """Answers each JSON-lines request; returns the number that failed."""
+    failed = 0
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        response = {}
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise OperationError("request must be a JSON object")
+            if "id" in request:
+                response["id"] = request["id"]
+            op = response["op"] = request.get("op")
+            if not isinstance(op, str):
+                raise OperationError("op must be an operation name string")
+            output = list(run(conn, op, request.get("args") or {}))
+            response["ok"] = True
+            if OPERATIONS[op][2] == READ:
+                response["rows"] = output
+            else:
+                response["result"] = output[0]
+        except (ValueError, pymysql.Error) as e:
+            # json.JSONDecodeError and OperationError are ValueErrors
+            failed += 1
+            response.setdefault("line", line_number)
+            response["ok"] = False
+            response["error"] = str(e)
+        out.write(dumps(response) + "\n")
+        out.flush()
+    return failed
+
+
+# ============================================================
+# MAIN ENTRY POINT
+# ============================================================
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run Pandora Chronicles operations non-interactively (JSON lines out).")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="OPERATION")
+
+    for name, (func, parameters, _) in OPERATIONS.items():
+        defaults = {key: p.default for key, p in inspect.signature(func).parameters.items()}
+        sub = commands.add_parser(name, help=func.__doc__)
+        for parameter, kind, required in parameters:
+            default = defaults.get(parameter)
+            sub.add_argument("--" + parameter.replace("_", "-"), dest=parameter, type=kind,
+                             required=required,
+                             help=None if required or default is None else f"default {default}")
+
+    batch = commands.add_parser("batch", help="answer JSON-lines requests from a file or stdin")
+    batch.add_argument("--input", help="requests file (default: stdin)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    pool = create_pool(pool_size=1)
+    failed = 0
+    try:
+        with pool.connection() as conn:
+            if args.command == "batch":
+                if args.input:
+                    with open(args.input, encoding="utf-8") as stream:
+                        failed = run_batch(conn, stream, sys.stdout)
+                else:
+                    failed = run_batch(conn, sys.stdin, sys.stdout)
+            else:
+                arguments = {key: value for key, value in vars(args).items()
+                             if key != "command" and value is not None}
+                for row in run(conn, args.command, arguments):
+                    sys.stdout.write(dumps(row) + "\n")
+    except (OSError, OperationError, pymysql.Error) as e:
+        print(f"✗ {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        pool.close()
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
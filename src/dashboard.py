@@ -0,0 +1,146 @@
+"""
+Intelligence Dashboard for Pandora Chronicles Database
+Runs all READ reports concurrently over the connection pool
+
+Every report borrows its own pooled connection on a worker thread, so the
+briefing takes about as long as the slowest report instead of the sum of
+all of them. Reports that need an ID (company, clan, alliance, ecosystem)
+are skipped when none is given; the paged listings are cut at --limit rows.
+
+Usage:
+    python dashboard.py --alliance-id 1 --company-id 1 --clan-id 1 --eco-id 1
+    python dashboard.py --alliance-id 2 --workers 10 --output briefing.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cli import json_default
+from db_pool import create_pool
+from operations import call
+from query_log import operation
+
+DEFAULT_LIMIT = 25
+DEFAULT_WINDOW = "24h"
+
+# (title, operation, {parameter: dashboard argument}); listing reads also get limit
+DASHBOARD_REPORTS = [
+    ("Human Operatives by Company", "humans-by-company", {"company_id": "company_id"}),
+    ("Na'vi by Clan", "navi-by-clan", {"clan_id": "clan_id"}),
+    ("Active Avatar Links", "avatar-links", {"limit": "limit"}),
+    ("Na'vi Bonded Animals", "navi-bonded-animals", {"limit": "limit"}),
+    ("Alliance Resource Control", "alliance-resources", {}),
+    ("Company-Clan Partnerships", "company-clan-partnerships", {"limit": "limit"}),
+    ("Most War-Active Clans", "war-active-clans", {"min_wars": "min_wars"}),
+    ("Alliance War History", "war-history", {"alliance_id": "alliance_id"}),
+    ("Aetherium Sites by Ecosystem", "sites-by-ecosystem", {"eco_id": "eco_id"}),
+    ("Ecosystem Threat Analysis", "ecosystem-threats", {}),
+    ("Recent Ecosystem Threats", "ecosystem-threats", {"window": "window"}),
+]
+
+
+def run_report(pool, title, name, arguments):
+    """Runs one report on its own pooled connection and times it."""
+    report = {"report": title, "operation": name, "arguments": arguments}
+    started = time.perf_counter()
+    try:
+        with pool.connection() as conn, operation(f"DASHBOARD {name}"):
+            report["rows"] = list(call(conn, name, arguments))
+    except Exception as e:
+        report["error"] = str(e)
+    report["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return report
+
+
+def run_dashboard(pool, workers=None, **params):
+    """
+    Runs every report whose parameters are available, concurrently.
+    params: company_id, clan_id, alliance_id, eco_id, min_wars, limit, window.
+    Returns {"reports": [...], "elapsed_ms", "sum_ms", "skipped"} with the
+    reports in DASHBOARD_REPORTS order.
+    """
+    params.setdefault("limit", DEFAULT_LIMIT)
+    params.setdefault("min_wars", 1)
+    params.setdefault("window", DEFAULT_WINDOW)
+    jobs = []
+    skipped = []
+    for title, name, mapping in DASHBOARD_REPORTS:
+        arguments = {parameter: params.get(source) for parameter, source in mapping.items()}
+        if any(value is None for value in arguments.values()):
+            skipped.append(title)
+            continue
+        jobs.append((title, name, arguments))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers or pool.size) as executor:
+        futures = [executor.submit(run_report, pool, *job) for job in jobs]
+        reports = [future.result() for future in futures]
+    elapsed = (time.perf_counter() - started) * 1000
+
+    return {
+        "reports": reports,
+        "elapsed_ms": round(elapsed, 3),
+        "sum_ms": round(sum(report["elapsed_ms"] for report in reports), 3),
+        "skipped": skipped,
+    }
+
+
+def print_timings(briefing, out=sys.stderr):
+    """One line per report plus wall time versus the sequential sum."""
+    for report in briefing["reports"]:
+        outcome = (f"✗ {report['error']}" if "error" in report
+                   else f"{len(report['rows'])} row(s)")
+        out.write(f"  {report['report']:<32} {report['elapsed_ms']:>10.1f} ms   {outcome}\n")
+    for title in briefing["skipped"]:
+        out.write(f"  {title:<32} {'skipped':>13}   (no ID given)\n")
+    out.write(f"  {'Total (wall clock)':<32} {briefing['elapsed_ms']:>10.1f} ms"
+              f"   vs {briefing['sum_ms']:.1f} ms one after another\n")
+
+
+# ============================================================
+# MAIN ENTRY POINT
+# ============================================================
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run all reports concurrently.")
+    parser.add_argument("--company-id", type=int)
+    parser.add_argument("--clan-id", type=int)
+    parser.add_argument("--alliance-id", type=int)
+    parser.add_argument("--eco-id", type=int)
+    parser.add_argument("--min-wars", type=int, default=1)
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT,
+                        help="rows per paged listing")
+    parser.add_argument("--window", default=DEFAULT_WINDOW,
+                        help="time window of the recent-threats report (24h, 7d, 30d)")
+    parser.add_argument("--workers", type=int, default=len(DASHBOARD_REPORTS),
+                        help="concurrent reports (and pooled connections)")
+    parser.add_argument("--output", help="write the briefing as JSON here ('-' for stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    pool = create_pool(pool_size=args.workers)
+    try:
+        briefing = run_dashboard(pool, args.workers, company_id=args.company_id,
+                                 clan_id=args.clan_id, alliance_id=args.alliance_id,
+                                 eco_id=args.eco_id, min_wars=args.min_wars,
+                                 limit=args.limit, window=args.window)
+    finally:
+        pool.close()
+
+    print_timings(briefing)
+    if args.output == "-":
+        json.dump(briefing, sys.stdout, default=json_default, indent=2)
+        print()
+    elif args.output:
+        with open(args.output, "w", encoding="utf-8") as out:
+            json.dump(briefing, out, default=json_default, indent=2)
+    if any("error" in report for report in briefing["reports"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
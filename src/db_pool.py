@@ -0,0 +1,227 @@
+"""
+Connection pool for the Pandora Chronicles database.
+
+Connection settings come from environment variables or an INI config file,
+so the application can start without interactive credential prompts.
+"""
+
+import configparser
+import functools
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import pymysql
+
+from query_log import ProfiledDictCursor, operation, operation_tag
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+DEFAULT_CONFIG = {
+    "host": "localhost",
+    "port": 3306,
+    "user": "",
+    "password": "",
+    "database": "pandora_chronicles_db",
+    "pool_size": 5,
+    "connect_timeout": 10,
+    "checkout_timeout": 30,
+    "health_check_interval": 0,
+}
+
+INT_SETTINGS = ("port", "pool_size", "connect_timeout")
+FLOAT_SETTINGS = ("checkout_timeout", "health_check_interval")
+
+# Environment variables override the config file, e.g. PANDORA_DB_USER
+ENV_PREFIX = "PANDORA_DB_"
+CONFIG_FILE_ENV = "PANDORA_DB_CONFIG"
+DEFAULT_CONFIG_FILE = "pandora_db.ini"
+CONFIG_SECTION = "database"
+
+
+class ConfigError(ValueError):
+    """Raised when a connection setting has the wrong type."""
+
+
+def load_db_config(path=None):
+    """
+    Loads connection settings.
+    Precedence: defaults < config file [database] section < environment.
+    Raises ConfigError for a numeric setting that does not parse.
+    """
+    config = dict(DEFAULT_CONFIG)
+
+    path = path or os.environ.get(CONFIG_FILE_ENV) or DEFAULT_CONFIG_FILE
+    parser = configparser.ConfigParser()
+    if parser.read(path, encoding="utf-8") and parser.has_section(CONFIG_SECTION):
+        for key in DEFAULT_CONFIG:
+            if parser.has_option(CONFIG_SECTION, key):
+                config[key] = parser.get(CONFIG_SECTION, key)
+
+    for key in DEFAULT_CONFIG:
+        value = os.environ.get(ENV_PREFIX + key.upper())
+        if value is not None:
+            config[key] = value
+
+    for keys, kind in ((INT_SETTINGS, int), (FLOAT_SETTINGS, float)):
+        for key in keys:
+            try:
+                config[key] = kind(config[key])
+            except ValueError:
+                raise ConfigError(
+                    f"{key} ({ENV_PREFIX}{key.upper()} or [{CONFIG_SECTION}] {key} in {path}) "
+                    f"must be {'an integer' if kind is int else 'a number'}, got {config[key]!r}")
+    return config
+
+
+# ============================================================
+# CONNECTION POOL
+# ============================================================
+class PoolTimeout(pymysql.OperationalError):
+    """Raised when no pooled connection becomes free in time."""
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of pymysql connections.
+
+    Connections are opened lazily up to pool_size. On checkout a connection
+    that has been idle longer than health_check_interval seconds is pinged
+    and transparently reconnected if the server dropped it.
+    """
+
+    def __init__(self, config, **connect_kwargs):
+        self.config = config
+        self.size = config["pool_size"]
+        self._connect_kwargs = connect_kwargs
+        self._idle = queue.LifoQueue(maxsize=self.size)
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+
+    def _connect(self):
+        cfg = self.config
+        kwargs = {
+            "host": cfg["host"],
+            "port": cfg["port"],
+            "user": cfg["user"],
+            "password": cfg["password"],
+            "database": cfg["database"],
+            "connect_timeout": cfg["connect_timeout"],
+            "cursorclass": ProfiledDictCursor,
+            "autocommit": False,
+        }
+        kwargs.update(self._connect_kwargs)
+        return pymysql.connect(**kwargs)
+
+    def _reserve_slot(self):
+        """Claims room for one more connection if the pool is not full."""
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                return True
+            return False
+
+    def _discard(self, conn):
+        with self._lock:
+            self._created -= 1
+        try:
+            conn.close()
+        except pymysql.Error:
+            pass
+
+    def acquire(self, timeout=None):
+        """Checks out a healthy connection, blocking while the pool is exhausted."""
+        if self._closed:
+            raise pymysql.InterfaceError("Connection pool is closed")
+        if timeout is None:
+            timeout = self.config["checkout_timeout"]
+
+        try:
+            conn, last_used = self._idle.get_nowait()
+        except queue.Empty:
+            if self._reserve_slot():
+                try:
+                    return self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            try:
+                conn, last_used = self._idle.get(timeout=timeout)
+            except queue.Empty:
+                raise PoolTimeout(
+                    f"No database connection free after {timeout}s "
+                    f"(pool_size={self.size})")
+
+        if time.monotonic() - last_used >= self.config["health_check_interval"]:
+            try:
+                conn.ping(reconnect=True)
+            except pymysql.Error:
+                self._discard(conn)
+                if not self._reserve_slot():
+                    raise
+                try:
+                    return self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+        return conn
+
+    def release(self, conn):
+        """Returns a connection to the pool, discarding any uncommitted work."""
+        if self._closed or not conn.open:
+            self._discard(conn)
+            return
+        try:
+            conn.rollback()
+        except pymysql.Error:
+            self._discard(conn)
+            return
+        self._idle.put((conn, time.monotonic()))
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Borrows a connection for the duration of a with-block."""
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Closes every idle connection and refuses further checkouts."""
+        self._closed = True
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+
+def create_pool(path=None, **overrides):
+    """Builds a ConnectionPool from load_db_config() plus explicit overrides."""
+    config = load_db_config(path)
+    config.update(overrides)
+    return ConnectionPool(config)
+
+
+def with_connection(func):
+    """
+    Decorator for operations written against a single connection.
+    The wrapped function takes the pool instead and borrows a connection
+    from it for the duration of the call. Its statements are tagged with
+    the operation name for query profiling.
+    """
+    tag = operation_tag(func)
+
+    @functools.wraps(func)
+    def wrapper(pool, *args, **kwargs):
+        with pool.connection() as conn, operation(tag):
+            return func(conn, *args, **kwargs)
+    return wrapper
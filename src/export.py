@@ -0,0 +1,250 @@
+"""
+Streaming Export for Pandora Chronicles Database
+Writes any READ operation to CSV, JSON lines or Parquet
+
+Rows come from an unbuffered server-side cursor and are written in
+--chunk-size batches, so memory stays flat however large the extract is.
+The paged listings are exported as one ordered query and the cached reports
+bypass the cache. CSV and JSON lines can be gzip / bz2 / xz compressed;
+Parquet uses its own codecs and needs the optional pyarrow package.
+
+Usage:
+    python export.py war-history --alliance-id 2 --format csv --output wars.csv
+    python export.py avatar-links --format jsonl --compression gzip --output links.jsonl.gz
+    python export.py sites-by-ecosystem --eco-id 1 --format parquet --output sites.parquet
+"""
+
+import argparse
+import bz2
+import csv
+import gzip
+import json
+import lzma
+import sys
+import time
+
+import pymysql
+from pymysql.constants import FIELD_TYPE
+
+from cli import json_default
+from db_pool import create_pool
+from operations import OperationError
+from pagination import listing_query
+from query_log import ProfiledSSDictCursor, operation
+from queries import (
+    HUMANS_BY_COMPANY_SQL, NAVI_BY_CLAN_SQL, ALLIANCE_RESOURCES_SQL,
+    WAR_ACTIVE_CLANS_SQL, WAR_HISTORY_SQL, SITES_BY_ECOSYSTEM_SQL, ECOSYSTEM_THREAT_SQL,
+    AVATAR_LINKS_LISTING, NAVI_BONDED_ANIMALS_LISTING, COMPANY_CLAN_PARTNERSHIPS_LISTING,
+)
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+DEFAULT_CHUNK_SIZE = 10000
+FORMATS = ("csv", "jsonl", "parquet")
+TEXT_COMPRESSION = {"none": open, "gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+PARQUET_COMPRESSION = ("none", "snappy", "gzip", "zstd")
+
+# READ operation -> (sql, parameters taken from the operation's arguments)
+EXPORTS = {
+    "humans-by-company": (HUMANS_BY_COMPANY_SQL, ["company_id"]),
+    "navi-by-clan": (NAVI_BY_CLAN_SQL, ["clan_id"]),
+    "avatar-links": (listing_query(AVATAR_LINKS_LISTING), []),
+    "navi-bonded-animals": (listing_query(NAVI_BONDED_ANIMALS_LISTING), []),
+    "alliance-resources": (ALLIANCE_RESOURCES_SQL, []),
+    "company-clan-partnerships": (listing_query(COMPANY_CLAN_PARTNERSHIPS_LISTING), []),
+    "war-active-clans": (WAR_ACTIVE_CLANS_SQL, ["min_wars"]),
+    "war-history": (WAR_HISTORY_SQL, ["alliance_id", "alliance_id"]),
+    "sites-by-ecosystem": (SITES_BY_ECOSYSTEM_SQL, ["eco_id"]),
+    "ecosystem-threats": (ECOSYSTEM_THREAT_SQL, []),
+}
+
+
+# ============================================================
+# READING
+# ============================================================
+def iter_chunks(conn, name, arguments, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yields (cursor description, rows) chunks of a READ operation's result
+    from a server-side cursor. The first chunk may be empty for an empty result.
+    """
+    if name not in EXPORTS:
+        raise OperationError(f"Cannot export '{name}'; choose one of {', '.join(EXPORTS)}")
+    sql, parameters = EXPORTS[name]
+    missing = [p for p in parameters if arguments.get(p) is None]
+    if missing:
+        raise OperationError(f"{name} needs {', '.join(sorted(set(missing)))}")
+    params = tuple(arguments[p] for p in parameters) or None
+
+    with conn.cursor(ProfiledSSDictCursor) as cur:
+        cur.execute(sql, params)
+        description = cur.description
+        rows = cur.fetchmany(chunk_size)
+        yield description, rows
+        while rows:
+            rows = cur.fetchmany(chunk_size)
+            if rows:
+                yield description, rows
+
+
+# ============================================================
+# WRITERS
+# ============================================================
+class CsvWriter:
+    def __init__(self, stream):
+        self.writer = csv.writer(stream)
+        self.columns = None
+
+    def write(self, description, rows):
+        if self.columns is None:
+            self.columns = [column[0] for column in description]
+            self.writer.writerow(self.columns)
+        self.writer.writerows([row[c] for c in self.columns] for row in rows)
+
+    def close(self):
+        pass
+
+
+class JsonLinesWriter:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, description, rows):
+        self.stream.write("".join(
+            json.dumps(row, default=json_default, ensure_ascii=False) + "\n" for row in rows))
+
+    def close(self):
+        pass
+
+
+def arrow_type(type_code):
+    """Parquet column type for a MySQL column type."""
+    if type_code in (FIELD_TYPE.TINY, FIELD_TYPE.SHORT, FIELD_TYPE.INT24,
+                     FIELD_TYPE.LONG, FIELD_TYPE.LONGLONG, FIELD_TYPE.YEAR):
+        return pyarrow.int64()
+    if type_code in (FIELD_TYPE.FLOAT, FIELD_TYPE.DOUBLE,
+                     FIELD_TYPE.DECIMAL, FIELD_TYPE.NEWDECIMAL):
+        return pyarrow.float64()
+    if type_code in (FIELD_TYPE.DATE, FIELD_TYPE.NEWDATE):
+        return pyarrow.date32()
+    if type_code in (FIELD_TYPE.DATETIME, FIELD_TYPE.TIMESTAMP):
+        return pyarrow.timestamp("us")
+    return pyarrow.string()
+
+
+class ParquetWriter:
+    """One Parquet row group per chunk, typed from the cursor description."""
+
+    def __init__(self, path, compression="snappy"):
+        if pyarrow is None:
+            raise OperationError("Parquet export needs pyarrow (pip install pyarrow)")
+        self.path = path
+        self.compression = compression
+        self.schema = None
+        self.writer = None
+
+    def write(self, description, rows):
+        if self.schema is None:
+            self.schema = pyarrow.schema([(c[0], arrow_type(c[1])) for c in description])
+            self.writer = pyarrow.parquet.ParquetWriter(self.path, self.schema,
+                                                        compression=self.compression)
+        columns = {}
+        for field in self.schema:
+            values = [row[field.name] for row in rows]
+            if pyarrow.types.is_floating(field.type):
+                values = [None if v is None else float(v) for v in values]
+            elif pyarrow.types.is_string(field.type):
+                values = [None if v is None else str(v) for v in values]
+            columns[field.name] = values
+        self.writer.write_table(pyarrow.table(columns, schema=self.schema))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def export(conn, name, arguments, fmt, output, compression="none",
+           chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Streams a READ operation into output ('-' for stdout) and returns the
+    number of rows written.
+    """
+    if fmt not in FORMATS:
+        raise OperationError(f"Unknown format '{fmt}'")
+    stream = None
+    if fmt == "parquet":
+        if output == "-":
+            raise OperationError("Parquet cannot be written to stdout")
+        if compression not in PARQUET_COMPRESSION:
+            raise OperationError("Parquet compression must be one of "
+                                 + ", ".join(PARQUET_COMPRESSION))
+        writer = ParquetWriter(output, compression)
+    else:
+        if compression not in TEXT_COMPRESSION:
+            raise OperationError(f"Compression must be one of {', '.join(TEXT_COMPRESSION)}")
+        if output == "-":
+            if compression != "none":
+                raise OperationError("Compressed output needs --output FILE")
+            stream = sys.stdout
+        else:
+            stream = TEXT_COMPRESSION[compression](output, "wt", encoding="utf-8", newline="")
+        writer = CsvWriter(stream) if fmt == "csv" else JsonLinesWriter(stream)
+
+    written = 0
+    try:
+        with operation(f"EXPORT {name}"):
+            for description, rows in iter_chunks(conn, name, arguments, chunk_size):
+                writer.write(description, rows)
+                written += len(rows)
+    finally:
+        writer.close()
+        if stream is not None and stream is not sys.stdout:
+            stream.close()
+    return written
+
+
+# ============================================================
+# MAIN ENTRY POINT
+# ============================================================
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Export a READ operation to a file.")
+    parser.add_argument("operation", choices=list(EXPORTS))
+    for parameter in ("company_id", "clan_id", "alliance_id", "eco_id", "min_wars"):
+        parser.add_argument("--" + parameter.replace("_", "-"), dest=parameter, type=int)
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--output", default="-", help="output file ('-' for stdout)")
+    parser.add_argument("--compression", default=None,
+                        help="csv/jsonl: none, gzip, bz2, xz; parquet: none, snappy, gzip, zstd")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="rows fetched and written per chunk")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    compression = args.compression or ("snappy" if args.format == "parquet" else "none")
+    arguments = {"min_wars": 1}
+    arguments.update({key: value for key, value in vars(args).items() if value is not None})
+
+    started = time.perf_counter()
+    pool = create_pool(pool_size=1)
+    try:
+        with pool.connection() as conn:
+            written = export(conn, args.operation, arguments, args.format, args.output,
+                             compression, args.chunk_size)
+    except (OSError, OperationError, pymysql.Error) as e:
+        print(f"✗ Export failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        pool.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"✓ Exported {written:,} rows in {elapsed:.1f}s "
+          f"({written / max(elapsed, 1e-9):,.0f} rows/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
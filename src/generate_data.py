@@ -0,0 +1,483 @@
+"""
+Synthetic Data Generator for Pandora Chronicles Database
+Fills all 18 tables from schema.sql at a chosen scale factor
+
+Scale 1 produces roughly the volume of populate.sql. Dimension tables
+(Alliance, Clan, Ecosystem, Company) grow with sqrt(scale) and every other
+table grows linearly, so both the number of groups and the rows per group
+increase as the dataset gets bigger. Foreign keys are assigned explicitly,
+and skewed picks follow a Zipf-like distribution (--skew 0 is uniform).
+
+Usage:
+    python generate_data.py --scale 100                 # load into the database
+    python generate_data.py --scale 10000 --truncate    # wipe tables first
+    python generate_data.py --scale 100 --output big_populate.sql
+"""
+
+import argparse
+import bisect
+import itertools
+import math
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pymysql
+from pymysql.converters import escape_item
+
+from db_pool import create_pool
+
+# ============================================================
+# TABLE SIZES AT SCALE 1
+# ============================================================
+DIMENSION_BASE = {
+    "Alliance": 7,
+    "Clan": 8,
+    "Ecosystem": 7,
+    "Company": 7,
+}
+
+FACT_BASE = {
+    "Human": 17,
+    "Navi": 15,
+    "War": 7,
+    "Aetherium_Site": 12,
+    "Report_Meta": 6,
+}
+
+# Ratios for dependent tables
+BONDED_ANIMAL_RATIO = 0.8      # share of Na'vi with a bonded animal
+AVATAR_RATIO = 0.9             # share of min(Human, Navi) that is linked
+ACTIVE_LINK_RATIO = 0.7
+PARTNERSHIP_RATIO = 1.1        # partnerships per clan (capped by company x clan)
+MAX_CLANS_PER_WAR = 3
+SECOND_STAFF_RATIO = 0.3       # sites staffed by a second company
+FLORA_PER_ECOSYSTEM = 2
+
+# Insert order respects foreign keys
+TABLE_ORDER = [
+    "Soul", "Alliance", "Clan", "Ecosystem", "Company",
+    "Human", "Navi", "Bonded_Animal", "Avatar",
+    "Partnership", "War", "Fights_In",
+    "Aetherium_Site", "Staffs", "Ecosystem_Flora",
+    "Report_Meta", "Report_Observation", "Report_Site",
+]
+
+# Trigger-maintained tables; emptied on --truncate and refilled by the
+# triggers as the base tables load
+DERIVED_TABLES = ["Alliance_Resource_Summary", "Ecosystem_Threat_Rollup"]
+
+# Archived reports (retention.py); emptied on --truncate because the
+# generated Report_IDs start again at 1
+ARCHIVE_TABLES = ["Report_Archive", "Report_Site_Archive"]
+
+COLUMNS = {
+    "Soul": ("Soul_ID", "State"),
+    "Alliance": ("Alliance_ID", "Name", "Objective"),
+    "Clan": ("Clan_ID", "Clan_Name", "Alliance_ID"),
+    "Ecosystem": ("Eco_ID", "Name", "Biome_Type", "Dominant_Species"),
+    "Company": ("Company_ID", "Name", "Ethics_Rating", "Latitude", "Longitude"),
+    "Human": ("Human_ID", "F_Name", "L_Name", "`Rank`", "Weapon_Type",
+              "Soul_ID", "Company_ID"),
+    "Navi": ("Navi_ID", "Name", "Age", "Soul_ID", "Clan_ID"),
+    "Bonded_Animal": ("Navi_ID", "Name"),
+    "Avatar": ("Human_ID", "Navi_ID", "Link_Status", "Total_Linked_Hours"),
+    "Partnership": ("Company_ID", "Clan_ID", "Alliance_ID"),
+    "War": ("War_ID", "Casualties", "Outcome", "Attack_Alliance_ID",
+            "Defense_Alliance_ID"),
+    "Fights_In": ("Clan_ID", "War_ID", "Strength"),
+    "Aetherium_Site": ("Site_ID", "Resource_Quantity", "Status", "Alliance_ID",
+                       "Eco_ID"),
+    "Staffs": ("Company_ID", "Site_ID"),
+    "Ecosystem_Flora": ("Flora_Name", "Eco_ID"),
+    "Report_Meta": ("Report_ID", "Timestamp"),
+    "Report_Observation": ("Report_ID", "Threat_Description",
+                           "Resource_Estimate_Change", "Danger_Level_Observed",
+                           "Alliance_ID"),
+    "Report_Site": ("Site_ID", "Report_ID"),
+}
+
+# ============================================================
+# VOCABULARY
+# ============================================================
+FIRST_NAMES = ["Miles", "Elena", "Tom", "Aria", "Darius", "Nia", "Viktor", "Juno",
+               "Kade", "Selene", "Rey", "Mira", "Harlan", "Zara", "Omar", "Priya",
+               "Luca", "Ines", "Marcus", "Yara", "Soren", "Lena", "Tariq", "Noor"]
+LAST_NAMES = ["Quaritch", "Rojas", "Sullivan", "Stone", "Cole", "Hartley", "Reiss",
+              "Park", "Morrison", "Cross", "Solano", "Donovan", "Keene", "Ivers",
+              "Khan", "Desai", "Ferre", "Okafor", "Lind", "Moreau", "Tanaka"]
+RANKS = ["Colonel", "Scientist", "Pilot", "Engineer", "Lieutenant", "Medic",
+         "Captain", "Strategist", "Sniper", "Recon", "Technician", "Scout",
+         "Biologist", "Field Commander", "Analyst", "Private"]
+WEAPONS = ["Gun", "Airship", "Helicopter", "Drone", "Assault Rifle", "Pulse Staff",
+           "Mech Suit", "Shock Baton", "Longbow Railgun", "Thermal Blade",
+           "EMP Launcher", "Grappler", "Sonic Net", "Rail Pistol", "Repair Kit"]
+NAVI_NAMES = ["Neytiri", "Ronal", "Fhara", "Ziyara", "Talon", "Sahela", "Erotan",
+              "Limari", "Tsyal", "Raha", "Wetu", "Namira", "Koru", "Sela", "Maru",
+              "Tonowari", "Aonung", "Tsireya", "Kiri", "Lo'ak", "Tuk", "Rotxo"]
+ANIMALS = ["Ikran", "Tsurak", "Sturmbeest", "Pa_li", "Great_Leonopteryx",
+           "Palulukan", "Tulkun", "Fan_Lizard", "Direhorse", "Kelku", "Skyherd"]
+CLAN_NAMES = ["Omaticaya", "Metkayina", "Tawkami", "Tipani", "Anurai", "Hulanta",
+              "Li_ona", "Kelutral Rangers", "Mangkwan", "Tayrangi"]
+ALLIANCE_NAMES = ["Skywalkers Pact", "Reefguard Accord", "Greenheart Coalition",
+                  "Stormrider Covenant", "Deepstone Union", "Skyrender Division",
+                  "Tidefall Pact"]
+OBJECTIVES = ["Defend sacred Aetherium sites", "Protect oceanic Aetherium fields",
+              "Preserve forest ecosystems", "Secure high-altitude weather nodes",
+              "Mine subterranean aetherium with controlled methods",
+              "Neutralize rogue aerial threats", "Protect underwater relic sites"]
+BIOMES = [("Forest", "Direhorse"), ("Ocean", "Tsurak"), ("Grassland", "Prolemuris"),
+          ("Mountain", "Sky Serpents"), ("Cave", "Luminescent Bats"),
+          ("Coral Reef", "Wavefin Sharks")]
+ECO_NAMES = ["Bioluminescent Grove", "Coral Reefs", "Ancient Tree Plains",
+             "Aetherium Peaks", "Crystal Caves", "Stormrider Plains", "Tidefall Reefs"]
+COMPANY_NAMES = ["RDA Recon", "Helios Corp", "Xenotech Extraction", "Pandora BioGen",
+                 "Frontier Terraform", "Nova Mining", "Stellar Axis"]
+FLORA = ["Glowvine", "Healing Moss", "Reef Moss", "Water Fern", "Tallgrain",
+         "Crystal Bloom", "Skyroot", "Cave Lantern", "Deep Moss", "Mistweed"]
+OUTCOMES = ["Alliance Victory", "Defeat", "Stalemate", "Victory", "Alliance Loss",
+            "Heavy Loss", "Skirmish"]
+THREATS = ["Increased predator activity near site", "Storm damage reduced access",
+           "Human mining detected nearby", "Floating island instability detected",
+           "Tidal disturbance near relic site", "Cave-in risk from seismic activity"]
+SOUL_STATES = (["Alive"] * 7) + ["Deceased"] * 2 + ["Linked_to_Eywa"]
+SITE_STATUSES = ["Claimed"] * 5 + ["Unclaimed"] * 4 + ["Depleted"]
+
+REPORT_START = datetime(2179, 1, 1)
+REPORT_SPAN_DAYS = 365
+
+
+# ============================================================
+# HELPERS
+# ============================================================
+class SkewedPicker:
+    """
+    Picks IDs 1..n with Zipf-like weights 1/rank**skew.
+    Ranks are shuffled so the popular IDs are not always the lowest ones.
+    """
+
+    def __init__(self, rng, n, skew):
+        self.rng = rng
+        self.n = n
+        if skew <= 0 or n <= 1:
+            self.ids = None
+            return
+        self.ids = list(range(1, n + 1))
+        rng.shuffle(self.ids)
+        self.cum_weights = list(itertools.accumulate(
+            1.0 / (rank ** skew) for rank in range(1, n + 1)))
+        self.total = self.cum_weights[-1]
+
+    def pick(self):
+        if self.ids is None:
+            return self.rng.randint(1, self.n)
+        i = bisect.bisect(self.cum_weights, self.rng.random() * self.total)
+        return self.ids[min(i, self.n - 1)]
+
+    def pick_distinct(self, k):
+        """Picks up to k distinct IDs (fewer if n < k)."""
+        k = min(k, self.n)
+        chosen = []
+        while len(chosen) < k:
+            value = self.pick()
+            if value not in chosen:
+                chosen.append(value)
+        return chosen
+
+
+def permute(i, n, seed):
+    """Bijective affine shuffle of 0..n-1 that needs no memory."""
+    step = (seed % n) * 2 + 1 if n > 1 else 1
+    while math.gcd(step, n) != 1:
+        step += 2
+    return (i * step + seed) % n
+
+
+def table_sizes(scale):
+    """Returns the row targets for the independently sized tables."""
+    sizes = {}
+    for table, base in DIMENSION_BASE.items():
+        sizes[table] = max(1, round(base * math.sqrt(scale)))
+    for table, base in FACT_BASE.items():
+        sizes[table] = max(1, round(base * scale))
+    return sizes
+
+
+# ============================================================
+# ROW GENERATORS
+# ============================================================
+class DatasetGenerator:
+    """Yields rows for each table in TABLE_ORDER with consistent foreign keys."""
+
+    def __init__(self, scale=1, skew=1.0, seed=42):
+        self.scale = scale
+        self.skew = skew
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.sizes = table_sizes(scale)
+        # Clan -> Alliance is kept so partnerships follow the clan's alliance
+        self.clan_alliance = []
+
+    def picker(self, table):
+        return SkewedPicker(self.rng, self.sizes[table], self.skew)
+
+    def rows(self, table):
+        return getattr(self, "gen_" + table.lower())()
+
+    def gen_soul(self):
+        # Humans own souls 1..H, Na'vi own souls H+1..H+N
+        total = self.sizes["Human"] + self.sizes["Navi"]
+        choice = self.rng.choice
+        for soul_id in range(1, total + 1):
+            yield (soul_id, choice(SOUL_STATES))
+
+    def gen_alliance(self):
+        for i in range(1, self.sizes["Alliance"] + 1):
+            name = ALLIANCE_NAMES[(i - 1) % len(ALLIANCE_NAMES)]
+            yield (i, f"{name} {i}", self.rng.choice(OBJECTIVES))
+
+    def gen_clan(self):
+        alliances = self.picker("Alliance")
+        self.clan_alliance = [None]
+        for i in range(1, self.sizes["Clan"] + 1):
+            # About one clan in eight stays neutral
+            alliance_id = None if self.rng.random() < 0.125 else alliances.pick()
+            self.clan_alliance.append(alliance_id)
+            yield (i, f"{CLAN_NAMES[(i - 1) % len(CLAN_NAMES)]} {i}", alliance_id)
+
+    def gen_ecosystem(self):
+        for i in range(1, self.sizes["Ecosystem"] + 1):
+            biome, species = BIOMES[(i - 1) % len(BIOMES)]
+            yield (i, f"{ECO_NAMES[(i - 1) % len(ECO_NAMES)]} {i}", biome, species)
+
+    def gen_company(self):
+        rng = self.rng
+        for i in range(1, self.sizes["Company"] + 1):
+            yield (i, f"{COMPANY_NAMES[(i - 1) % len(COMPANY_NAMES)]} {i}",
+                   round(rng.uniform(0, 10), 2),
+                   round(rng.uniform(-20, -5), 6), round(rng.uniform(35, 55), 6))
+
+    def gen_human(self):
+        rng = self.rng
+        companies = self.picker("Company")
+        for i in range(1, self.sizes["Human"] + 1):
+            yield (i, rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES),
+                   rng.choice(RANKS), rng.choice(WEAPONS), i, companies.pick())
+
+    def gen_navi(self):
+        rng = self.rng
+        clans = self.picker("Clan")
+        offset = self.sizes["Human"]
+        for i in range(1, self.sizes["Navi"] + 1):
+            yield (i, rng.choice(NAVI_NAMES), rng.randint(12, 80), offset + i,
+                   clans.pick())
+
+    def gen_bonded_animal(self):
+        rng = self.rng
+        for navi_id in range(1, self.sizes["Navi"] + 1):
+            if rng.random() < BONDED_ANIMAL_RATIO:
+                yield (navi_id, rng.choice(ANIMALS))
+
+    def gen_avatar(self):
+        rng = self.rng
+        humans, navis = self.sizes["Human"], self.sizes["Navi"]
+        links = int(min(humans, navis) * AVATAR_RATIO)
+        for i in range(links):
+            # Human i is paired with a shuffled Na'vi; both sides stay unique
+            status = "Active" if rng.random() < ACTIVE_LINK_RATIO else "Inactive"
+            yield (i + 1, permute(i, navis, self.seed) + 1, status,
+                   rng.randint(0, 5000))
+
+    def gen_partnership(self):
+        companies, clans = self.sizes["Company"], self.sizes["Clan"]
+        pairs = companies * clans
+        count = min(pairs, int(clans * PARTNERSHIP_RATIO) + 1)
+        for i in range(count):
+            company, clan = divmod(permute(i, pairs, self.seed), clans)
+            yield (company + 1, clan + 1, self.clan_alliance[clan + 1])
+
+    def gen_war(self):
+        rng = self.rng
+        alliances = self.picker("Alliance")
+        for i in range(1, self.sizes["War"] + 1):
+            sides = alliances.pick_distinct(2)
+            attack = sides[0]
+            defense = sides[1] if len(sides) > 1 else None
+            yield (i, rng.randint(5, 1000), rng.choice(OUTCOMES), attack, defense)
+
+    def gen_fights_in(self):
+        rng = self.rng
+        clans = self.picker("Clan")
+        for war_id in range(1, self.sizes["War"] + 1):
+            for clan_id in clans.pick_distinct(rng.randint(1, MAX_CLANS_PER_WAR)):
+                yield (clan_id, war_id, str(rng.randint(40, 100)))
+
+    def gen_aetherium_site(self):
+        rng = self.rng
+        alliances = self.picker("Alliance")
+        ecosystems = self.picker("Ecosystem")
+        for i in range(1, self.sizes["Aetherium_Site"] + 1):
+            status = rng.choice(SITE_STATUSES)
+            alliance_id = alliances.pick() if status == "Claimed" else None
+            yield (i, rng.randint(50, 2500), status, alliance_id, ecosystems.pick())
+
+    def gen_staffs(self):
+        rng = self.rng
+        companies = self.picker("Company")
+        for site_id in range(1, self.sizes["Aetherium_Site"] + 1):
+            count = 2 if rng.random() < SECOND_STAFF_RATIO else 1
+            for company_id in companies.pick_distinct(count):
+                yield (company_id, site_id)
+
+    def gen_ecosystem_flora(self):
+        rng = self.rng
+        for eco_id in range(1, self.sizes["Ecosystem"] + 1):
+            for name in rng.sample(FLORA, FLORA_PER_ECOSYSTEM):
+                yield (name, eco_id)
+
+    def gen_report_meta(self):
+        rng = self.rng
+        span = REPORT_SPAN_DAYS * 86400
+        for i in range(1, self.sizes["Report_Meta"] + 1):
+            yield (i, REPORT_START + timedelta(seconds=rng.randrange(span)))
+
+    def gen_report_observation(self):
+        rng = self.rng
+        alliances = self.picker("Alliance")
+        for i in range(1, self.sizes["Report_Meta"] + 1):
+            yield (i, f"{rng.choice(THREATS)} {rng.randint(1, 9999)}",
+                   -rng.randint(0, 400), str(rng.randint(1, 10)), alliances.pick())
+
+    def gen_report_site(self):
+        sites = self.picker("Aetherium_Site")
+        for report_id in range(1, self.sizes["Report_Meta"] + 1):
+            yield (sites.pick(), report_id)
+
+
+# ============================================================
+# WRITERS
+# ============================================================
+def batched(rows, size):
+    """Groups an iterator into lists of at most size rows."""
+    iterator = iter(rows)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def insert_sql(table):
+    columns = COLUMNS[table]
+    placeholders = ", ".join(["%s"] * len(columns))
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+def load_into_database(conn, generator, batch_size, truncate=False):
+    """
+    Streams every table into the database with multi-row INSERTs.
+    Each batch is committed on its own so memory stays bounded.
+    """
+    counts = {}
+    with conn.cursor() as cur:
+        cur.execute("SET SESSION foreign_key_checks = 0")
+        cur.execute("SET SESSION unique_checks = 0")
+        try:
+            if truncate:
+                for table in ARCHIVE_TABLES + DERIVED_TABLES + TABLE_ORDER[::-1]:
+                    cur.execute(f"TRUNCATE TABLE {table}")
+            for table in TABLE_ORDER:
+                sql = insert_sql(table)
+                started = time.perf_counter()
+                counts[table] = 0
+                for batch in batched(generator.rows(table), batch_size):
+                    # pymysql rewrites executemany INSERTs into multi-row statements
+                    cur.executemany(sql, batch)
+                    conn.commit()
+                    counts[table] += len(batch)
+                elapsed = time.perf_counter() - started
+                print(f"  {table:<20} {counts[table]:>12,} rows  {elapsed:7.2f}s")
+        finally:
+            cur.execute("SET SESSION unique_checks = 1")
+            cur.execute("SET SESSION foreign_key_checks = 1")
+    return counts
+
+
+def write_sql_script(out, generator, batch_size, database="pandora_chronicles_db",
+                     truncate=False):
+    """Writes the dataset as a SQL script of multi-row INSERT statements."""
+    counts = {}
+    out.write(f"USE {database};\n")
+    out.write("SET foreign_key_checks = 0;\nSET unique_checks = 0;\n")
+    if truncate:
+        for table in ARCHIVE_TABLES + DERIVED_TABLES + TABLE_ORDER[::-1]:
+            out.write(f"TRUNCATE TABLE {table};\n")
+    for table in TABLE_ORDER:
+        columns = ", ".join(COLUMNS[table])
+        counts[table] = 0
+        for batch in batched(generator.rows(table), batch_size):
+            values = ",\n ".join(
+                "(" + ", ".join(escape_item(v, "utf8mb4") for v in row) + ")"
+                for row in batch)
+            out.write(f"INSERT INTO {table} ({columns}) VALUES\n {values};\n")
+            counts[table] += len(batch)
+        print(f"  {table:<20} {counts[table]:>12,} rows", file=sys.stderr)
+    out.write("SET unique_checks = 1;\nSET foreign_key_checks = 1;\n")
+    return counts
+
+
+# ============================================================
+# MAIN ENTRY POINT
+# ============================================================
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic Pandora Chronicles dataset.")
+    parser.add_argument("--scale", type=float, default=1,
+                        help="scale factor relative to populate.sql (e.g. 1, 100, 10000)")
+    parser.add_argument("--skew", type=float, default=1.0,
+                        help="Zipf exponent for foreign key picks (0 = uniform)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5000,
+                        help="rows per multi-row INSERT")
+    parser.add_argument("--truncate", action="store_true",
+                        help="empty all 18 tables before loading")
+    parser.add_argument("--output",
+                        help="write a SQL script here ('-' for stdout) instead of loading")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    generator = DatasetGenerator(args.scale, args.skew, args.seed)
+    started = time.perf_counter()
+
+    if args.output:
+        if args.output == "-":
+            counts = write_sql_script(sys.stdout, generator, args.batch_size,
+                                      truncate=args.truncate)
+        else:
+            with open(args.output, "w", encoding="utf-8") as out:
+                counts = write_sql_script(out, generator, args.batch_size,
+                                          truncate=args.truncate)
+    else:
+        print(f"Loading scale {args.scale:g} (skew {args.skew:g}) into the database...")
+        pool = create_pool(pool_size=1)
+        try:
+            with pool.connection() as conn:
+                counts = load_into_database(conn, generator, args.batch_size,
+                                            args.truncate)
+        except pymysql.Error as e:
+            print(f"✗ Database error: {e}", file=sys.stderr)
+            sys.exit(1)
+        finally:
+            pool.close()
+
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    print(f"✓ Generated {total:,} rows in {elapsed:.1f}s "
+          f"({total / max(elapsed, 1e-9):,.0f} rows/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,437 @@
+"""
+Report Ingestion for Pandora Chronicles Database
+Streams field reports from JSON lines into Report_Meta / Report_Site / Report_Observation
+
+One JSON object per line; every field is optional:
+    {"Timestamp": "2154-03-01 14:30:00", "Threat_Description": "RDA bulldozers",
+     "Resource_Estimate_Change": -200, "Danger_Level_Observed": "7",
+     "Alliance_ID": 2, "Sites": [1, 4]}
+Timestamp defaults to the time the report is read.
+
+Reports are validated as they are read and grouped into batches. Writer
+threads, each on its own pooled connection, commit one batch per
+transaction: one multi-row INSERT into Report_Meta reserves a block of
+Report_IDs (@@auto_increment_increment apart), and the site links and
+observations follow as multi-row INSERTs. At most --max-pending batches wait for a writer; when
+the database falls behind, reading stops until a writer frees a slot, so
+memory stays bounded and a producer piping into stdin is slowed to the
+database's pace. Progress, throughput and batch latency go to stderr.
+
+The rollup triggers (migration 006) update one Ecosystem_Threat_Rollup row
+per ecosystem and hour, so concurrent writers lock the same rows. Before
+its observations fire the triggers, a batch locks all of its (Eco_ID,
+hour) rows with one INSERT ... ORDER BY Eco_ID, hour, so writers take them
+in key order whatever ecosystems a report spans. A batch that still loses
+a deadlock or times out waiting for a lock is rolled back and run again.
+Reports arriving in time order all land in the current hour's rows, so
+writers serialize there: the default is one writer; compare reports/s and
+retries before raising --workers.
+
+Usage:
+    python ingest_reports.py reports.jsonl
+    producer | python ingest_reports.py - --batch-size 1000 --workers 2
+    python ingest_reports.py reports.jsonl --rejects rejected.jsonl
+"""
+
+import argparse
+import datetime
+import json
+import queue
+import random
+import sys
+import threading
+import time
+
+import pymysql
+from pymysql.constants import ER
+
+from benchmark import percentile
+from bulk_import import RejectedRow, auto_increment_step, read_records
+from db_pool import create_pool
+import operations as ops
+from query_log import operation
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_WORKERS = 1
+DEFAULT_MAX_PENDING = 8
+
+# Errors after which the rolled-back batch is simply run again
+RETRYABLE_ERRORS = (ER.LOCK_DEADLOCK, ER.LOCK_WAIT_TIMEOUT)
+DEFAULT_RETRIES = 5
+RETRY_BACKOFF = 0.05            # seconds before the first retry, doubled after each
+
+# Tables written here; cached reports reading them are invalidated
+REPORT_TABLES = ("Report_Meta", "Report_Site", "Report_Observation")
+
+# Creates (with zero sums) and locks, in primary key order, the rollup rows
+# the observations of the reports listed in {ids} will update. An all-zero
+# row is what the triggers leave after adding and taking back a report, so
+# neither the reads nor the drift check count it
+ROLLUP_LOCK_SQL = """
+    INSERT INTO Ecosystem_Threat_Rollup (Eco_ID, Bucket_Start)
+    SELECT DISTINCT ast.Eco_ID, DATE_FORMAT(rm.Timestamp, '%%Y-%%m-%%d %%H:00:00')
+    FROM Report_Site rs
+    JOIN Aetherium_Site ast ON rs.Site_ID = ast.Site_ID
+    JOIN Report_Meta rm ON rs.Report_ID = rm.Report_ID
+    WHERE rs.Report_ID IN ({ids}) AND ast.Eco_ID IS NOT NULL
+    ORDER BY 1, 2
+    ON DUPLICATE KEY UPDATE Reports = Reports
+"""
+
+OBSERVATION_SQL = """
+    INSERT INTO Report_Observation
+        (Report_ID, Threat_Description, Resource_Estimate_Change,
+         Danger_Level_Observed, Alliance_ID)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
+
+# ============================================================
+# VALIDATION
+# ============================================================
+def clean_report(record, valid_alliances, valid_sites):
+    """Returns (timestamp, observation values, site IDs) or raises RejectedRow."""
+    timestamp = record.get("Timestamp")
+    if timestamp in (None, ""):
+        timestamp = datetime.datetime.now().replace(microsecond=0)
+    else:
+        try:
+            timestamp = datetime.datetime.fromisoformat(str(timestamp).strip())
+        except ValueError:
+            raise RejectedRow(f"Timestamp is not an ISO date/time: {timestamp!r}")
+
+    threat = record.get("Threat_Description")
+    if threat is not None:
+        threat = str(threat)
+        if len(threat.encode("utf-8")) > 65535:
+            raise RejectedRow("Threat_Description longer than 65535 bytes")
+
+    change = record.get("Resource_Estimate_Change")
+    if change not in (None, ""):
+        try:
+            change = int(change)
+        except (TypeError, ValueError):
+            raise RejectedRow(f"Resource_Estimate_Change must be an integer, got {change!r}")
+    else:
+        change = None
+
+    danger = record.get("Danger_Level_Observed")
+    if danger not in (None, ""):
+        danger = str(danger).strip()
+        if len(danger) > 50:
+            raise RejectedRow("Danger_Level_Observed longer than 50 characters")
+    else:
+        danger = None
+
+    alliance_id = record.get("Alliance_ID")
+    if alliance_id not in (None, ""):
+        try:
+            alliance_id = int(alliance_id)
+        except (TypeError, ValueError):
+            raise RejectedRow(f"Alliance_ID must be an integer, got {alliance_id!r}")
+        if alliance_id not in valid_alliances:
+            raise RejectedRow(f"unknown Alliance_ID {alliance_id}")
+    else:
+        alliance_id = None
+
+    sites = record.get("Sites") or []
+    if not isinstance(sites, list):
+        raise RejectedRow("Sites must be a list of Site_IDs")
+    site_ids = []
+    for site in sites:
+        try:
+            site = int(site)
+        except (TypeError, ValueError):
+            raise RejectedRow(f"Site_ID must be an integer, got {site!r}")
+        if site not in valid_sites:
+            raise RejectedRow(f"unknown Site_ID {site}")
+        if site not in site_ids:
+            site_ids.append(site)
+
+    return timestamp, (threat, change, danger, alliance_id), site_ids
+
+
+# ============================================================
+# WRITING
+# ============================================================
+def insert_batch(conn, reports):
+    """
+    Writes [(timestamp, observation values, site IDs), ...] in one
+    transaction and returns the first Report_ID of the batch.
+    """
+    step = auto_increment_step(conn)
+    with conn.cursor() as cur:
+        # One multi-row INSERT reserves a block of Report_IDs, step apart
+        cur.execute("INSERT INTO Report_Meta (Timestamp) VALUES "
+                    + ", ".join(["(%s)"] * len(reports)),
+                    [timestamp for timestamp, _, _ in reports])
+        first_id = cur.lastrowid
+        if cur.rowcount != len(reports):
+            raise pymysql.DataError(f"expected {len(reports)} reports, got {cur.rowcount}")
+        # Site links before observations: the threat rollup trigger then
+        # runs once per observation instead of once per site link
+        links = [(site, first_id + i * step) for i, (_, _, sites) in enumerate(reports)
+                 for site in sites]
+        if links:
+            cur.executemany("INSERT INTO Report_Site (Site_ID, Report_ID) VALUES (%s, %s)",
+                            links)
+            # Lock the rollup rows in key order before the triggers touch them
+            linked = sorted({report_id for _, report_id in links})
+            cur.execute(ROLLUP_LOCK_SQL.format(ids=", ".join(["%s"] * len(linked))), linked)
+        cur.executemany(OBSERVATION_SQL, [(first_id + i * step, *values)
+                                          for i, (_, values, _) in enumerate(reports)])
+    conn.commit()
+    return first_id
+
+
+def insert_with_retry(conn, reports, retries=DEFAULT_RETRIES, on_retry=None):
+    """
+    insert_batch, run again up to retries times with exponential backoff
+    when the transaction loses a deadlock or times out waiting for a lock.
+    on_retry(wait_seconds) is called before each retry.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return insert_batch(conn, reports)
+        except (pymysql.OperationalError, pymysql.InternalError) as e:
+            if e.args[0] not in RETRYABLE_ERRORS or attempt == retries:
+                raise
+            conn.rollback()
+            # Jitter keeps the writers that collided from colliding again
+            wait = RETRY_BACKOFF * 2 ** attempt * random.uniform(0.5, 1.5)
+            if on_retry:
+                on_retry(wait)
+            time.sleep(wait)
+
+
+def load_batch(conn, batch, rejected, on_retry=None):
+    """
+    Inserts a batch of (line, report, record); when the database refuses it, the
+    reports are retried one per transaction and failures are rejected.
+    Deadlocks and lock wait timeouts are retried (see insert_with_retry).
+    Returns the number of reports stored.
+    """
+    try:
+        insert_with_retry(conn, [report for _, report, _ in batch], on_retry=on_retry)
+        return len(batch)
+    except (pymysql.IntegrityError, pymysql.DataError):
+        conn.rollback()
+
+    stored = 0
+    for line, report, _ in batch:
+        try:
+            insert_with_retry(conn, [report], on_retry=on_retry)
+            stored += 1
+        except (pymysql.IntegrityError, pymysql.DataError) as e:
+            conn.rollback()
+            rejected.append((line, f"database error: {e.args[-1]}"))
+    return stored
+
+
+class IngestStats:
+    """Thread-safe counters plus per-batch latency (read to commit)."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.reports = 0
+        self.rejected = 0
+        self.batches = 0
+        self.retries = 0
+        self.retry_wait = 0.0
+        self.latencies_ms = []
+        self._lock = threading.Lock()
+
+    def add_batch(self, stored, latency):
+        with self._lock:
+            self.reports += stored
+            self.batches += 1
+            self.latencies_ms.append(latency * 1000)
+
+    def add_rejected(self, count=1):
+        with self._lock:
+            self.rejected += count
+
+    def add_retry(self, wait):
+        with self._lock:
+            self.retries += 1
+            self.retry_wait += wait
+
+    def summary(self):
+        with self._lock:
+            latencies = sorted(self.latencies_ms)
+            elapsed = time.perf_counter() - self.started
+            return {
+                "reports": self.reports,
+                "rejected": self.rejected,
+                "batches": self.batches,
+                # Batches run again after a deadlock / lock wait timeout,
+                # and the backoff slept before them
+                "retries": self.retries,
+                "retry_wait_s": round(self.retry_wait, 3),
+                "elapsed_s": round(elapsed, 3),
+                "reports_per_s": round(self.reports / max(elapsed, 1e-9), 1),
+                "batch_latency_ms": {
+                    "p50": round(percentile(latencies, 50), 3),
+                    "p95": round(percentile(latencies, 95), 3),
+                    "p99": round(percentile(latencies, 99), 3),
+                    "max": round(latencies[-1], 3) if latencies else 0.0,
+                },
+            }
+
+
+def format_summary(summary):
+    latency = summary["batch_latency_ms"]
+    return (f"{summary['reports']:,} reports in {summary['elapsed_s']:.1f}s "
+            f"({summary['reports_per_s']:,.0f}/s), {summary['rejected']:,} rejected, "
+            f"{summary['retries']:,} retried | "
+            f"batch latency p50 {latency['p50']:.1f} ms, p95 {latency['p95']:.1f} ms, "
+            f"max {latency['max']:.1f} ms")
+
+
+def _writer(pool, pending, stats, on_reject, failures):
+    """Commits batches from the queue until it receives None."""
+    with pool.connection() as conn, operation("INGEST reports"):
+        while True:
+            item = pending.get()
+            if item is None:
+                return
+            if failures:
+                # Keep draining so the reader never blocks on a full queue
+                continue
+            batch, read_at = item
+            rejected = []
+            try:
+                stored = load_batch(conn, batch, rejected, stats.add_retry)
+            except pymysql.Error as e:
+                conn.rollback()
+                failures.append(e)
+                continue
+            stats.add_batch(stored, time.perf_counter() - read_at)
+            stats.add_rejected(len(rejected))
+            if on_reject:
+                records = {line: record for line, _, record in batch}
+                for line, reason in rejected:
+                    on_reject(line, reason, records.get(line))
+
+
+def ingest_reports(pool, records, batch_size=DEFAULT_BATCH_SIZE, workers=DEFAULT_WORKERS,
+                   max_pending=DEFAULT_MAX_PENDING, on_reject=None, on_progress=None,
+                   progress_every=1.0):
+    """
+    Ingests (line, record) pairs with `workers` writer threads, each on its
+    own connection from pool. Reading blocks while max_pending batches wait
+    for a writer. on_reject(line, reason, record) is called for every
+    skipped report and on_progress(summary) about every progress_every
+    seconds. Returns the final summary (see IngestStats.summary); raises
+    the first database error that stopped a writer.
+    """
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT Alliance_ID FROM Alliance")
+            valid_alliances = {row["Alliance_ID"] for row in cur.fetchall()}
+            cur.execute("SELECT Site_ID FROM Aetherium_Site")
+            valid_sites = {row["Site_ID"] for row in cur.fetchall()}
+
+    stats = IngestStats()
+    pending = queue.Queue(maxsize=max_pending)
+    failures = []
+    threads = [threading.Thread(target=_writer, daemon=True,
+                                args=(pool, pending, stats, on_reject, failures))
+               for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+
+    batch = []
+    batch_read_at = None
+    next_progress = time.perf_counter() + progress_every
+    try:
+        for line, record in records:
+            try:
+                if isinstance(record, RejectedRow):
+                    raise record
+                report = clean_report(record, valid_alliances, valid_sites)
+            except RejectedRow as e:
+                stats.add_rejected()
+                if on_reject:
+                    on_reject(line, str(e), record if isinstance(record, dict) else None)
+                continue
+            if not batch:
+                batch_read_at = time.perf_counter()
+            batch.append((line, report, record))
+            if len(batch) >= batch_size:
+                pending.put((batch, batch_read_at))     # blocks when writers lag
+                batch = []
+                if on_progress and time.perf_counter() >= next_progress:
+                    on_progress(stats.summary())
+                    next_progress = time.perf_counter() + progress_every
+            if failures:
+                break
+        if batch and not failures:
+            pending.put((batch, batch_read_at))
+    finally:
+        for _ in threads:
+            pending.put(None)
+        for thread in threads:
+            thread.join()
+        # Batches committed before a failure are kept
+        ops.invalidate(*REPORT_TABLES)
+
+    if failures:
+        raise failures[0]
+    return stats.summary()
+
+
+# ============================================================
+# MAIN ENTRY POINT
+# ============================================================
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest field reports from JSON lines.")
+    parser.add_argument("path", help="JSON-lines file, or - for stdin")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="reports per transaction")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="writer threads (and pooled connections)")
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING,
+                        help="batches allowed to wait for a writer before reading pauses")
+    parser.add_argument("--progress", type=float, default=1.0,
+                        help="seconds between progress lines (0 for none)")
+    parser.add_argument("--rejects", help="write rejected reports here as JSON lines")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    rejects_out = open(args.rejects, "w", encoding="utf-8") if args.rejects else None
+
+    def report(line, reason, record):
+        print(f"  ✗ line {line}: {reason}", file=sys.stderr)
+        if rejects_out:
+            rejects_out.write(json.dumps({"line": line, "reason": reason,
+                                          "record": record}, default=str) + "\n")
+
+    def progress(summary):
+        print(f"  … {format_summary(summary)}", file=sys.stderr)
+
+    pool = create_pool(pool_size=args.workers)
+    stream = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8")
+    try:
+        summary = ingest_reports(pool, read_records(stream, "jsonl"), args.batch_size,
+                                 args.workers, args.max_pending, report,
+                                 progress if args.progress > 0 else None, args.progress)
+    except (OSError, pymysql.Error) as e:
+        print(f"✗ Ingestion failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        pool.close()
+        if rejects_out:
+            rejects_out.close()
+
+    print(f"✓ Ingested {format_summary(summary)}", file=sys.stderr)
+    if summary["rejected"]:
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
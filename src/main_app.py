@@ -3,27 +3,47 @@ import sys
 from getpass import getpass
 from datetime import datetime
 
+from db_pool import ConfigError, ConnectionPool, load_db_config, with_connection
+from pagination import KeysetPager
+from query_log import PROFILER, ProfiledSSDictCursor
+from bulk_import import ENTITIES, import_file, read_records
+from dashboard import print_timings, run_dashboard
+from ingest_reports import format_summary, ingest_reports
+from summaries import SUMMARIES
+from retention import DEFAULT_HORIZON_DAYS, archive_reports, horizon_cutoff, retention_status
+from queries import (
+    HUMANS_BY_COMPANY_SQL, NAVI_BY_CLAN_SQL, WAR_HISTORY_SQL, SITES_BY_ECOSYSTEM_SQL,
+    AVATAR_LINKS_LISTING, NAVI_BONDED_ANIMALS_LISTING, COMPANY_CLAN_PARTNERSHIPS_LISTING,
+)
+import operations as ops
+from operations import RESULT_CACHE, REFERENCE_CACHE, OperationError
+
 # ============================================================
 # DATABASE CONNECTION
 # ============================================================
-def get_connection():
-    """Establishes connection to the Pandora Chronicles database."""
+def get_pool():
+    """
+    Creates the connection pool for the Pandora Chronicles database.
+    Credentials come from PANDORA_DB_* environment variables or
+    pandora_db.ini; the user is only prompted when none are configured.
+    """
     print("\n=== DATABASE CONNECTION ===")
-    print("Enter MySQL credentials:")
-    user = input("Username: ").strip()
-    password = getpass("Password: ")
-
     try:
-        conn = pymysql.connect(
-            host="localhost",
-            user=user,
-            password=password,
-            database="pandora_chronicles_db",
-            cursorclass=pymysql.cursors.DictCursor,
-            autocommit=False
-        )
+        config = load_db_config()
+        if not config["user"]:
+            print("Enter MySQL credentials:")
+            config["user"] = input("Username: ").strip()
+            config["password"] = getpass("Password: ")
+
+        pool = ConnectionPool(config)
+        # Open the first connection now so bad credentials fail up front
+        with pool.connection():
+            pass
         print("✓ Connection successful!\n")
-        return conn
+        return pool
+    except ConfigError as e:
+        print(f"✗ Invalid connection setting: {e}", file=sys.stderr)
+        return None
     except pymysql.Error as e:
         print(f"✗ Connection failed: {e}", file=sys.stderr)
         return None
@@ -39,20 +59,87 @@ def print_header(title):
     print('='*60)
 
 
-def print_results(results, title="Results"):
-    """Prints query results in a formatted table."""
-    if not results:
-        print("  No data found.")
-        return
+# Rows rendered per buffered write when streaming results
+RENDER_BATCH_SIZE = 500
+
+# Rows per page for the paginated listings
+PAGE_SIZE = 25
+
+
+def render_rows(batches, title="Results", out=None, start=0):
+    """
+    Prints batches of rows in the results format, one buffered write per
+    batch, and returns the number of rows printed. Rows are numbered from
+    start + 1 so consecutive pages continue the numbering.
+    """
+    out = out or sys.stdout
+    count = start
+    for batch in batches:
+        lines = []
+        if count == start:
+            lines.append(f"\n{title}:")
+            lines.append("-" * 60)
+        for row in batch:
+            count += 1
+            lines.append(f"\n[{count}]")
+            lines.extend(f"  {key}: {value}" for key, value in row.items())
+        out.write("\n".join(lines) + "\n")
+        out.flush()
     
-    print(f"\n{title}:")
-    print("-" * 60)
-    for i, row in enumerate(results, 1):
-        print(f"\n[{i}]")
-        for key, value in row.items():
-            print(f"  {key}: {value}")
-    print("-" * 60)
-    print(f"Total: {len(results)} record(s)")
+    if count == start:
+        out.write("  No data found.\n")
+    else:
+        out.write("-" * 60 + f"\nTotal: {count - start} record(s)\n")
+    out.flush()
+    return count - start
+
+
+def print_results(results, title="Results", start=0):
+    """Prints query results in a formatted table."""
+    batches = (results[i:i + RENDER_BATCH_SIZE]
+               for i in range(0, len(results or []), RENDER_BATCH_SIZE))
+    return render_rows(batches, title, start=start)
+
+
+def stream_results(conn, sql, params=None, title="Results", batch_size=RENDER_BATCH_SIZE):
+    """
+    Runs a query on an unbuffered server-side cursor and prints rows as they
+    arrive, so memory stays flat and the first rows show up immediately.
+    Returns the number of rows printed.
+    """
+    with conn.cursor(ProfiledSSDictCursor) as cur:
+        cur.execute(sql, params)
+        return render_rows(iter(lambda: cur.fetchmany(batch_size), []), title)
+
+
+def browse_pages(conn, listing, title, page_size=PAGE_SIZE):
+    """
+    Interactive next/previous browsing of a listing with keyset pagination.
+    """
+    pager = KeysetPager(conn, listing, page_size)
+    rows = pager.next_page()
+    while True:
+        page = max(pager.page_number, 1)
+        print_results(rows, f"{title} (page {page})", start=(page - 1) * page_size)
+        
+        options = []
+        if pager.has_next:
+            options.append("[n]ext")
+        if pager.has_prev:
+            options.append("[p]revious")
+        if not options:
+            return
+        options.append("[q]uit")
+        
+        choice = input(f"\n{' / '.join(options)}: ").strip().lower()
+        if choice == 'n' and pager.has_next:
+            rows = pager.next_page() or rows
+        elif choice == 'p' and pager.has_prev:
+            rows = pager.prev_page() or rows
+        elif choice in ('q', ''):
+            return
+        else:
+            print("Invalid choice.")
 
 
 def confirm_action(message="Proceed with this action?"):
@@ -65,6 +152,7 @@ def confirm_action(message="Proceed with this action?"):
 # READ OPERATIONS (10 QUERIES)
 # ============================================================
 
+@with_connection
 def view_humans_by_company(conn):
     """
     READ 1: View all humans in a specific company
@@ -74,9 +162,7 @@ def view_humans_by_company(conn):
     
     try:
         # First, show available companies
-        with conn.cursor() as cur:
-            cur.execute("SELECT Company_ID, Name FROM Company ORDER BY Name")
-            companies = cur.fetchall()
+        companies = ops.reference_list(conn, "companies")
             
         if not companies:
             print("No companies found in database.")
@@ -88,22 +174,7 @@ def view_humans_by_company(conn):
         
         company_id = input("\nEnter Company ID: ").strip()
         
-        sql = """
-            SELECT h.Human_ID, h.F_Name, h.L_Name, h.Rank, h.Weapon_Type,
-                   c.Name as Company_Name, c.Ethics_Rating,
-                   s.Soul_ID, s.State as Soul_State
-            FROM Human h
-            JOIN Company c ON h.Company_ID = c.Company_ID
-            JOIN Soul s ON h.Soul_ID = s.Soul_ID
-            WHERE c.Company_ID = %s
-            ORDER BY h.Rank, h.L_Name
-        """
-        
-        with conn.cursor() as cur:
-            cur.execute(sql, (company_id,))
-            results = cur.fetchall()
-        
-        print_results(results, f"Human Operatives in Company {company_id}")
+        stream_results(conn, HUMANS_BY_COMPANY_SQL, (company_id,), f"Human Operatives in Company {company_id}")
         
     except pymysql.Error as e:
         print(f"Database error: {e}", file=sys.stderr)
@@ -111,6 +182,7 @@ def view_humans_by_company(conn):
         print(f"Error: {e}", file=sys.stderr)
 
 
+@with_connection
 def view_navi_by_clan(conn):
     """
     READ 2: View Na'vi by clan with alliance information
@@ -120,9 +192,7 @@ def view_navi_by_clan(conn):
     
     try:
         # Show available clans
-        with conn.cursor() as cur:
-            cur.execute("SELECT Clan_ID, Clan_Name FROM Clan ORDER BY Clan_Name")
-            clans = cur.fetchall()
+        clans = ops.reference_list(conn, "clans")
         
         if not clans:
             print("No clans found.")
@@ -134,24 +204,7 @@ def view_navi_by_clan(conn):
         
         clan_id = input("\nEnter Clan ID: ").strip()
         
-        sql = """
-            SELECT n.Navi_ID, n.Name, n.Age,
-                   c.Clan_Name,
-                   a.Name as Alliance_Name, a.Objective as Alliance_Objective,
-                   s.State as Soul_State
-            FROM Navi n
-            JOIN Clan c ON n.Clan_ID = c.Clan_ID
-            LEFT JOIN Alliance a ON c.Alliance_ID = a.Alliance_ID
-            JOIN Soul s ON n.Soul_ID = s.Soul_ID
-            WHERE c.Clan_ID = %s
-            ORDER BY n.Age DESC
-        """
-        
-        with conn.cursor() as cur:
-            cur.execute(sql, (clan_id,))
-            results = cur.fetchall()
-        
-        print_results(results, f"Na'vi in Clan {clan_id}")
+        stream_results(conn, NAVI_BY_CLAN_SQL, (clan_id,), f"Na'vi in Clan {clan_id}")
         
     except pymysql.Error as e:
         print(f"Database error: {e}", file=sys.stderr)
@@ -159,69 +212,39 @@ def view_navi_by_clan(conn):
         print(f"Error: {e}", file=sys.stderr)
 
 
+@with_connection
 def view_avatar_links(conn):
     """
     READ 3: View active avatar links
     SQL: 4-table JOIN (Avatar-Human-Navi-Soul)
+    Paged with keyset pagination (queries.*_LISTING)
     """
     print_header("Active Avatar Links")
     
     try:
-        sql = """
-            SELECT av.Human_ID, av.Navi_ID, av.Link_Status, av.Total_Linked_Hours,
-                   CONCAT(h.F_Name, ' ', h.L_Name) as Human_Name, h.Rank,
-                   n.Name as Navi_Name, n.Age as Navi_Age,
-                   c.Clan_Name,
-                   co.Name as Company_Name
-            FROM Avatar av
-            JOIN Human h ON av.Human_ID = h.Human_ID
-            JOIN Navi n ON av.Navi_ID = n.Navi_ID
-            JOIN Clan c ON n.Clan_ID = c.Clan_ID
-            LEFT JOIN Company co ON h.Company_ID = co.Company_ID
-            WHERE av.Link_Status = 'Active'
-            ORDER BY av.Total_Linked_Hours DESC
-        """
-        
-        with conn.cursor() as cur:
-            cur.execute(sql)
-            results = cur.fetchall()
-        
-        print_results(results, "Active Avatar Links")
+        browse_pages(conn, AVATAR_LINKS_LISTING, "Active Avatar Links")
         
     except pymysql.Error as e:
         print(f"Database error: {e}", file=sys.stderr)
 
 
+@with_connection
 def view_navi_bonded_animals(conn):
     """
     READ 4: View Na'vi with their bonded animals
     SQL: LEFT JOIN to show Na'vi with and without bonded animals
+    Paged with keyset pagination (queries.*_LISTING)
     """
     print_header("Na'vi Bonded Animals")
     
     try:
-        sql = """
-            SELECT n.Navi_ID, n.Name as Navi_Name, n.Age,
-                   ba.Name as Bonded_Animal,
-                   c.Clan_Name,
-                   a.Name as Alliance_Name
-            FROM Navi n
-            LEFT JOIN Bonded_Animal ba ON n.Navi_ID = ba.Navi_ID
-            JOIN Clan c ON n.Clan_ID = c.Clan_ID
-            LEFT JOIN Alliance a ON c.Alliance_ID = a.Alliance_ID
-            ORDER BY c.Clan_Name, n.Name
-        """
-        
-        with conn.cursor() as cur:
-            cur.execute(sql)
-            results = cur.fetchall()
-        
-        print_results(results, "Na'vi and Their Bonded Animals")
+        browse_pages(conn, NAVI_BONDED_ANIMALS_LISTING, "Na'vi and Their Bonded Animals")
         
     except pymysql.Error as e:
         print(f"Database error: {e}", file=sys.stderr)
 
 
+@with_connection
 def view_alliance_resources(conn):
     """
     READ 5: View alliance resource control
@@ -230,58 +253,75 @@ def view_alliance_resources(conn):
     print_header("Alliance Resource Control Analysis")
     
     try:
-        sql = """
-            SELECT a.Alliance_ID, a.Name as Alliance_Name, a.Objective,
-                   COUNT(ast.Site_ID) as Sites_Controlled,
-                   COALESCE(SUM(ast.Resource_Quantity), 0) as Total_Resources,
-                   COALESCE(AVG(ast.Resource_Quantity), 0) as Avg_Resources_Per_Site
-            FROM Alliance a
-            LEFT JOIN Aetherium_Site ast ON a.Alliance_ID = ast.Alliance_ID 
-                AND ast.Status = 'Claimed'
-            GROUP BY a.Alliance_ID
-            ORDER BY Total_Resources DESC
-        """
-        
-        with conn.cursor() as cur:
-            cur.execute(sql)
-            results = cur.fetchall()
-        
+        results = ops.alliance_resources(conn)
         print_results(results, "Alliance Resource Statistics")
         
     except pymysql.Error as e:
         print(f"Database error: {e}", file=sys.stderr)
 
 
+@with_connection
 def view_company_clan_partnerships(conn):
     """
     READ 6: View company-clan partnerships
     SQL: 3-table JOIN (Partnership-Company-Clan-Alliance)
+    Paged with keyset pagination (queries.*_LISTING)
     """
     print_header("Company-Clan Partnerships")
     
     try:
-        sql = """
-            SELECT p.Company_ID, p.Clan_ID,
-                   co.Name as Company_Name, co.Ethics_Rating,
-                   c.Clan_Name,
-                   a.Name as Alliance_Name, a.Objective
-            FROM Partnership p
-            JOIN Company co ON p.Company_ID = co.Company_ID
-            JOIN Clan c ON p.Clan_ID = c.Clan_ID
-            LEFT JOIN Alliance a ON p.Alliance_ID = a.Alliance_ID
-            ORDER BY a.Name, co.Name
-        """
+        browse_pages(conn, COMPANY_CLAN_PARTNERSHIPS_LISTING, "Active Partnerships")
         
-        with conn.cursor() as cur:
-            cur.execute(sql)
-            results = cur.fetchall()
+    except pymysql.Error as e:
+        print(f"Database error: {e}", file=sys.stderr)
+
+
+@with_connection
+def view_alliance_network(conn):
+    """
+    READ (graph): Allies, allies of allies and opponents of an alliance
+    In-memory: traversals of the alliance relationship graph
+    """
+    print_header("Alliance Network")
+    
+    try:
+        alliances = ops.reference_list(conn, "alliances")
         
-        print_results(results, "Active Partnerships")
+        print("\nAlliances:")
+        for alliance in alliances:
+            print(f"  ID {alliance['Alliance_ID']}: {alliance['Name']}")
+        
+        alliance_id = int(input("\nEnter Alliance ID: ").strip())
+        
+        print_results(ops.alliance_allies(conn, alliance_id),
+                      f"Allies of Alliance {alliance_id} (Degree 2 = ally of an ally)")
+        print_results(ops.alliance_opponents(conn, alliance_id),
+                      f"Alliances Fought by Alliance {alliance_id}")
+        
+    except OperationError as e:
+        print(e)
+    except pymysql.Error as e:
+        print(f"Database error: {e}", file=sys.stderr)
+    except ValueError:
+        print("Invalid number entered.")
+
+
+@with_connection
+def view_alliance_blocs(conn):
+    """
+    READ (graph): Connected blocs of alliances, clans and companies
+    In-memory: connected components of the alliance relationship graph
+    """
+    print_header("Alliance Blocs")
+    
+    try:
+        print_results(ops.alliance_blocs(conn), "Blocs Tied by Membership and Partnerships")
         
     except pymysql.Error as e:
         print(f"Database error: {e}", file=sys.stderr)
 
 
+@with_connection
 def view_war_active_clans(conn):
     """
     READ 7: Most war-active clans
@@ -293,23 +333,7 @@ def view_war_active_clans(conn):
         min_wars = input("Minimum wars participated (default 1): ").strip()
         min_wars = int(min_wars) if min_wars else 1
         
-        sql = """
-            SELECT c.Clan_ID, c.Clan_Name,
-                   a.Name as Alliance_Name,
-                   COUNT(fi.War_ID) as Wars_Participated,
-                   AVG(CAST(fi.Strength as UNSIGNED)) as Avg_Strength
-            FROM Clan c
-            JOIN Fights_In fi ON c.Clan_ID = fi.Clan_ID
-            LEFT JOIN Alliance a ON c.Alliance_ID = a.Alliance_ID
-            GROUP BY c.Clan_ID
-            HAVING COUNT(fi.War_ID) >= %s
-            ORDER BY Wars_Participated DESC, Avg_Strength DESC
-        """
-        
-        with conn.cursor() as cur:
-            cur.execute(sql, (min_wars,))
-            results = cur.fetchall()
-        
+        results = ops.war_active_clans(conn, min_wars)
         print_results(results, f"Clans with {min_wars}+ Wars")
         
     except pymysql.Error as e:
@@ -318,6 +342,7 @@ def view_war_active_clans(conn):
         print("Invalid number entered.")
 
 
+@with_connection
 def view_war_history(conn):
     """
     READ 8: View war history for an alliance
@@ -327,9 +352,7 @@ def view_war_history(conn):
     
     try:
         # Show alliances
-        with conn.cursor() as cur:
-            cur.execute("SELECT Alliance_ID, Name FROM Alliance ORDER BY Name")
-            alliances = cur.fetchall()
+        alliances = ops.reference_list(conn, "alliances")
         
         print("\nAlliances:")
         for alliance in alliances:
@@ -337,25 +360,8 @@ def view_war_history(conn):
         
         alliance_id = input("\nEnter Alliance ID: ").strip()
         
-        sql = """
-            SELECT w.War_ID, w.Casualties, w.Outcome,
-                   a_attack.Name as Attacking_Alliance,
-                   a_defend.Name as Defending_Alliance,
-                   COUNT(DISTINCT fi.Clan_ID) as Clans_Involved
-            FROM War w
-            JOIN Alliance a_attack ON w.Attack_Alliance_ID = a_attack.Alliance_ID
-            JOIN Alliance a_defend ON w.Defense_Alliance_ID = a_defend.Alliance_ID
-            LEFT JOIN Fights_In fi ON w.War_ID = fi.War_ID
-            WHERE w.Attack_Alliance_ID = %s OR w.Defense_Alliance_ID = %s
-            GROUP BY w.War_ID
-            ORDER BY w.Casualties DESC
-        """
-        
-        with conn.cursor() as cur:
-            cur.execute(sql, (alliance_id, alliance_id))
-            results = cur.fetchall()
-        
-        print_results(results, f"Wars Involving Alliance {alliance_id}")
+        stream_results(conn, WAR_HISTORY_SQL, (alliance_id, alliance_id),
+                       f"Wars Involving Alliance {alliance_id}")
         
     except pymysql.Error as e:
         print(f"Database error: {e}", file=sys.stderr)
@@ -363,6 +369,39 @@ def view_war_history(conn):
         print(f"Error: {e}", file=sys.stderr)
 
 
+@with_connection
+def view_conflict_path(conn):
+    """
+    READ (graph): Shortest chain of wars between two alliances
+    In-memory: BFS over the alliance war graph
+    """
+    print_header("Shortest Conflict Path")
+    
+    try:
+        alliances = ops.reference_list(conn, "alliances")
+        
+        print("\nAlliances:")
+        for alliance in alliances:
+            print(f"  ID {alliance['Alliance_ID']}: {alliance['Name']}")
+        
+        from_id = int(input("\nFrom Alliance ID: ").strip())
+        to_id = int(input("To Alliance ID: ").strip())
+        
+        path = ops.conflict_path(conn, from_id, to_id)
+        if path:
+            print_results(path, f"Conflict Path ({len(path) - 1} war link(s))")
+        else:
+            print(f"\nNo chain of wars links alliance {from_id} to alliance {to_id}.")
+        
+    except OperationError as e:
+        print(e)
+    except pymysql.Error as e:
+        print(f"Database error: {e}", file=sys.stderr)
+    except ValueError:
+        print("Invalid number entered.")
+
+
+@with_connection
 def view_sites_by_ecosystem(conn):
     """
     READ 9: View aetherium sites by ecosystem with flora
@@ -372,9 +411,7 @@ def view_sites_by_ecosystem(conn):
     
     try:
         # Show ecosystems
-        with conn.cursor() as cur:
-            cur.execute("SELECT Eco_ID, Name, Biome_Type FROM Ecosystem ORDER BY Name")
-            ecosystems = cur.fetchall()
+        ecosystems = ops.reference_list(conn, "ecosystems")
         
         print("\nEcosystems:")
         for eco in ecosystems:
@@ -382,25 +419,7 @@ def view_sites_by_ecosystem(conn):
         
         eco_id = input("\nEnter Ecosystem ID: ").strip()
         
-        sql = """
-            SELECT e.Name as Ecosystem_Name, e.Biome_Type, e.Dominant_Species,
-                   ast.Site_ID, ast.Resource_Quantity, ast.Status,
-                   a.Name as Controlled_By_Alliance,
-                   GROUP_CONCAT(DISTINCT ef.Flora_Name SEPARATOR ', ') as Flora_Species
-            FROM Ecosystem e
-            LEFT JOIN Aetherium_Site ast ON e.Eco_ID = ast.Eco_ID
-            LEFT JOIN Alliance a ON ast.Alliance_ID = a.Alliance_ID
-            LEFT JOIN Ecosystem_Flora ef ON e.Eco_ID = ef.Eco_ID
-            WHERE e.Eco_ID = %s
-            GROUP BY ast.Site_ID
-            ORDER BY ast.Resource_Quantity DESC
-        """
-        
-        with conn.cursor() as cur:
-            cur.execute(sql, (eco_id,))
-            results = cur.fetchall()
-        
-        print_results(results, f"Sites in Ecosystem {eco_id}")
+        stream_results(conn, SITES_BY_ECOSYSTEM_SQL, (eco_id,), f"Sites in Ecosystem {eco_id}")
         
     except pymysql.Error as e:
         print(f"Database error: {e}", file=sys.stderr)
@@ -408,45 +427,158 @@ def view_sites_by_ecosystem(conn):
         print(f"Error: {e}", file=sys.stderr)
 
 
+@with_connection
+def find_nearby_companies(conn):
+    """
+    READ (proximity): Companies nearest a point or within a radius
+    In-memory: grid index over Company.Latitude / Longitude, sites from Staffs
+    """
+    print_header("Companies Near a Location")
+    
+    try:
+        latitude = float(input("Latitude (-90 to 90): ").strip())
+        longitude = float(input("Longitude (-180 to 180): ").strip())
+        radius = input(f"Radius in km (Enter for the nearest {ops.NEAREST_LIMIT}): ").strip()
+        with_sites = input("Include staffed sites? (yes/no): ").strip().lower() in ('yes', 'y')
+        
+        if radius:
+            results = ops.companies_within(conn, latitude, longitude, float(radius), with_sites)
+            title = f"Companies within {radius} km of ({latitude}, {longitude})"
+        else:
+            results = ops.nearest_companies(conn, latitude, longitude, with_sites=with_sites)
+            title = f"Companies nearest ({latitude}, {longitude})"
+        print_results(results, title)
+        
+    except OperationError as e:
+        print(e)
+    except pymysql.Error as e:
+        print(f"Database error: {e}", file=sys.stderr)
+    except ValueError:
+        print("Invalid number entered.")
+
+
+@with_connection
 def ecosystem_threat_analysis(conn):
     """
-    READ 10: Ecosystem threat analysis
-    SQL: 4-table JOIN with aggregations (AVG, COUNT)
+    READ 10: Ecosystem threat analysis, all time or over a recent window
+    SQL: 4-table JOIN with aggregations (AVG, COUNT); windows read the hourly rollup
     """
     print_header("Ecosystem Threat Assessment")
     
+    window = input("Time window (24h, 7d, 30d; Enter for all time): ").strip() or None
+    
     try:
-        sql = """
-            SELECT e.Eco_ID, e.Name as Ecosystem_Name, e.Biome_Type,
-                   COUNT(DISTINCT ro.Report_ID) as Threat_Reports,
-                   AVG(CAST(ro.Danger_Level_Observed as UNSIGNED)) as Avg_Danger_Level,
-                   SUM(ro.Resource_Estimate_Change) as Total_Resource_Loss
-            FROM Ecosystem e
-            JOIN Aetherium_Site ast ON e.Eco_ID = ast.Eco_ID
-            JOIN Report_Site rs ON ast.Site_ID = rs.Site_ID
-            JOIN Report_Observation ro ON rs.Report_ID = ro.Report_ID
-            GROUP BY e.Eco_ID
-            HAVING COUNT(ro.Report_ID) > 0
-            ORDER BY Avg_Danger_Level DESC, Threat_Reports DESC
-        """
-        
-        with conn.cursor() as cur:
-            cur.execute(sql)
-            results = cur.fetchall()
-        
-        print_results(results, "Ecosystem Threat Analysis")
+        results = ops.ecosystem_threats(conn, window)
+        title = f"Ecosystem Threat Analysis (last {window})" if window else "Ecosystem Threat Analysis"
+        print_results(results, title)
         
         if results:
             print("\n⚠ Danger Level Scale: 1 (Low) - 10 (Critical)")
         
+    except OperationError as e:
+        print(e)
     except pymysql.Error as e:
         print(f"Database error: {e}", file=sys.stderr)
 
 
+@with_connection
+def search_intelligence(conn):
+    """
+    READ (search): Ranked search over threat descriptions or alliance objectives
+    SQL: MATCH ... AGAINST on FULLTEXT indexes
+    """
+    print_header("Search Reports & Alliances")
+    
+    target = input("Search (r)eports or (a)lliance objectives? [r]: ").strip().lower() or 'r'
+    query = input("Search words (prefix with + / - for required / excluded words): ").strip()
+    mode = "boolean" if any(ch in query for ch in '+-"*') else "natural"
+    
+    try:
+        if target == 'a':
+            results = ops.search_alliances(conn, query, mode=mode)
+            print_results(results, f"Alliances Matching '{query}'")
+            return
+        
+        eco_id = input("Ecosystem ID (Enter for all): ").strip()
+        alliance_id = input("Alliance ID (Enter for all): ").strip()
+        window = input("Time window (24h, 7d, 30d; Enter for all time): ").strip() or None
+        results = ops.search_reports(conn, query, int(eco_id) if eco_id else None,
+                                     int(alliance_id) if alliance_id else None, window,
+                                     mode=mode)
+        print_results(results, f"Reports Matching '{query}'")
+        
+    except OperationError as e:
+        print(e)
+    except pymysql.Error as e:
+        print(f"Database error: {e}", file=sys.stderr)
+    except ValueError:
+        print("Invalid number entered.")
+
+
+def intelligence_briefing(pool):
+    """
+    All READ reports at once, run concurrently on pooled connections
+    """
+    print_header("Full Intelligence Briefing")
+    
+    params = {}
+    for key, label in (("company_id", "Company"), ("clan_id", "Clan"),
+                       ("alliance_id", "Alliance"), ("eco_id", "Ecosystem")):
+        value = input(f"{label} ID (Enter to skip): ").strip()
+        if value:
+            if not value.isdigit():
+                print("IDs must be numbers.")
+                return
+            params[key] = int(value)
+    
+    briefing = run_dashboard(pool, **params)
+    for report in briefing["reports"]:
+        if "error" in report:
+            print(f"\n{report['report']}: ✗ {report['error']}", file=sys.stderr)
+        else:
+            print_results(report["rows"], report["report"])
+    
+    print_header("Report Timings")
+    print_timings(briefing, sys.stdout)
+
+
+def ingest_field_reports(pool):
+    """
+    Bulk INSERT of intelligence reports from a JSON-lines file
+    SQL: multi-row INSERT into Report_Meta, Report_Site, Report_Observation per batch
+    """
+    print_header("Ingest Field Reports")
+    
+    path = input("Reports file (.jsonl): ").strip()
+    if not path:
+        return
+    
+    def report(line, reason, record):
+        print(f"  ✗ line {line}: {reason}")
+    
+    def progress(summary):
+        print(f"  … {format_summary(summary)}")
+    
+    try:
+        with open(path, encoding="utf-8") as stream:
+            # One writer (the default): concurrent writers serialize on the rollup rows
+            summary = ingest_reports(pool, read_records(stream, "jsonl"),
+                                     on_reject=report, on_progress=progress)
+    except OSError as e:
+        print(f"✗ Error: {e}", file=sys.stderr)
+        return
+    except pymysql.Error as e:
+        print(f"✗ Database error: {e}", file=sys.stderr)
+        return
+    
+    print(f"\n✓ Ingested {format_summary(summary)}")
+
+
 # ============================================================
 # WRITE OPERATIONS (5 UPDATES)
 # ============================================================
 
+@with_connection
 def create_human(conn):
     """
     WRITE 1: Create a new human character
@@ -456,9 +588,7 @@ def create_human(conn):
     
     try:
         # Show companies
-        with conn.cursor() as cur:
-            cur.execute("SELECT Company_ID, Name FROM Company ORDER BY Name")
-            companies = cur.fetchall()
+        companies = ops.reference_list(conn, "companies")
         
         print("\nAvailable Companies:")
         for comp in companies:
@@ -471,25 +601,13 @@ def create_human(conn):
         weapon = input("Weapon Type: ").strip()
         company_id = input("Company ID: ").strip()
         
-        if not all([f_name, l_name]):
-            print("First name and last name are required.")
-            return
-        
-        # Create a new soul with "Alive" state automatically
-        with conn.cursor() as cur:
-            cur.execute("INSERT INTO Soul (State) VALUES ('Alive')")
-            soul_id = cur.lastrowid
-            
-            # Insert the human with the new soul ID
-            sql = """
-                INSERT INTO Human (F_Name, L_Name, `Rank`, Weapon_Type, Soul_ID, Company_ID)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            cur.execute(sql, (f_name, l_name, rank, weapon, soul_id, company_id or None))
-        
-        conn.commit()
+        # A new soul with "Alive" state is created automatically
+        created = ops.create_human(conn, f_name, l_name, rank, weapon, company_id or None)
         print(f"\n✓ Human operative '{f_name} {l_name}' created successfully!")
-        print(f"  Soul ID {soul_id} (State: Alive) automatically assigned.")
+        print(f"  Soul ID {created['soul_id']} (State: Alive) automatically assigned.")
+        
+    except OperationError as e:
+        print(e)
         
     except pymysql.IntegrityError as e:
         conn.rollback()
@@ -503,6 +621,7 @@ def create_human(conn):
         print(f"✗ Error: {e}", file=sys.stderr)
 
 
+@with_connection
 def create_navi(conn):
     """
     WRITE 2: Create a new Na'vi character
@@ -512,9 +631,7 @@ def create_navi(conn):
     
     try:
         # Show clans
-        with conn.cursor() as cur:
-            cur.execute("SELECT Clan_ID, Clan_Name FROM Clan ORDER BY Clan_Name")
-            clans = cur.fetchall()
+        clans = ops.reference_list(conn, "clans")
         
         print("\nAvailable Clans:")
         for clan in clans:
@@ -525,25 +642,13 @@ def create_navi(conn):
         age = input("Age: ").strip()
         clan_id = input("Clan ID: ").strip()
         
-        if not name:
-            print("Name is required.")
-            return
-        
-        # Create a new soul with "Alive" state automatically
-        with conn.cursor() as cur:
-            cur.execute("INSERT INTO Soul (State) VALUES ('Alive')")
-            soul_id = cur.lastrowid
-            
-            # Insert the Na'vi with the new soul ID
-            sql = """
-                INSERT INTO Navi (Name, Age, Soul_ID, Clan_ID)
-                VALUES (%s, %s, %s, %s)
-            """
-            cur.execute(sql, (name, age or None, soul_id, clan_id or None))
-        
-        conn.commit()
+        # A new soul with "Alive" state is created automatically
+        created = ops.create_navi(conn, name, age or None, clan_id or None)
         print(f"\n✓ Na'vi '{name}' created successfully!")
-        print(f"  Soul ID {soul_id} (State: Alive) automatically assigned.")
+        print(f"  Soul ID {created['soul_id']} (State: Alive) automatically assigned.")
+        
+    except OperationError as e:
+        print(e)
         
     except pymysql.IntegrityError as e:
         conn.rollback()
@@ -557,6 +662,70 @@ def create_navi(conn):
         print(f"✗ Error: {e}", file=sys.stderr)
 
 
+@with_connection
+def bulk_import_characters(conn):
+    """
+    Bulk INSERT of Humans or Na'vi from a CSV / JSON-lines file
+    SQL: multi-row INSERT into Soul + Human/Navi, one transaction per chunk
+    """
+    print_header("Bulk Import Characters")
+    
+    kind = input("Import humans or navi? ").strip().lower()
+    if kind not in ENTITIES:
+        print("Please enter 'humans' or 'navi'.")
+        return
+    path = input("File path (.csv or .jsonl): ").strip()
+    if not path:
+        return
+    
+    def report(line, reason, record):
+        print(f"  ✗ line {line}: {reason}")
+    
+    try:
+        imported, rejected = import_file(conn, kind, path, on_reject=report)
+    except (OSError, ValueError) as e:
+        print(f"✗ Error: {e}", file=sys.stderr)
+        return
+    except pymysql.Error as e:
+        conn.rollback()
+        print(f"✗ Database error: {e}", file=sys.stderr)
+        return
+    finally:
+        # Chunks committed before a failure are kept
+        ops.invalidate("Soul", ENTITIES[kind]["table"])
+    
+    print(f"\n✓ Imported {imported} {kind}, {rejected} rejected.")
+
+
+def choose_available(conn, label, search, id_key, describe):
+    """
+    Typeahead over an unlinked pool: shows the first matches, then either
+    takes an ID or searches again by name prefix. Returns the ID or None.
+    """
+    prefix = ""
+    while True:
+        matches = search(conn, prefix)
+        if not matches and not prefix:
+            print(f"\n⚠ No available {label} without avatar links.")
+            return None
+        
+        heading = f"named '{prefix}...'" if prefix else f"(first {ops.TYPEAHEAD_LIMIT})"
+        print(f"\nAvailable {label} {heading}:")
+        for row in matches:
+            print(f"  ID {row[id_key]}: {describe(row)}")
+        if not matches:
+            print("  (no matches)")
+        
+        answer = input(f"Enter {label} ID, or a name prefix to search (blank to cancel): ").strip()
+        if not answer:
+            print("Action cancelled.")
+            return None
+        if answer.isdigit():
+            return answer
+        prefix = answer
+
+
+@with_connection
 def create_avatar_link(conn):
     """
     WRITE 3: Form an avatar link between human and Na'vi
@@ -565,66 +734,24 @@ def create_avatar_link(conn):
     print_header("Form Avatar Link")
     
     try:
-        # Show only humans and na'vi without existing avatar links
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT h.Human_ID, CONCAT(h.F_Name, ' ', h.L_Name) as Name, 
-                       c.Name as Company
-                FROM Human h
-                LEFT JOIN Company c ON h.Company_ID = c.Company_ID
-                LEFT JOIN Avatar av ON h.Human_ID = av.Human_ID
-                WHERE av.Human_ID IS NULL
-                ORDER BY h.Human_ID DESC
-            """)
-            humans = cur.fetchall()
-            
-            cur.execute("""
-                SELECT n.Navi_ID, n.Name, cl.Clan_Name
-                FROM Navi n
-                LEFT JOIN Clan cl ON n.Clan_ID = cl.Clan_ID
-                LEFT JOIN Avatar av ON n.Navi_ID = av.Navi_ID
-                WHERE av.Navi_ID IS NULL
-                ORDER BY n.Navi_ID DESC
-            """)
-            navis = cur.fetchall()
-        
-        if not humans:
-            print("\n⚠ No available humans without avatar links.")
+        # Search the unlinked pools instead of listing every operative
+        human_id = choose_available(conn, "Humans", ops.available_humans, "Human_ID",
+                                    lambda h: f"{h['Name']} ({h['Company'] or 'No Company'})")
+        if human_id is None:
             return
-        
-        if not navis:
-            print("\n⚠ No available Na'vi without avatar links.")
+        navi_id = choose_available(conn, "Na'vi", ops.available_navi, "Navi_ID",
+                                   lambda n: f"{n['Name']} ({n['Clan_Name'] or 'No Clan'})")
+        if navi_id is None:
             return
         
-        print(f"\nAvailable Humans (Total: {len(humans)}):")
-        for h in humans:
-            company = h['Company'] or 'No Company'
-            print(f"  ID {h['Human_ID']}: {h['Name']} ({company})")
-        
-        print(f"\nAvailable Na'vi (Total: {len(navis)}):")
-        for n in navis:
-            clan = n['Clan_Name'] or 'No Clan'
-            print(f"  ID {n['Navi_ID']}: {n['Name']} ({clan})")
-        
-        human_id = input("\nEnter Human ID: ").strip()
-        navi_id = input("Enter Na'vi ID: ").strip()
         link_status = input("Link Status (default: Active): ").strip() or "Active"
         
-        if not all([human_id, navi_id]):
-            print("Both Human ID and Na'vi ID are required.")
-            return
-        
-        sql = """
-            INSERT INTO Avatar (Human_ID, Navi_ID, Link_Status, Total_Linked_Hours)
-            VALUES (%s, %s, %s, 0)
-        """
-        
-        with conn.cursor() as cur:
-            cur.execute(sql, (human_id, navi_id, link_status))
-        
-        conn.commit()
+        ops.create_avatar_link(conn, human_id, navi_id, link_status)
         print(f"\n✓ Avatar link created successfully! (Human {human_id} ↔ Na'vi {navi_id})")
         
+    except OperationError as e:
+        print(e)
+        
     except pymysql.IntegrityError as e:
         conn.rollback()
         print(f"✗ Data integrity error: {e}", file=sys.stderr)
@@ -637,6 +764,7 @@ def create_avatar_link(conn):
         print(f"✗ Error: {e}", file=sys.stderr)
 
 
+@with_connection
 def update_site_status(conn):
     """
     WRITE 4: Update aetherium site status and ownership
@@ -656,9 +784,7 @@ def update_site_status(conn):
                 ORDER BY ast.Site_ID
             """)
             sites = cur.fetchall()
-            
-            cur.execute("SELECT Alliance_ID, Name FROM Alliance ORDER BY Name")
-            alliances = cur.fetchall()
+        alliances = ops.reference_list(conn, "alliances")
         
         print("\nCurrent Sites:")
         for site in sites:
@@ -670,7 +796,7 @@ def update_site_status(conn):
         print("\nStatus Options: Unclaimed, Claimed, Depleted")
         new_status = input("New Status: ").strip()
         
-        if new_status not in ['Unclaimed', 'Claimed', 'Depleted']:
+        if new_status not in ops.SITE_STATUSES:
             print("Invalid status. Must be: Unclaimed, Claimed, or Depleted")
             return
         
@@ -686,16 +812,7 @@ def update_site_status(conn):
             print("Action cancelled.")
             return
         
-        sql = """
-            UPDATE Aetherium_Site
-            SET Status = %s, Alliance_ID = %s
-            WHERE Site_ID = %s
-        """
-        
-        with conn.cursor() as cur:
-            cur.execute(sql, (new_status, alliance_id, site_id))
-        
-        conn.commit()
+        ops.update_site_status(conn, site_id, new_status, alliance_id)
         print(f"\n✓ Site {site_id} updated to '{new_status}'!")
         
     except pymysql.Error as e:
@@ -706,6 +823,7 @@ def update_site_status(conn):
         print(f"✗ Error: {e}", file=sys.stderr)
 
 
+@with_connection
 def update_company_ethics(conn):
     """
     WRITE 5: Update company ethics rating
@@ -715,9 +833,7 @@ def update_company_ethics(conn):
     
     try:
         # Show companies
-        with conn.cursor() as cur:
-            cur.execute("SELECT Company_ID, Name, Ethics_Rating FROM Company ORDER BY Name")
-            companies = cur.fetchall()
+        companies = ops.reference_list(conn, "companies")
         
         print("\nCompanies:")
         for comp in companies:
@@ -740,16 +856,7 @@ def update_company_ethics(conn):
             print("Action cancelled.")
             return
         
-        sql = """
-            UPDATE Company
-            SET Ethics_Rating = %s
-            WHERE Company_ID = %s
-        """
-        
-        with conn.cursor() as cur:
-            cur.execute(sql, (new_rating, company_id))
-        
-        conn.commit()
+        ops.update_company_ethics(conn, company_id, rating_val)
         print(f"\n✓ Company {company_id} ethics rating updated to {new_rating}!")
         
     except pymysql.Error as e:
@@ -760,6 +867,7 @@ def update_company_ethics(conn):
         print(f"✗ Error: {e}", file=sys.stderr)
 
 
+@with_connection
 def delete_alliance(conn):
     """
     WRITE 6 (DELETE): Delete an alliance (cascades to related data)
@@ -768,46 +876,37 @@ def delete_alliance(conn):
     print_header("Delete Alliance (ADMIN)")
     
     try:
-        # Show alliances with stats
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT a.Alliance_ID, a.Name, a.Objective,
-                       COUNT(DISTINCT c.Clan_ID) as Clans,
-                       COUNT(DISTINCT ast.Site_ID) as Sites
-                FROM Alliance a
-                LEFT JOIN Clan c ON a.Alliance_ID = c.Alliance_ID
-                LEFT JOIN Aetherium_Site ast ON a.Alliance_ID = ast.Alliance_ID
-                GROUP BY a.Alliance_ID
-                ORDER BY a.Name
-            """)
-            alliances = cur.fetchall()
+        # Show alliances with what deleting each would touch
+        alliances = ops.alliance_impact(conn)
         
         print("\nAlliances:")
         for alliance in alliances:
             print(f"  ID {alliance['Alliance_ID']}: {alliance['Name']}")
-            print(f"    Clans: {alliance['Clans']} | Sites: {alliance['Sites']}")
+            print(f"    Clans: {alliance['Clans']} | Sites: {alliance['Sites']} | "
+                  f"Partnerships: {alliance['Partnerships']} | Wars: {alliance['Wars']} | "
+                  f"Reports: {alliance['Reports']}")
             print(f"    Objective: {alliance['Objective']}")
         
         alliance_id = input("\nEnter Alliance ID to DELETE: ").strip()
         
-        print("\n⚠ WARNING: This will:")
-        print("  - Remove alliance from clans (set to NULL)")
-        print("  - Remove alliance from sites (set to NULL)")
-        print("  - Remove alliance from partnerships (set to NULL)")
-        print("  - Remove related war records (set to NULL)")
+        impact = ops.alliance_impact(conn, alliance_id)
+        if not impact:
+            print(f"\n✗ Alliance {alliance_id} not found.")
+            return
+        impact = impact[0]
+        
+        print(f"\n⚠ WARNING: Deleting {impact['Name']} will:")
+        print(f"  - Remove alliance from {impact['Clans']} clan(s) (set to NULL)")
+        print(f"  - Remove alliance from {impact['Sites']} site(s) (set to NULL)")
+        print(f"  - Remove alliance from {impact['Partnerships']} partnership(s) (set to NULL)")
+        print(f"  - Remove alliance from {impact['Wars']} war record(s) (set to NULL)")
+        print(f"  - Remove alliance from {impact['Reports']} report observation(s) (set to NULL)")
         
         if not confirm_action("PERMANENTLY DELETE this alliance?"):
             print("Action cancelled.")
             return
         
-        sql = "DELETE FROM Alliance WHERE Alliance_ID = %s"
-        
-        with conn.cursor() as cur:
-            cur.execute(sql, (alliance_id,))
-            rows_affected = cur.rowcount
-        
-        if rows_affected > 0:
-            conn.commit()
+        if ops.delete_alliance(conn, alliance_id)["deleted"]:
             print(f"\n✓ Alliance {alliance_id} deleted successfully!")
         else:
             print(f"\n✗ Alliance {alliance_id} not found.")
@@ -820,11 +919,123 @@ def delete_alliance(conn):
         print(f"✗ Error: {e}", file=sys.stderr)
 
 
+def view_cache_statistics():
+    """
+    ADMIN: Show query result cache counters
+    """
+    print_header("Query Cache Statistics")
+    
+    for title, cache in (("Report results", RESULT_CACHE),
+                         ("Reference lists", REFERENCE_CACHE)):
+        print(f"\n{title}:")
+        for key, value in cache.stats().items():
+            print(f"  {key}: {value}")
+    
+    print("\nAlliance graph:")
+    for row in ops.ALLIANCE_GRAPH.stats() or [{"Edge_Set": "(not loaded)"}]:
+        print("  " + ", ".join(f"{key}: {value}" for key, value in row.items()))
+    
+    print("\nCompany grid index:")
+    for key, value in (ops.COMPANY_LOCATOR.stats() or {"state": "not loaded"}).items():
+        print(f"  {key}: {value}")
+    
+    if confirm_action("\nClear the caches?"):
+        RESULT_CACHE.clear()
+        REFERENCE_CACHE.clear()
+        print("✓ Caches cleared.")
+
+
+def view_query_profile():
+    """
+    ADMIN: Per-operation query timings and slow-query log settings
+    """
+    print_header("Query Profiling")
+    
+    print(f"  profiling: {'ON' if PROFILER.enabled else 'OFF'}")
+    print(f"  slow-query threshold: {PROFILER.slow_ms:g} ms")
+    print(f"  slow-query log: {PROFILER.slow_log}")
+    print_results(PROFILER.stats(), "Statements by Operation")
+    
+    print("\n1. Turn profiling " + ("off" if PROFILER.enabled else "on"))
+    print("2. Change slow-query threshold")
+    print("3. Reset statistics")
+    choice = input("Select option (Enter to go back): ").strip()
+    if choice == '1':
+        PROFILER.enabled = not PROFILER.enabled
+        print(f"✓ Profiling {'enabled' if PROFILER.enabled else 'disabled'}.")
+    elif choice == '2':
+        try:
+            PROFILER.slow_ms = float(input("Threshold in ms: ").strip())
+            print(f"✓ Statements over {PROFILER.slow_ms:g} ms will be logged.")
+        except ValueError:
+            print("Invalid number.")
+    elif choice == '3':
+        PROFILER.reset()
+        print("✓ Statistics reset.")
+
+
+@with_connection
+def repair_summaries(conn):
+    """
+    ADMIN: Check and rebuild the trigger-maintained summary tables
+    SQL: DELETE + INSERT ... SELECT into Alliance_Resource_Summary / Ecosystem_Threat_Rollup
+    """
+    print_header("Rebuild Summary Tables")
+    
+    try:
+        for name, (check, _) in SUMMARIES.items():
+            drift = check(conn)
+            if drift:
+                print_results(drift, f"Drifted {name} Rows")
+            else:
+                print(f"\n✓ {name} matches its base tables; no drift found.")
+        
+        if not confirm_action("Rebuild the summaries from scratch?"):
+            print("Action cancelled.")
+            return
+        
+        for name, (_, rebuild) in SUMMARIES.items():
+            written = rebuild(conn)
+            print(f"✓ Rebuilt {name} ({written} rows)")
+        ops.invalidate("Aetherium_Site", "Report_Observation")
+        
+    except pymysql.Error as e:
+        print(f"✗ Database error: {e}", file=sys.stderr)
+
+
+@with_connection
+def archive_old_reports(conn):
+    """
+    ADMIN: Move reports older than a horizon into the partitioned archive
+    SQL: INSERT ... SELECT into Report_Archive / Report_Site_Archive + DELETE per batch
+    """
+    print_header("Archive Old Reports")
+    
+    try:
+        print_results(retention_status(conn), "Report Tiers")
+        
+        days = input(f"\nKeep how many days in the hot tables? [{DEFAULT_HORIZON_DAYS}]: ").strip()
+        if days and not days.isdigit():
+            print("Invalid number.")
+            return
+        cutoff = horizon_cutoff(conn, int(days or DEFAULT_HORIZON_DAYS))
+        
+        if not confirm_action(f"Archive every report older than {cutoff}?"):
+            print("Action cancelled.")
+            return
+        
+        archived = archive_reports(conn, cutoff)
+        print(f"\n✓ Archived {archived} report(s); they stay visible to the threat analysis.")
+        
+    except pymysql.Error as e:
+        print(f"✗ Database error: {e}", file=sys.stderr)
+
+
 # ============================================================
 # MENU SYSTEM
 # ============================================================
 
-def character_operations_menu(conn):
+def character_operations_menu(pool):
     """Submenu for character operations."""
     while True:
         print_header("CHARACTER OPERATIONS")
@@ -836,6 +1047,7 @@ def character_operations_menu(conn):
 5. View Na'vi by Clan              [JOIN: 3 tables]
 6. View Active Avatar Links        [JOIN: 4 tables]
 7. View Na'vi Bonded Animals       [LEFT JOIN]
+8. Bulk Import Humans / Na'vi      [BULK INSERT]
 
 0. Back to Main Menu
         """)
@@ -843,26 +1055,28 @@ def character_operations_menu(conn):
         choice = input("Select operation: ").strip()
         
         if choice == '1':
-            create_human(conn)
+            create_human(pool)
         elif choice == '2':
-            create_navi(conn)
+            create_navi(pool)
         elif choice == '3':
-            create_avatar_link(conn)
+            create_avatar_link(pool)
         elif choice == '4':
-            view_humans_by_company(conn)
+            view_humans_by_company(pool)
         elif choice == '5':
-            view_navi_by_clan(conn)
+            view_navi_by_clan(pool)
         elif choice == '6':
-            view_avatar_links(conn)
+            view_avatar_links(pool)
         elif choice == '7':
-            view_navi_bonded_animals(conn)
+            view_navi_bonded_animals(pool)
+        elif choice == '8':
+            bulk_import_characters(pool)
         elif choice == '0':
             break
         else:
             print("Invalid choice.")
 
 
-def alliance_politics_menu(conn):
+def alliance_politics_menu(pool):
     """Submenu for alliance and politics."""
     while True:
         print_header("ALLIANCE & POLITICS")
@@ -870,6 +1084,8 @@ def alliance_politics_menu(conn):
 1. View Alliance Resource Control  [GROUP BY + SUM]
 2. View Company-Clan Partnerships  [JOIN: 3 tables]
 3. Most War-Active Clans           [GROUP BY + HAVING]
+4. Alliance Network                [GRAPH: allies + opponents]
+5. Alliance Blocs                  [GRAPH: connected components]
 
 0. Back to Main Menu
         """)
@@ -877,23 +1093,28 @@ def alliance_politics_menu(conn):
         choice = input("Select operation: ").strip()
         
         if choice == '1':
-            view_alliance_resources(conn)
+            view_alliance_resources(pool)
         elif choice == '2':
-            view_company_clan_partnerships(conn)
+            view_company_clan_partnerships(pool)
         elif choice == '3':
-            view_war_active_clans(conn)
+            view_war_active_clans(pool)
+        elif choice == '4':
+            view_alliance_network(pool)
+        elif choice == '5':
+            view_alliance_blocs(pool)
         elif choice == '0':
             break
         else:
             print("Invalid choice.")
 
 
-def war_operations_menu(conn):
+def war_operations_menu(pool):
     """Submenu for war operations."""
     while True:
         print_header("WAR OPERATIONS")
         print("""
 1. View Alliance War History       [JOIN: 5 tables + GROUP BY]
+2. Shortest Conflict Path          [GRAPH: BFS over wars]
 
 0. Back to Main Menu
         """)
@@ -901,14 +1122,16 @@ def war_operations_menu(conn):
         choice = input("Select operation: ").strip()
         
         if choice == '1':
-            view_war_history(conn)
+            view_war_history(pool)
+        elif choice == '2':
+            view_conflict_path(pool)
         elif choice == '0':
             break
         else:
             print("Invalid choice.")
 
 
-def aetherium_management_menu(conn):
+def aetherium_management_menu(pool):
     """Submenu for aetherium site management."""
     while True:
         print_header("AETHERIUM MANAGEMENT")
@@ -916,6 +1139,7 @@ def aetherium_management_menu(conn):
 1. View Sites by Ecosystem         [JOIN: 3 tables]
 2. Update Site Status/Owner        [UPDATE]
 3. Update Company Ethics Rating    [UPDATE]
+4. Companies Near a Location       [PROXIMITY: grid index]
 
 0. Back to Main Menu
         """)
@@ -923,23 +1147,28 @@ def aetherium_management_menu(conn):
         choice = input("Select operation: ").strip()
         
         if choice == '1':
-            view_sites_by_ecosystem(conn)
+            view_sites_by_ecosystem(pool)
         elif choice == '2':
-            update_site_status(conn)
+            update_site_status(pool)
         elif choice == '3':
-            update_company_ethics(conn)
+            update_company_ethics(pool)
+        elif choice == '4':
+            find_nearby_companies(pool)
         elif choice == '0':
             break
         else:
             print("Invalid choice.")
 
 
-def intelligence_menu(conn):
+def intelligence_menu(pool):
     """Submenu for intelligence and analytics."""
     while True:
         print_header("INTELLIGENCE & ANALYTICS")
         print("""
 1. Ecosystem Threat Analysis       [JOIN: 4 tables + AVG]
+2. Full Intelligence Briefing      [ALL REPORTS, PARALLEL]
+3. Ingest Field Reports            [BULK INSERT: 3 tables]
+4. Search Reports & Alliances      [FULLTEXT: ranked search]
 
 0. Back to Main Menu
         """)
@@ -947,19 +1176,29 @@ def intelligence_menu(conn):
         choice = input("Select operation: ").strip()
         
         if choice == '1':
-            ecosystem_threat_analysis(conn)
+            ecosystem_threat_analysis(pool)
+        elif choice == '2':
+            intelligence_briefing(pool)
+        elif choice == '3':
+            ingest_field_reports(pool)
+        elif choice == '4':
+            search_intelligence(pool)
         elif choice == '0':
             break
         else:
             print("Invalid choice.")
 
 
-def admin_operations_menu(conn):
+def admin_operations_menu(pool):
     """Submenu for admin operations."""
     while True:
         print_header("ADMIN OPERATIONS")
         print("""
 1. Delete Alliance (Cascade)       [DELETE]
+2. Query Cache Statistics          [CACHE]
+3. Rebuild Summary Tables          [REPAIR]
+4. Query Profiling                 [PROFILE]
+5. Archive Old Reports             [RETENTION]
 
 0. Back to Main Menu
         """)
@@ -967,14 +1206,22 @@ def admin_operations_menu(conn):
         choice = input("Select operation: ").strip()
         
         if choice == '1':
-            delete_alliance(conn)
+            delete_alliance(pool)
+        elif choice == '2':
+            view_cache_statistics()
+        elif choice == '3':
+            repair_summaries(pool)
+        elif choice == '4':
+            view_query_profile()
+        elif choice == '5':
+            archive_old_reports(pool)
         elif choice == '0':
             break
         else:
             print("Invalid choice.")
 
 
-def main_menu(conn):
+def main_menu(pool):
     """Main menu loop."""
     while True:
         print("\n" + "="*60)
@@ -997,17 +1244,17 @@ Q. Exit System
         choice = input("Enter choice: ").strip().lower()
         
         if choice == '1':
-            character_operations_menu(conn)
+            character_operations_menu(pool)
         elif choice == '2':
-            alliance_politics_menu(conn)
+            alliance_politics_menu(pool)
         elif choice == '3':
-            war_operations_menu(conn)
+            war_operations_menu(pool)
         elif choice == '4':
-            aetherium_management_menu(conn)
+            aetherium_management_menu(pool)
         elif choice == '5':
-            intelligence_menu(conn)
+            intelligence_menu(pool)
         elif choice == '6':
-            admin_operations_menu(conn)
+            admin_operations_menu(pool)
         elif choice == 'q':
             print("\n" + "="*60)
             print("  Exiting Pandora Chronicles Database System...")
@@ -1028,23 +1275,21 @@ def main():
     print("  Phase 4: Data & Applications Project")
     print("="*60)
     
-    conn = get_connection()
+    pool = get_pool()
     
-    if not conn:
+    if not pool:
         print("Failed to establish database connection. Exiting.")
         sys.exit(1)
     
     try:
-        main_menu(conn)
+        main_menu(pool)
     except KeyboardInterrupt:
         print("\n\nProgram interrupted by user.")
     except Exception as e:
         print(f"\nUnexpected error: {e}", file=sys.stderr)
     finally:
-        if conn:
-            conn.close()
-            print("Database connection closed.")
-
+        pool.close()
+        print("Database connection closed.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,101 @@
+"""
+Schema Migration Runner for Pandora Chronicles Database
+Applies the numbered scripts in migrations/ to an existing database
+
+schema.sql always describes the latest schema and records the migrations it
+already contains in Schema_Migration, so a fresh install has nothing pending.
+Databases created from an older schema.sql are upgraded in place:
+
+    python migrate.py            # apply pending migrations in order
+    python migrate.py --status   # list applied / pending migrations
+"""
+
+import argparse
+import os
+import sys
+
+import pymysql
+
+from db_pool import create_pool
+from sql_script import split_statements
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+CREATE_MIGRATION_TABLE = """
+    CREATE TABLE IF NOT EXISTS Schema_Migration (
+        Version VARCHAR(100) PRIMARY KEY,
+        Applied_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def available_migrations():
+    """Returns (version, path) for every migration script, in order."""
+    names = sorted(f for f in os.listdir(MIGRATIONS_DIR) if f.endswith(".sql"))
+    return [(name[:-4], os.path.join(MIGRATIONS_DIR, name)) for name in names]
+
+
+def applied_versions(conn):
+    with conn.cursor() as cur:
+        cur.execute(CREATE_MIGRATION_TABLE)
+        cur.execute("SELECT Version FROM Schema_Migration")
+        return {row["Version"] for row in cur.fetchall()}
+
+
+def apply_migration(conn, version, path):
+    """
+    Runs one migration script and records it.
+    MySQL commits DDL implicitly, so a migration that fails part-way must be
+    fixed up by hand before re-running.
+    """
+    with open(path, encoding="utf-8") as f:
+        statements = split_statements(f.read())
+    with conn.cursor() as cur:
+        for statement in statements:
+            cur.execute(statement)
+        cur.execute("INSERT INTO Schema_Migration (Version) VALUES (%s)", (version,))
+    conn.commit()
+    return len(statements)
+
+
+def migrate(conn, verbose=True):
+    """Applies all pending migrations; returns the versions applied."""
+    done = applied_versions(conn)
+    applied = []
+    for version, path in available_migrations():
+        if version in done:
+            continue
+        count = apply_migration(conn, version, path)
+        applied.append(version)
+        if verbose:
+            print(f"✓ Applied {version} ({count} statements)")
+    return applied
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply schema migrations.")
+    parser.add_argument("--status", action="store_true",
+                        help="show applied and pending migrations without applying")
+    args = parser.parse_args(argv)
+
+    pool = create_pool(pool_size=1)
+    try:
+        with pool.connection() as conn:
+            if args.status:
+                done = applied_versions(conn)
+                for version, _ in available_migrations():
+                    state = "applied" if version in done else "pending"
+                    print(f"  {version:<40} {state}")
+                return
+            applied = migrate(conn)
+            if not applied:
+                print("✓ Database schema is up to date")
+    except pymysql.Error as e:
+        print(f"✗ Migration failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
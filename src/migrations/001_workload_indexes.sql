@@ -0,0 +1,40 @@
+-- =========================================================
+-- 001: Workload-driven secondary and covering indexes
+-- =========================================================
+-- Each index below is derived from a query in queries.py / main_app.py.
+-- Measure the effect on a large dataset with the benchmark harness:
+--
+--   python generate_data.py --scale 10000 --truncate
+--   python benchmark.py --output before.json
+--   python migrate.py
+--   python benchmark.py --output after.json --baseline before.json
+--
+-- and compare the "explain" plans in the two JSON files (type=ref/range with
+-- "using_index" instead of type=ALL + "using_filesort").
+
+-- READ 5 (view_alliance_resources): join on Alliance_ID filtered by
+-- Status = 'Claimed' and aggregating Resource_Quantity -> index-only scan
+CREATE INDEX idx_site_alliance_status_qty
+    ON Aetherium_Site (Alliance_ID, Status, Resource_Quantity);
+
+-- READ 9 (view_sites_by_ecosystem): WHERE Eco_ID = ? ORDER BY Resource_Quantity DESC
+CREATE INDEX idx_site_eco_qty
+    ON Aetherium_Site (Eco_ID, Resource_Quantity);
+
+-- READ 1 (view_humans_by_company): WHERE Company_ID = ? ORDER BY Rank, L_Name
+-- reads rows in index order, no filesort
+CREATE INDEX idx_human_company_rank_lname
+    ON Human (Company_ID, `Rank`, L_Name);
+
+-- READ 2 (view_navi_by_clan): WHERE Clan_ID = ? ORDER BY Age DESC
+CREATE INDEX idx_navi_clan_age
+    ON Navi (Clan_ID, Age);
+
+-- READ 3 (view_avatar_links): WHERE Link_Status = 'Active'
+-- ORDER BY Total_Linked_Hours DESC; Human_ID breaks ties for stable ordering
+CREATE INDEX idx_avatar_status_hours
+    ON Avatar (Link_Status, Total_Linked_Hours DESC, Human_ID);
+
+-- Intelligence reports filtered / ordered by time
+CREATE INDEX idx_report_meta_timestamp
+    ON Report_Meta (Timestamp);
@@ -0,0 +1,25 @@
+-- =========================================================
+-- 002: Numeric strength and danger-level columns
+-- =========================================================
+-- Fights_In.Strength and Report_Observation.Danger_Level_Observed are
+-- VARCHARs, so READ 7 and READ 10 used to CAST every row at query time.
+-- Typed STORED generated columns hold the parsed values instead. Adding a
+-- STORED column rebuilds the table, which computes (backfills) the value for
+-- every existing row; new and updated rows are maintained by MySQL.
+-- Non-numeric text maps to NULL rather than CAST's 0, so it no longer drags
+-- averages down; so do numbers too large for the column type, which would
+-- otherwise fail the INSERT / UPDATE (or this ALTER) under strict mode.
+
+ALTER TABLE Fights_In
+    ADD COLUMN Strength_Value SMALLINT UNSIGNED AS (
+        CASE WHEN TRIM(Strength) REGEXP '^[0-9]{1,5}$'
+                  AND CAST(TRIM(Strength) AS UNSIGNED) <= 65535
+             THEN CAST(TRIM(Strength) AS UNSIGNED) END) STORED,
+    ADD INDEX idx_fights_clan_strength (Clan_ID, Strength_Value);
+
+ALTER TABLE Report_Observation
+    ADD COLUMN Danger_Level TINYINT UNSIGNED AS (
+        CASE WHEN TRIM(Danger_Level_Observed) REGEXP '^[0-9]{1,3}$'
+                  AND CAST(TRIM(Danger_Level_Observed) AS UNSIGNED) <= 255
+             THEN CAST(TRIM(Danger_Level_Observed) AS UNSIGNED) END) STORED,
+    ADD INDEX idx_observation_danger (Danger_Level, Resource_Estimate_Change);
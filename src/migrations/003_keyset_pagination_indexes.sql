@@ -0,0 +1,12 @@
+-- =========================================================
+-- 003: Indexes for keyset-paginated listings
+-- =========================================================
+-- The Na'vi bonded-animal listing is ordered by Clan_Name, Clan_ID, Name,
+-- Navi_ID. With these two indexes MySQL can walk clans in name order and
+-- each clan's Na'vi in name order, stopping after one page of rows.
+
+CREATE INDEX idx_clan_name
+    ON Clan (Clan_Name);
+
+CREATE INDEX idx_navi_clan_name
+    ON Navi (Clan_ID, Name);
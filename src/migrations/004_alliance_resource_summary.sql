@@ -0,0 +1,70 @@
+-- =========================================================
+-- 004: Incrementally maintained alliance resource summary
+-- =========================================================
+-- READ 5 (view_alliance_resources) used to aggregate every claimed
+-- Aetherium_Site on each call. Alliance_Resource_Summary keeps one row per
+-- alliance, updated by triggers whenever a site is inserted, updated
+-- (status, owner or quantity) or deleted, so the report is a primary-key
+-- join. A deleted alliance loses its row through ON DELETE CASCADE.
+-- Repair drift with: python summaries.py --rebuild
+
+CREATE TABLE Alliance_Resource_Summary (
+    Alliance_ID INT PRIMARY KEY,
+    Sites_Controlled INT NOT NULL DEFAULT 0,
+    Total_Resources BIGINT NOT NULL DEFAULT 0,
+    -- Claimed sites with a known Resource_Quantity (denominator of the average)
+    Quantity_Sites INT NOT NULL DEFAULT 0,
+    INDEX idx_summary_total_resources (Total_Resources),
+    FOREIGN KEY (Alliance_ID) REFERENCES Alliance(Alliance_ID)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+);
+
+INSERT INTO Alliance_Resource_Summary
+    (Alliance_ID, Sites_Controlled, Total_Resources, Quantity_Sites)
+SELECT a.Alliance_ID,
+       COUNT(ast.Site_ID),
+       COALESCE(SUM(ast.Resource_Quantity), 0),
+       COUNT(ast.Resource_Quantity)
+FROM Alliance a
+LEFT JOIN Aetherium_Site ast ON a.Alliance_ID = ast.Alliance_ID
+    AND ast.Status = 'Claimed'
+GROUP BY a.Alliance_ID;
+
+CREATE TRIGGER trg_alliance_summary_insert AFTER INSERT ON Alliance
+FOR EACH ROW
+    INSERT INTO Alliance_Resource_Summary (Alliance_ID) VALUES (NEW.Alliance_ID);
+
+CREATE TRIGGER trg_site_summary_insert AFTER INSERT ON Aetherium_Site
+FOR EACH ROW
+    UPDATE Alliance_Resource_Summary
+    SET Sites_Controlled = Sites_Controlled + 1,
+        Total_Resources = Total_Resources + COALESCE(NEW.Resource_Quantity, 0),
+        Quantity_Sites = Quantity_Sites + (NEW.Resource_Quantity IS NOT NULL)
+    WHERE Alliance_ID = NEW.Alliance_ID AND NEW.Status <=> 'Claimed';
+
+CREATE TRIGGER trg_site_summary_update AFTER UPDATE ON Aetherium_Site
+FOR EACH ROW
+    UPDATE Alliance_Resource_Summary
+    SET Sites_Controlled = Sites_Controlled
+            - (Alliance_ID <=> OLD.Alliance_ID AND OLD.Status <=> 'Claimed')
+            + (Alliance_ID <=> NEW.Alliance_ID AND NEW.Status <=> 'Claimed'),
+        Total_Resources = Total_Resources
+            - IF(Alliance_ID <=> OLD.Alliance_ID AND OLD.Status <=> 'Claimed',
+                 COALESCE(OLD.Resource_Quantity, 0), 0)
+            + IF(Alliance_ID <=> NEW.Alliance_ID AND NEW.Status <=> 'Claimed',
+                 COALESCE(NEW.Resource_Quantity, 0), 0),
+        Quantity_Sites = Quantity_Sites
+            - (Alliance_ID <=> OLD.Alliance_ID AND OLD.Status <=> 'Claimed'
+               AND OLD.Resource_Quantity IS NOT NULL)
+            + (Alliance_ID <=> NEW.Alliance_ID AND NEW.Status <=> 'Claimed'
+               AND NEW.Resource_Quantity IS NOT NULL)
+    WHERE Alliance_ID IN (OLD.Alliance_ID, NEW.Alliance_ID);
+
+CREATE TRIGGER trg_site_summary_delete AFTER DELETE ON Aetherium_Site
+FOR EACH ROW
+    UPDATE Alliance_Resource_Summary
+    SET Sites_Controlled = Sites_Controlled - 1,
+        Total_Resources = Total_Resources - COALESCE(OLD.Resource_Quantity, 0),
+        Quantity_Sites = Quantity_Sites - (OLD.Resource_Quantity IS NOT NULL)
+    WHERE Alliance_ID = OLD.Alliance_ID AND OLD.Status <=> 'Claimed';
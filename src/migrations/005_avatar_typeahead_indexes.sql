@@ -0,0 +1,17 @@
+-- =========================================================
+-- 005: Indexes for the unlinked-operative typeahead
+-- =========================================================
+-- WRITE 3 (create_avatar_link) searches Humans / Na'vi without an avatar by
+-- name prefix, optionally within one company / clan, and shows the first N
+-- in name order. These indexes return matches already in that order, so the
+-- scan stops after N unlinked rows; the NOT EXISTS probe per row is served
+-- by Avatar's primary key (Human_ID, ...) and UNIQUE (Navi_ID).
+
+CREATE INDEX idx_human_lname
+    ON Human (L_Name);
+
+CREATE INDEX idx_human_company_lname
+    ON Human (Company_ID, L_Name);
+
+CREATE INDEX idx_navi_name
+    ON Navi (Name);
@@ -0,0 +1,164 @@
+-- =========================================================
+-- 006: Hourly per-ecosystem threat rollup
+-- =========================================================
+-- READ 10 (ecosystem_threat_analysis) joins every Report_Observation ever
+-- filed. Ecosystem_Threat_Rollup keeps one row per ecosystem and hour of
+-- Report_Meta.Timestamp with the sums READ 10 needs, so a "last 24h / 7d /
+-- 30d" analysis reads only the buckets in the window. The triggers below add
+-- a report's contribution once both its observation and a site link exist,
+-- whichever arrives first, and take it back on direct updates / deletes.
+-- Rows removed by ON DELETE CASCADE (deleting a Report_Meta or a site) do
+-- not fire triggers; repair with: python summaries.py --rebuild
+
+CREATE TABLE Ecosystem_Threat_Rollup (
+    Eco_ID INT NOT NULL,
+    Bucket_Start DATETIME NOT NULL,
+    -- Distinct reports filed against the ecosystem in this hour
+    Reports INT NOT NULL DEFAULT 0,
+    -- Sums over report x site rows, as READ 10 aggregates them
+    Danger_Sum BIGINT NOT NULL DEFAULT 0,
+    Danger_Count INT NOT NULL DEFAULT 0,
+    Resource_Change BIGINT NOT NULL DEFAULT 0,
+    Resource_Count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (Eco_ID, Bucket_Start),
+    INDEX idx_threat_rollup_bucket (Bucket_Start),
+    FOREIGN KEY (Eco_ID) REFERENCES Ecosystem(Eco_ID)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+);
+
+INSERT INTO Ecosystem_Threat_Rollup
+    (Eco_ID, Bucket_Start, Reports, Danger_Sum, Danger_Count,
+     Resource_Change, Resource_Count)
+SELECT ast.Eco_ID,
+       DATE_FORMAT(rm.Timestamp, '%Y-%m-%d %H:00:00'),
+       COUNT(DISTINCT ro.Report_ID),
+       COALESCE(SUM(ro.Danger_Level), 0),
+       COUNT(ro.Danger_Level),
+       COALESCE(SUM(ro.Resource_Estimate_Change), 0),
+       COUNT(ro.Resource_Estimate_Change)
+FROM Report_Site rs
+JOIN Aetherium_Site ast ON rs.Site_ID = ast.Site_ID
+JOIN Report_Meta rm ON rs.Report_ID = rm.Report_ID
+JOIN Report_Observation ro ON rs.Report_ID = ro.Report_ID
+GROUP BY ast.Eco_ID, DATE_FORMAT(rm.Timestamp, '%Y-%m-%d %H:00:00');
+
+-- A site link arrives: one more report x site row; a new report for the
+-- ecosystem when it is the report's first site there
+CREATE TRIGGER trg_report_site_threat_insert AFTER INSERT ON Report_Site
+FOR EACH ROW
+    INSERT INTO Ecosystem_Threat_Rollup
+        (Eco_ID, Bucket_Start, Reports, Danger_Sum, Danger_Count,
+         Resource_Change, Resource_Count)
+    SELECT * FROM (
+        SELECT ast.Eco_ID,
+               DATE_FORMAT(rm.Timestamp, '%Y-%m-%d %H:00:00') as Bucket,
+               (SELECT COUNT(*) FROM Report_Site rs
+                JOIN Aetherium_Site s ON rs.Site_ID = s.Site_ID
+                WHERE rs.Report_ID = NEW.Report_ID AND s.Eco_ID = ast.Eco_ID) = 1 as New_Report,
+               COALESCE(ro.Danger_Level, 0) as Danger,
+               ro.Danger_Level IS NOT NULL as Has_Danger,
+               COALESCE(ro.Resource_Estimate_Change, 0) as Change_Value,
+               ro.Resource_Estimate_Change IS NOT NULL as Has_Change
+        FROM Aetherium_Site ast
+        JOIN Report_Meta rm ON rm.Report_ID = NEW.Report_ID
+        JOIN Report_Observation ro ON ro.Report_ID = NEW.Report_ID
+        WHERE ast.Site_ID = NEW.Site_ID
+    ) d
+    ON DUPLICATE KEY UPDATE
+        Reports = Reports + d.New_Report,
+        Danger_Sum = Danger_Sum + d.Danger,
+        Danger_Count = Danger_Count + d.Has_Danger,
+        Resource_Change = Resource_Change + d.Change_Value,
+        Resource_Count = Resource_Count + d.Has_Change;
+
+-- A site link goes: take back its row; the report leaves the ecosystem
+-- when no other site there still links it
+CREATE TRIGGER trg_report_site_threat_delete AFTER DELETE ON Report_Site
+FOR EACH ROW
+    UPDATE Ecosystem_Threat_Rollup r
+    JOIN Aetherium_Site ast ON ast.Site_ID = OLD.Site_ID AND r.Eco_ID = ast.Eco_ID
+    JOIN Report_Meta rm ON rm.Report_ID = OLD.Report_ID
+        AND r.Bucket_Start = DATE_FORMAT(rm.Timestamp, '%Y-%m-%d %H:00:00')
+    JOIN Report_Observation ro ON ro.Report_ID = OLD.Report_ID
+    SET r.Reports = r.Reports - NOT EXISTS (
+            SELECT 1 FROM Report_Site rs
+            JOIN Aetherium_Site s ON rs.Site_ID = s.Site_ID
+            WHERE rs.Report_ID = OLD.Report_ID AND s.Eco_ID = ast.Eco_ID),
+        r.Danger_Sum = r.Danger_Sum - COALESCE(ro.Danger_Level, 0),
+        r.Danger_Count = r.Danger_Count - (ro.Danger_Level IS NOT NULL),
+        r.Resource_Change = r.Resource_Change - COALESCE(ro.Resource_Estimate_Change, 0),
+        r.Resource_Count = r.Resource_Count - (ro.Resource_Estimate_Change IS NOT NULL);
+
+-- An observation arrives: one report per ecosystem its sites are in, one
+-- row per linked site
+CREATE TRIGGER trg_observation_threat_insert AFTER INSERT ON Report_Observation
+FOR EACH ROW
+    INSERT INTO Ecosystem_Threat_Rollup
+        (Eco_ID, Bucket_Start, Reports, Danger_Sum, Danger_Count,
+         Resource_Change, Resource_Count)
+    SELECT * FROM (
+        SELECT ast.Eco_ID,
+               DATE_FORMAT(rm.Timestamp, '%Y-%m-%d %H:00:00') as Bucket,
+               1 as New_Report,
+               COUNT(*) * COALESCE(NEW.Danger_Level, 0) as Danger,
+               COUNT(*) * (NEW.Danger_Level IS NOT NULL) as Has_Danger,
+               COUNT(*) * COALESCE(NEW.Resource_Estimate_Change, 0) as Change_Value,
+               COUNT(*) * (NEW.Resource_Estimate_Change IS NOT NULL) as Has_Change
+        FROM Report_Site rs
+        JOIN Aetherium_Site ast ON rs.Site_ID = ast.Site_ID
+        JOIN Report_Meta rm ON rm.Report_ID = NEW.Report_ID
+        WHERE rs.Report_ID = NEW.Report_ID
+        GROUP BY ast.Eco_ID, rm.Timestamp
+    ) d
+    ON DUPLICATE KEY UPDATE
+        Reports = Reports + d.New_Report,
+        Danger_Sum = Danger_Sum + d.Danger,
+        Danger_Count = Danger_Count + d.Has_Danger,
+        Resource_Change = Resource_Change + d.Change_Value,
+        Resource_Count = Resource_Count + d.Has_Change;
+
+-- An observation changes: replace its old values with the new ones
+CREATE TRIGGER trg_observation_threat_update AFTER UPDATE ON Report_Observation
+FOR EACH ROW
+    UPDATE Ecosystem_Threat_Rollup r
+    JOIN (SELECT ast.Eco_ID,
+                 DATE_FORMAT(rm.Timestamp, '%Y-%m-%d %H:00:00') as Bucket,
+                 COUNT(*) as Site_Rows
+          FROM Report_Site rs
+          JOIN Aetherium_Site ast ON rs.Site_ID = ast.Site_ID
+          JOIN Report_Meta rm ON rm.Report_ID = NEW.Report_ID
+          WHERE rs.Report_ID = NEW.Report_ID
+          GROUP BY ast.Eco_ID, rm.Timestamp) d
+        ON r.Eco_ID = d.Eco_ID AND r.Bucket_Start = d.Bucket
+    SET r.Danger_Sum = r.Danger_Sum + d.Site_Rows
+            * (COALESCE(NEW.Danger_Level, 0) - COALESCE(OLD.Danger_Level, 0)),
+        r.Danger_Count = r.Danger_Count + d.Site_Rows
+            * ((NEW.Danger_Level IS NOT NULL) - (OLD.Danger_Level IS NOT NULL)),
+        r.Resource_Change = r.Resource_Change + d.Site_Rows
+            * (COALESCE(NEW.Resource_Estimate_Change, 0)
+               - COALESCE(OLD.Resource_Estimate_Change, 0)),
+        r.Resource_Count = r.Resource_Count + d.Site_Rows
+            * ((NEW.Resource_Estimate_Change IS NOT NULL)
+               - (OLD.Resource_Estimate_Change IS NOT NULL));
+
+-- An observation goes: the report leaves every ecosystem it was counted in
+CREATE TRIGGER trg_observation_threat_delete AFTER DELETE ON Report_Observation
+FOR EACH ROW
+    UPDATE Ecosystem_Threat_Rollup r
+    JOIN (SELECT ast.Eco_ID,
+                 DATE_FORMAT(rm.Timestamp, '%Y-%m-%d %H:00:00') as Bucket,
+                 COUNT(*) as Site_Rows
+          FROM Report_Site rs
+          JOIN Aetherium_Site ast ON rs.Site_ID = ast.Site_ID
+          JOIN Report_Meta rm ON rm.Report_ID = OLD.Report_ID
+          WHERE rs.Report_ID = OLD.Report_ID
+          GROUP BY ast.Eco_ID, rm.Timestamp) d
+        ON r.Eco_ID = d.Eco_ID AND r.Bucket_Start = d.Bucket
+    SET r.Reports = r.Reports - 1,
+        r.Danger_Sum = r.Danger_Sum - d.Site_Rows * COALESCE(OLD.Danger_Level, 0),
+        r.Danger_Count = r.Danger_Count - d.Site_Rows * (OLD.Danger_Level IS NOT NULL),
+        r.Resource_Change = r.Resource_Change
+            - d.Site_Rows * COALESCE(OLD.Resource_Estimate_Change, 0),
+        r.Resource_Count = r.Resource_Count
+            - d.Site_Rows * (OLD.Resource_Estimate_Change IS NOT NULL);
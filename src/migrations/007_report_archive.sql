@@ -0,0 +1,62 @@
+-- =========================================================
+-- 007: Archive tier for old intelligence reports
+-- =========================================================
+-- retention.py moves reports older than a horizon out of Report_Meta /
+-- Report_Observation / Report_Site into the two archive tables below:
+-- one compressed row per report (meta and observation together) and its
+-- site links. Both are RANGE partitioned by Timestamp, one partition per
+-- year, created on demand by retention.py; purging a year is a DROP
+-- PARTITION. (The hot tables cannot be partitioned: MySQL does not allow
+-- foreign keys on partitioned tables.)
+--
+-- The *_All views put both tiers back together for reads that cover all
+-- history, such as READ 10 and the threat rollup rebuild. Archiving
+-- deletes from Report_Meta and lets ON DELETE CASCADE remove the rest, which
+-- fires no triggers, so Ecosystem_Threat_Rollup keeps the archived history.
+
+CREATE TABLE Report_Archive (
+    Report_ID INT NOT NULL,
+    Timestamp DATETIME NOT NULL,
+    -- FALSE when the report had no Report_Observation row
+    Observed BOOLEAN NOT NULL DEFAULT TRUE,
+    Threat_Description TEXT,
+    Resource_Estimate_Change INT,
+    Danger_Level_Observed VARCHAR(50),
+    Danger_Level TINYINT UNSIGNED,
+    Alliance_ID INT,
+    PRIMARY KEY (Report_ID, Timestamp)
+) ROW_FORMAT=COMPRESSED
+PARTITION BY RANGE COLUMNS (Timestamp) (
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+CREATE TABLE Report_Site_Archive (
+    Site_ID INT NOT NULL,
+    Report_ID INT NOT NULL,
+    Timestamp DATETIME NOT NULL,
+    PRIMARY KEY (Site_ID, Report_ID, Timestamp),
+    INDEX idx_site_archive_report (Report_ID)
+) ROW_FORMAT=COMPRESSED
+PARTITION BY RANGE COLUMNS (Timestamp) (
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+CREATE VIEW Report_Meta_All AS
+    SELECT Report_ID, Timestamp FROM Report_Meta
+    UNION ALL
+    SELECT Report_ID, Timestamp FROM Report_Archive;
+
+CREATE VIEW Report_Observation_All AS
+    SELECT Report_ID, Threat_Description, Resource_Estimate_Change,
+           Danger_Level_Observed, Danger_Level, Alliance_ID
+    FROM Report_Observation
+    UNION ALL
+    SELECT Report_ID, Threat_Description, Resource_Estimate_Change,
+           Danger_Level_Observed, Danger_Level, Alliance_ID
+    FROM Report_Archive
+    WHERE Observed;
+
+CREATE VIEW Report_Site_All AS
+    SELECT Site_ID, Report_ID FROM Report_Site
+    UNION ALL
+    SELECT Site_ID, Report_ID FROM Report_Site_Archive;
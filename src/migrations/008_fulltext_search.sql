@@ -0,0 +1,17 @@
+-- =========================================================
+-- 008: FULLTEXT indexes for report and alliance search
+-- =========================================================
+-- Searching Threat_Description / Objective with LIKE '%word%' scans every
+-- row. These inverted indexes let MATCH ... AGAINST look words up and rank
+-- the matches by relevance. InnoDB adds a row's words when its transaction
+-- commits, so reports loaded by ingest_reports.py are searchable as soon
+-- as their batch commits.
+--
+-- Report_Archive is partitioned, and MySQL does not allow FULLTEXT indexes
+-- on partitioned tables, so search covers the reports in the hot tables.
+
+ALTER TABLE Report_Observation
+    ADD FULLTEXT INDEX ft_observation_threat (Threat_Description);
+
+ALTER TABLE Alliance
+    ADD FULLTEXT INDEX ft_alliance_objective (Objective);
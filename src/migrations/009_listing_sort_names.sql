@@ -0,0 +1,82 @@
+-- =========================================================
+-- 009: Sort names for the paged listings
+-- =========================================================
+-- Keyset pages only stop early when one index returns the rows in ORDER BY
+-- order. The Na'vi listing sorts on Clan.Clan_Name, then Navi.Name, and the
+-- partnership listing on Alliance.Name (no alliance first), then
+-- Company.Name: columns of joined tables, which no index on the driving
+-- table can order, so every page joined and filesorted the whole listing
+-- before its LIMIT. (003's idx_clan_name and idx_navi_clan_name cannot be
+-- combined into that order.)
+--
+-- The names are copied onto the driving tables as sort keys and indexed in
+-- listing order, so a page reads page_size + 1 index entries. The triggers
+-- below keep the copies current: a Na'vi / partnership takes the name when
+-- inserted or moved to another clan / alliance / company, a rename updates
+-- every copy, and deleting a clan / alliance clears the copies before ON
+-- DELETE SET NULL (which fires no triggers) orphans the rows.
+
+ALTER TABLE Navi
+    ADD COLUMN Clan_Sort_Name VARCHAR(100),
+    ADD INDEX idx_navi_clan_sort (Clan_Sort_Name, Clan_ID, Name);
+
+ALTER TABLE Partnership
+    ADD COLUMN Alliance_Sort_Name VARCHAR(100),
+    ADD COLUMN Company_Sort_Name VARCHAR(150),
+    ADD INDEX idx_partnership_sort (Alliance_Sort_Name, Company_Sort_Name, Company_ID, Clan_ID);
+
+UPDATE Navi n
+JOIN Clan c ON n.Clan_ID = c.Clan_ID
+SET n.Clan_Sort_Name = c.Clan_Name;
+
+UPDATE Partnership p
+JOIN Company co ON p.Company_ID = co.Company_ID
+LEFT JOIN Alliance a ON p.Alliance_ID = a.Alliance_ID
+SET p.Company_Sort_Name = co.Name,
+    p.Alliance_Sort_Name = a.Name;
+
+CREATE TRIGGER trg_navi_sort_insert BEFORE INSERT ON Navi
+FOR EACH ROW
+    SET NEW.Clan_Sort_Name = (SELECT Clan_Name FROM Clan WHERE Clan_ID = NEW.Clan_ID);
+
+-- Only a move to another clan looks the name up; the clan triggers below
+-- set it directly
+CREATE TRIGGER trg_navi_sort_update BEFORE UPDATE ON Navi
+FOR EACH ROW
+    SET NEW.Clan_Sort_Name = IF(NEW.Clan_ID <=> OLD.Clan_ID, NEW.Clan_Sort_Name,
+        (SELECT Clan_Name FROM Clan WHERE Clan_ID = NEW.Clan_ID));
+
+CREATE TRIGGER trg_clan_sort_update AFTER UPDATE ON Clan
+FOR EACH ROW
+    UPDATE Navi SET Clan_Sort_Name = NEW.Clan_Name
+    WHERE Clan_ID = NEW.Clan_ID AND NOT (Clan_Sort_Name <=> NEW.Clan_Name);
+
+CREATE TRIGGER trg_clan_sort_delete BEFORE DELETE ON Clan
+FOR EACH ROW
+    UPDATE Navi SET Clan_Sort_Name = NULL WHERE Clan_ID = OLD.Clan_ID;
+
+CREATE TRIGGER trg_partnership_sort_insert BEFORE INSERT ON Partnership
+FOR EACH ROW
+    SET NEW.Alliance_Sort_Name = (SELECT Name FROM Alliance WHERE Alliance_ID = NEW.Alliance_ID),
+        NEW.Company_Sort_Name = (SELECT Name FROM Company WHERE Company_ID = NEW.Company_ID);
+
+CREATE TRIGGER trg_partnership_sort_update BEFORE UPDATE ON Partnership
+FOR EACH ROW
+    SET NEW.Alliance_Sort_Name = IF(NEW.Alliance_ID <=> OLD.Alliance_ID, NEW.Alliance_Sort_Name,
+            (SELECT Name FROM Alliance WHERE Alliance_ID = NEW.Alliance_ID)),
+        NEW.Company_Sort_Name = IF(NEW.Company_ID <=> OLD.Company_ID, NEW.Company_Sort_Name,
+            (SELECT Name FROM Company WHERE Company_ID = NEW.Company_ID));
+
+CREATE TRIGGER trg_alliance_sort_update AFTER UPDATE ON Alliance
+FOR EACH ROW
+    UPDATE Partnership SET Alliance_Sort_Name = NEW.Name
+    WHERE Alliance_ID = NEW.Alliance_ID AND NOT (Alliance_Sort_Name <=> NEW.Name);
+
+CREATE TRIGGER trg_alliance_sort_delete BEFORE DELETE ON Alliance
+FOR EACH ROW
+    UPDATE Partnership SET Alliance_Sort_Name = NULL WHERE Alliance_ID = OLD.Alliance_ID;
+
+CREATE TRIGGER trg_company_sort_update AFTER UPDATE ON Company
+FOR EACH ROW
+    UPDATE Partnership SET Company_Sort_Name = NEW.Name
+    WHERE Company_ID = NEW.Company_ID AND NOT (Company_Sort_Name <=> NEW.Name);
@@ -0,0 +1,582 @@
+"""
+Library API for the Pandora Chronicles operations
+Every READ / WRITE from the menus as a function with explicit parameters
+
+The functions take a connection and never prompt or print. Reads return
+rows (the streaming and paged ones as iterators), writes commit and return
+a dict describing what changed, and invalid input raises OperationError.
+main_app.py and cli.py are both built on top of this module.
+"""
+
+import pymysql
+
+from alliance_graph import AllianceGraph, ALLIANCE, CLAN, COMPANY
+from pagination import KeysetPager
+from query_cache import QueryCache
+from query_log import ProfiledSSDictCursor
+from spatial_index import CompanyLocator
+from queries import (
+    HUMANS_BY_COMPANY_SQL, NAVI_BY_CLAN_SQL, ALLIANCE_RESOURCES_SQL,
+    WAR_ACTIVE_CLANS_SQL, WAR_HISTORY_SQL, SITES_BY_ECOSYSTEM_SQL, ECOSYSTEM_THREAT_SQL,
+    AVATAR_LINKS_LISTING, NAVI_BONDED_ANIMALS_LISTING, COMPANY_CLAN_PARTNERSHIPS_LISTING,
+    ALLIANCE_RESOURCES_TABLES, WAR_ACTIVE_CLANS_TABLES, ECOSYSTEM_THREAT_TABLES,
+    ECOSYSTEM_THREAT_WINDOW_SQL,
+    ALLIANCE_IMPACT_SQL, ALLIANCE_IMPACT_ONE_SQL, AVAILABLE_HUMANS_SQL, AVAILABLE_NAVI_SQL,
+    COMPANY_SITES_SQL, SEARCH_REPORTS_SQL, SEARCH_REPORTS_ECOSYSTEM_FILTER, SEARCH_ALLIANCES_SQL,
+)
+
+# Results of the analytical reads, invalidated by the write operations
+RESULT_CACHE = QueryCache(max_entries=128, ttl=300)
+
+# Small dimension tables behind the ID pickers; kept longer, same invalidation
+REFERENCE_CACHE = QueryCache(max_entries=16, ttl=900)
+
+# name -> (sql, tables it reads)
+REFERENCE_QUERIES = {
+    "companies": ("SELECT Company_ID, Name, Ethics_Rating FROM Company ORDER BY Name",
+                  ("Company",)),
+    "clans": ("SELECT Clan_ID, Clan_Name FROM Clan ORDER BY Clan_Name", ("Clan",)),
+    "alliances": ("SELECT Alliance_ID, Name FROM Alliance ORDER BY Name", ("Alliance",)),
+    "ecosystems": ("SELECT Eco_ID, Name, Biome_Type FROM Ecosystem ORDER BY Name",
+                   ("Ecosystem",)),
+}
+
+# Alliance / clan / company graph; writes mark it stale through RESULT_CACHE
+ALLIANCE_GRAPH = AllianceGraph(RESULT_CACHE)
+
+# Grid index of company coordinates; reloaded the same way
+COMPANY_LOCATOR = CompanyLocator(RESULT_CACHE)
+
+STREAM_BATCH_SIZE = 500
+TYPEAHEAD_LIMIT = 20
+NEAREST_LIMIT = 10
+SEARCH_LIMIT = 25
+SITE_STATUSES = ("Unclaimed", "Claimed", "Depleted")
+THREAT_WINDOWS = ("24h", "7d", "30d")
+SEARCH_MODES = {"natural": "IN NATURAL LANGUAGE MODE", "boolean": "IN BOOLEAN MODE"}
+
+
+class OperationError(ValueError):
+    """Invalid arguments for an operation."""
+
+
+def boolean(value):
+    """A flag argument: true / false, yes / no, 1 / 0."""
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("1", "true", "yes", "y"):
+        return True
+    if text in ("0", "false", "no", "n"):
+        return False
+    raise ValueError(value)
+
+
+def invalidate(*tables):
+    """Drops cached results and reference lists that read any of the tables."""
+    RESULT_CACHE.invalidate(*tables)
+    REFERENCE_CACHE.invalidate(*tables)
+
+
+def reference_list(conn, name):
+    """
+    Rows for an ID picker ("companies", "clans", "alliances", "ecosystems"),
+    loaded once and served from REFERENCE_CACHE until a write or the TTL
+    invalidates them. Treat the list as read-only.
+    """
+    sql, tables = REFERENCE_QUERIES[name]
+    return REFERENCE_CACHE.fetch(conn, sql, tables=tables)
+
+
+def like_prefix(prefix):
+    """LIKE pattern matching values that start with prefix, taken literally."""
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+def _typeahead(conn, sql, name_column, prefix, group_column, group_id, limit):
+    if limit < 1:
+        raise OperationError("limit must be at least 1")
+    filters, params = [], []
+    if prefix:
+        filters.append(f"AND {name_column} LIKE %s")
+        params.append(like_prefix(prefix))
+    if group_id is not None:
+        filters.append(f"AND {group_column} = %s")
+        params.append(group_id)
+    params.append(limit)
+    with conn.cursor() as cur:
+        cur.execute(sql.format(filters=" ".join(filters)), params)
+        return cur.fetchall()
+
+
+def iter_query(conn, sql, params=None, batch_size=STREAM_BATCH_SIZE):
+    """Yields the rows of a query from an unbuffered server-side cursor."""
+    with conn.cursor(ProfiledSSDictCursor) as cur:
+        cur.execute(sql, params)
+        for batch in iter(lambda: cur.fetchmany(batch_size), []):
+            yield from batch
+
+
+def iter_listing(conn, listing, limit=None, page_size=STREAM_BATCH_SIZE):
+    """Yields up to limit rows of a keyset-paginated listing."""
+    pager = KeysetPager(conn, listing, page_size)
+    remaining = limit
+    while remaining is None or remaining > 0:
+        rows = pager.next_page()
+        if not rows:
+            return
+        if remaining is not None:
+            rows = rows[:remaining]
+            remaining -= len(rows)
+        yield from rows
+
+
+def _write(conn, sql, params):
+    """Runs one write statement and commits; rolls back on failure."""
+    try:
+        with conn.cursor() as cur:
+            cur.execute(sql, params)
+            result = cur.rowcount, cur.lastrowid
+        conn.commit()
+        return result
+    except pymysql.Error:
+        conn.rollback()
+        raise
+
+
+# ============================================================
+# READ OPERATIONS
+# ============================================================
+def humans_by_company(conn, company_id):
+    """READ 1: Human operatives of a company (streamed)"""
+    return iter_query(conn, HUMANS_BY_COMPANY_SQL, (company_id,))
+
+
+def navi_by_clan(conn, clan_id):
+    """READ 2: Na'vi of a clan with their alliance (streamed)"""
+    return iter_query(conn, NAVI_BY_CLAN_SQL, (clan_id,))
+
+
+def avatar_links(conn, limit=None):
+    """READ 3: Active avatar links, most linked hours first (paged)"""
+    return iter_listing(conn, AVATAR_LINKS_LISTING, limit)
+
+
+def navi_bonded_animals(conn, limit=None):
+    """READ 4: Na'vi with or without bonded animals (paged)"""
+    return iter_listing(conn, NAVI_BONDED_ANIMALS_LISTING, limit)
+
+
+def alliance_resources(conn):
+    """READ 5: Resource control per alliance (cached)"""
+    return RESULT_CACHE.fetch(conn, ALLIANCE_RESOURCES_SQL, tables=ALLIANCE_RESOURCES_TABLES)
+
+
+def company_clan_partnerships(conn, limit=None):
+    """READ 6: Company-clan partnerships (paged)"""
+    return iter_listing(conn, COMPANY_CLAN_PARTNERSHIPS_LISTING, limit)
+
+
+def war_active_clans(conn, min_wars=1):
+    """READ 7: Clans that fought in at least min_wars wars (cached)"""
+    return RESULT_CACHE.fetch(conn, WAR_ACTIVE_CLANS_SQL, (min_wars,),
+                              tables=WAR_ACTIVE_CLANS_TABLES)
+
+
+def war_history(conn, alliance_id):
+    """READ 8: Wars involving an alliance (streamed)"""
+    return iter_query(conn, WAR_HISTORY_SQL, (alliance_id, alliance_id))
+
+
+def sites_by_ecosystem(conn, eco_id):
+    """READ 9: Aetherium sites of an ecosystem with flora (streamed)"""
+    return iter_query(conn, SITES_BY_ECOSYSTEM_SQL, (eco_id,))
+
+
+def window_hours(window):
+    """Hours in a window such as '24h', '7d' or '30d'."""
+    text = str(window).strip().lower()
+    units = {"h": 1, "d": 24}
+    if len(text) < 2 or text[-1] not in units or not text[:-1].isdigit() or int(text[:-1]) < 1:
+        raise OperationError(f"window must look like {', '.join(THREAT_WINDOWS)}; got {window!r}")
+    return int(text[:-1]) * units[text[-1]]
+
+
+def ecosystem_threats(conn, window=None):
+    """
+    READ 10: Threat analysis per ecosystem, all time (cached) or over the
+    last window ('24h', '7d', '30d', ...) from the hourly rollup
+    """
+    if window is None:
+        return RESULT_CACHE.fetch(conn, ECOSYSTEM_THREAT_SQL, tables=ECOSYSTEM_THREAT_TABLES)
+    with conn.cursor() as cur:
+        cur.execute(ECOSYSTEM_THREAT_WINDOW_SQL, (window_hours(window),))
+        return cur.fetchall()
+
+
+def _against(query, mode, limit):
+    """The AGAINST modifier for a search, after checking its arguments."""
+    if not query or not query.strip():
+        raise OperationError("query must not be empty")
+    if mode not in SEARCH_MODES:
+        raise OperationError(f"mode must be one of {', '.join(SEARCH_MODES)}; got {mode!r}")
+    if limit < 1:
+        raise OperationError("limit must be at least 1")
+    return SEARCH_MODES[mode]
+
+
+def search_reports(conn, query, eco_id=None, alliance_id=None, window=None,
+                   limit=SEARCH_LIMIT, mode="natural"):
+    """
+    READ (search): Reports whose threat description matches query, most
+    relevant first; optionally at one ecosystem's sites, by one alliance or
+    within the last window ('24h', '7d', ...). mode 'boolean' takes
+    +word -word "phrase" word* syntax
+    """
+    against = _against(query, mode, limit)
+    filters, params = [], []
+    if alliance_id is not None:
+        filters.append("AND ro.Alliance_ID = %s")
+        params.append(alliance_id)
+    if eco_id is not None:
+        filters.append(SEARCH_REPORTS_ECOSYSTEM_FILTER.strip())
+        params.append(eco_id)
+    if window is not None:
+        filters.append("AND rm.Timestamp >= NOW() - INTERVAL %s HOUR")
+        params.append(window_hours(window))
+    sql = SEARCH_REPORTS_SQL.format(mode=against, filters="\n          ".join(filters))
+    with conn.cursor() as cur:
+        cur.execute(sql, [query, query] + params + [limit])
+        return cur.fetchall()
+
+
+def search_alliances(conn, query, limit=SEARCH_LIMIT, mode="natural"):
+    """READ (search): Alliances whose objective matches query, most relevant first"""
+    against = _against(query, mode, limit)
+    with conn.cursor() as cur:
+        cur.execute(SEARCH_ALLIANCES_SQL.format(mode=against), (query, query, limit))
+        return cur.fetchall()
+
+
+def available_humans(conn, prefix="", company_id=None, limit=TYPEAHEAD_LIMIT):
+    """
+    READ (picker): Humans without an avatar link whose last name starts with
+    prefix, optionally in one company; first `limit` by name
+    """
+    return _typeahead(conn, AVAILABLE_HUMANS_SQL, "h.L_Name", prefix,
+                      "h.Company_ID", company_id, limit)
+
+
+def available_navi(conn, prefix="", clan_id=None, limit=TYPEAHEAD_LIMIT):
+    """
+    READ (picker): Na'vi without an avatar link whose name starts with
+    prefix, optionally in one clan; first `limit` by name
+    """
+    return _typeahead(conn, AVAILABLE_NAVI_SQL, "n.Name", prefix,
+                      "n.Clan_ID", clan_id, limit)
+
+
+def _alliance_names(conn, *alliance_ids):
+    """Refreshes ALLIANCE_GRAPH, checks the alliances exist; returns {id: name}."""
+    ALLIANCE_GRAPH.refresh(conn)
+    for alliance_id in alliance_ids:
+        if not ALLIANCE_GRAPH.has_alliance(alliance_id):
+            raise OperationError(f"alliance {alliance_id} not found")
+    return {row["Alliance_ID"]: row["Name"] for row in reference_list(conn, "alliances")}
+
+
+def alliance_allies(conn, alliance_id, depth=2):
+    """
+    READ (graph): Allies of an alliance (degree 1: sharing a clan or partner
+    company) and allies of allies (degree 2), up to depth
+    """
+    if depth < 1:
+        raise OperationError("depth must be at least 1")
+    names = _alliance_names(conn, alliance_id)
+    allies = ALLIANCE_GRAPH.allies(alliance_id, depth)
+    return [{"Alliance_ID": ally, "Name": names.get(ally), "Degree": degree}
+            for ally, degree in sorted(allies.items(), key=lambda item: (item[1], item[0]))]
+
+
+def alliance_opponents(conn, alliance_id):
+    """READ (graph): Alliances an alliance has fought, most wars first"""
+    names = _alliance_names(conn, alliance_id)
+    opponents = ALLIANCE_GRAPH.opponents(alliance_id)
+    return [{"Alliance_ID": other, "Name": names.get(other), "Wars": wars}
+            for other, wars in sorted(opponents.items(), key=lambda item: (-item[1], item[0]))]
+
+
+def conflict_path(conn, from_alliance_id, to_alliance_id):
+    """READ (graph): Shortest chain of wars linking two alliances; empty when there is none"""
+    names = _alliance_names(conn, from_alliance_id, to_alliance_id)
+    path = ALLIANCE_GRAPH.conflict_path(from_alliance_id, to_alliance_id) or []
+    rows = []
+    for step, alliance_id in enumerate(path):
+        wars = ALLIANCE_GRAPH.opponents(path[step - 1]).get(alliance_id) if step else None
+        rows.append({"Step": step, "Alliance_ID": alliance_id, "Name": names.get(alliance_id),
+                     "Wars_With_Previous": wars})
+    return rows
+
+
+def alliance_blocs(conn):
+    """
+    READ (graph): Blocs of alliances, clans and companies connected by
+    membership or partnerships, largest first
+    """
+    names = _alliance_names(conn)
+    rows = []
+    for members in ALLIANCE_GRAPH.components():
+        alliances = sorted(key[1] for key in members if key[0] == ALLIANCE)
+        if not alliances:
+            continue
+        rows.append({"Bloc": len(rows) + 1, "Alliances": len(alliances),
+                     "Clans": sum(1 for key in members if key[0] == CLAN),
+                     "Companies": sum(1 for key in members if key[0] == COMPANY),
+                     "Alliance_Names": ", ".join(names.get(a) or str(a) for a in alliances)})
+    return rows
+
+
+def _located_companies(conn, found, with_sites):
+    """Rows for grid matches [(distance, index), ...], joined to Staffs when with_sites."""
+    grid = COMPANY_LOCATOR.grid
+    rows = [{"Company_ID": grid.ids[i], "Name": grid.names[i], "Latitude": grid.latitudes[i],
+             "Longitude": grid.longitudes[i], "Distance_Km": round(distance, 2)}
+            for distance, i in found]
+    if not with_sites or not rows:
+        return rows
+    ids = [row["Company_ID"] for row in rows]
+    with conn.cursor() as cur:
+        cur.execute(COMPANY_SITES_SQL.format(ids=", ".join(["%s"] * len(ids))), ids)
+        sites = {}
+        for site in cur.fetchall():
+            sites.setdefault(site.pop("Company_ID"), []).append(site)
+    return [{**row, **site} for row in rows for site in sites.get(row["Company_ID"], ())]
+
+
+def _check_point(latitude, longitude):
+    if not -90 <= latitude <= 90:
+        raise OperationError("latitude must be between -90 and 90")
+    if not -180 <= longitude <= 180:
+        raise OperationError("longitude must be between -180 and 180")
+
+
+def nearest_companies(conn, latitude, longitude, limit=NEAREST_LIMIT, with_sites=False):
+    """
+    READ (proximity): The companies nearest a point, with distance in km;
+    with_sites adds a row per site each one staffs
+    """
+    _check_point(latitude, longitude)
+    if limit < 1:
+        raise OperationError("limit must be at least 1")
+    COMPANY_LOCATOR.refresh(conn)
+    found = COMPANY_LOCATOR.grid.nearest(latitude, longitude, limit)
+    return _located_companies(conn, found, with_sites)
+
+
+def companies_within(conn, latitude, longitude, radius_km, with_sites=False):
+    """
+    READ (proximity): Companies within radius_km of a point, nearest first;
+    with_sites adds a row per site each one staffs
+    """
+    _check_point(latitude, longitude)
+    if radius_km <= 0:
+        raise OperationError("radius_km must be positive")
+    COMPANY_LOCATOR.refresh(conn)
+    found = COMPANY_LOCATOR.grid.within(latitude, longitude, radius_km)
+    return _located_companies(conn, found, with_sites)
+
+
+# ============================================================
+# WRITE OPERATIONS
+# ============================================================
+def _create_with_soul(conn, sql, params):
+    """Inserts an 'Alive' Soul and a row that references it in one transaction."""
+    try:
+        with conn.cursor() as cur:
+            cur.execute("INSERT INTO Soul (State) VALUES ('Alive')")
+            soul_id = cur.lastrowid
+            cur.execute(sql, params + (soul_id,))
+            row_id = cur.lastrowid
+        conn.commit()
+        return soul_id, row_id
+    except pymysql.Error:
+        conn.rollback()
+        raise
+
+
+def create_human(conn, f_name, l_name, rank=None, weapon_type=None, company_id=None):
+    """WRITE 1: Create a human operative with a new Soul"""
+    if not (f_name and l_name):
+        raise OperationError("First name and last name are required.")
+    soul_id, human_id = _create_with_soul(conn, """
+        INSERT INTO Human (F_Name, L_Name, `Rank`, Weapon_Type, Company_ID, Soul_ID)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """, (f_name, l_name, rank, weapon_type, company_id))
+    invalidate("Soul", "Human")
+    return {"human_id": human_id, "soul_id": soul_id}
+
+
+def create_navi(conn, name, age=None, clan_id=None):
+    """WRITE 2: Create a Na'vi with a new Soul"""
+    if not name:
+        raise OperationError("Name is required.")
+    soul_id, navi_id = _create_with_soul(conn, """
+        INSERT INTO Navi (Name, Age, Clan_ID, Soul_ID)
+        VALUES (%s, %s, %s, %s)
+    """, (name, age, clan_id))
+    invalidate("Soul", "Navi")
+    return {"navi_id": navi_id, "soul_id": soul_id}
+
+
+def create_avatar_link(conn, human_id, navi_id, link_status="Active"):
+    """WRITE 3: Link a human to a Na'vi avatar"""
+    if not (human_id and navi_id):
+        raise OperationError("Both Human ID and Na'vi ID are required.")
+    _write(conn, """
+        INSERT INTO Avatar (Human_ID, Navi_ID, Link_Status, Total_Linked_Hours)
+        VALUES (%s, %s, %s, 0)
+    """, (human_id, navi_id, link_status or "Active"))
+    invalidate("Avatar")
+    return {"human_id": human_id, "navi_id": navi_id}
+
+
+def update_site_status(conn, site_id, status, alliance_id=None):
+    """WRITE 4: Change a site's status; only claimed sites keep an owner"""
+    if status not in SITE_STATUSES:
+        raise OperationError(f"Invalid status. Must be: {', '.join(SITE_STATUSES)}")
+    updated, _ = _write(conn, """
+        UPDATE Aetherium_Site
+        SET Status = %s, Alliance_ID = %s
+        WHERE Site_ID = %s
+    """, (status, alliance_id if status == "Claimed" else None, site_id))
+    invalidate("Aetherium_Site")
+    return {"site_id": site_id, "updated": updated}
+
+
+def update_company_ethics(conn, company_id, rating):
+    """WRITE 5: Set a company's ethics rating (0.00 - 10.00)"""
+    try:
+        rating = float(rating)
+    except (TypeError, ValueError):
+        raise OperationError("Invalid rating format.")
+    if not 0.0 <= rating <= 10.0:
+        raise OperationError("Rating must be between 0.00 and 10.00")
+    updated, _ = _write(conn, """
+        UPDATE Company
+        SET Ethics_Rating = %s
+        WHERE Company_ID = %s
+    """, (rating, company_id))
+    invalidate("Company")
+    return {"company_id": company_id, "updated": updated}
+
+
+def alliance_impact(conn, alliance_id=None):
+    """
+    READ (preview): Clans, sites, partnerships, wars and reports that
+    delete_alliance would detach, for one alliance or all of them
+    """
+    with conn.cursor() as cur:
+        if alliance_id is None:
+            cur.execute(ALLIANCE_IMPACT_SQL)
+        else:
+            cur.execute(ALLIANCE_IMPACT_ONE_SQL, (alliance_id,))
+        return cur.fetchall()
+
+
+def delete_alliance(conn, alliance_id):
+    """WRITE 6 (DELETE): Delete an alliance; references are set to NULL"""
+    deleted, _ = _write(conn, "DELETE FROM Alliance WHERE Alliance_ID = %s", (alliance_id,))
+    if deleted:
+        # ON DELETE SET NULL rewrites the referencing rows too
+        invalidate("Alliance", "Clan", "Aetherium_Site", "Partnership",
+                   "War", "Report_Observation")
+    return {"alliance_id": alliance_id, "deleted": deleted}
+
+
+# ============================================================
+# REGISTRY
+# ============================================================
+# name -> (function, [(parameter, type, required), ...], READ or WRITE);
+# defaults come from the function signature
+READ, WRITE = "read", "write"
+
+OPERATIONS = {
+    "humans-by-company": (humans_by_company, [("company_id", int, True)], READ),
+    "navi-by-clan": (navi_by_clan, [("clan_id", int, True)], READ),
+    "avatar-links": (avatar_links, [("limit", int, False)], READ),
+    "navi-bonded-animals": (navi_bonded_animals, [("limit", int, False)], READ),
+    "alliance-resources": (alliance_resources, [], READ),
+    "company-clan-partnerships": (company_clan_partnerships, [("limit", int, False)], READ),
+    "war-active-clans": (war_active_clans, [("min_wars", int, False)], READ),
+    "war-history": (war_history, [("alliance_id", int, True)], READ),
+    "sites-by-ecosystem": (sites_by_ecosystem, [("eco_id", int, True)], READ),
+    "ecosystem-threats": (ecosystem_threats, [("window", str, False)], READ),
+    "search-reports": (search_reports, [("query", str, True), ("eco_id", int, False),
+                                        ("alliance_id", int, False), ("window", str, False),
+                                        ("limit", int, False), ("mode", str, False)], READ),
+    "search-alliances": (search_alliances, [("query", str, True), ("limit", int, False),
+                                            ("mode", str, False)], READ),
+    "alliance-allies": (alliance_allies, [("alliance_id", int, True), ("depth", int, False)], READ),
+    "alliance-opponents": (alliance_opponents, [("alliance_id", int, True)], READ),
+    "conflict-path": (conflict_path, [("from_alliance_id", int, True),
+                                      ("to_alliance_id", int, True)], READ),
+    "alliance-blocs": (alliance_blocs, [], READ),
+    "nearest-companies": (nearest_companies, [("latitude", float, True),
+                                              ("longitude", float, True),
+                                              ("limit", int, False),
+                                              ("with_sites", boolean, False)], READ),
+    "companies-within": (companies_within, [("latitude", float, True),
+                                            ("longitude", float, True),
+                                            ("radius_km", float, True),
+                                            ("with_sites", boolean, False)], READ),
+    "available-humans": (available_humans, [("prefix", str, False),
+                                            ("company_id", int, False),
+                                            ("limit", int, False)], READ),
+    "available-navi": (available_navi, [("prefix", str, False), ("clan_id", int, False),
+                                        ("limit", int, False)], READ),
+    "create-human": (create_human, [("f_name", str, True), ("l_name", str, True),
+                                    ("rank", str, False), ("weapon_type", str, False),
+                                    ("company_id", int, False)], WRITE),
+    "create-navi": (create_navi, [("name", str, True), ("age", int, False),
+                                  ("clan_id", int, False)], WRITE),
+    "create-avatar-link": (create_avatar_link, [("human_id", int, True),
+                                                ("navi_id", int, True),
+                                                ("link_status", str, False)], WRITE),
+    "update-site-status": (update_site_status, [("site_id", int, True),
+                                                ("status", str, True),
+                                                ("alliance_id", int, False)], WRITE),
+    "update-company-ethics": (update_company_ethics, [("company_id", int, True),
+                                                      ("rating", float, True)], WRITE),
+    "alliance-impact": (alliance_impact, [("alliance_id", int, False)], READ),
+    "delete-alliance": (delete_alliance, [("alliance_id", int, True)], WRITE),
+}
+
+
+def call(conn, name, arguments):
+    """
+    Runs a registered operation with a dict of arguments, converting each
+    to its declared type. Raises OperationError for unknown operations or
+    missing / malformed arguments.
+    """
+    if name not in OPERATIONS:
+        raise OperationError(f"Unknown operation '{name}'")
+    if not isinstance(arguments, dict):
+        raise OperationError("arguments must be an object of name: value")
+    func, parameters, _ = OPERATIONS[name]
+    known = {parameter for parameter, _, _ in parameters}
+    unexpected = set(arguments) - known
+    if unexpected:
+        raise OperationError(f"Unexpected argument(s) for {name}: {', '.join(sorted(unexpected))}")
+    kwargs = {}
+    for parameter, kind, required in parameters:
+        value = arguments.get(parameter)
+        if value is None:
+            if required:
+                raise OperationError(f"{name} needs {parameter}")
+            continue
+        try:
+            kwargs[parameter] = kind(value)
+        except (TypeError, ValueError):
+            raise OperationError(f"{parameter} must be {kind.__name__}, got {value!r}")
+    return func(conn, **kwargs)
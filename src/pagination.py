@@ -0,0 +1,146 @@
+"""
+Keyset (seek) pagination for the unbounded listing operations
+
+Instead of OFFSET, each page continues from the sort key of the last row
+already shown ("WHERE key > last ORDER BY key LIMIT n"), so page 1000
+costs the same as page 1. The sort key must be unique, so every listing
+ends its ORDER BY with primary-key columns as tie-breakers.
+"""
+
+
+def listing_query(listing):
+    """The whole listing as one ordered query, for consumers that stream it."""
+    where = f"WHERE {listing['where']}" if listing.get("where") else ""
+    order_by = ", ".join(f"{expr} {direction}" for expr, direction in listing["sort"])
+    return f"SELECT {listing['columns']} FROM {listing['from']} {where} ORDER BY {order_by}"
+
+
+class KeysetPager:
+    """
+    Pages through a listing described by a dict with:
+        columns  - SELECT list
+        from     - FROM clause with joins
+        where    - optional filter (without WHERE)
+        sort     - [(expression, "ASC" | "DESC"), ...], unique as a whole
+    """
+
+    def __init__(self, conn, listing, page_size=25):
+        self.conn = conn
+        self.listing = listing
+        self.page_size = page_size
+        self.first_key = None     # sort key of the first row on the current page
+        self.last_key = None      # sort key of the last row on the current page
+        self.page_number = 0
+        self.has_next = True
+        self.has_prev = False
+
+    @staticmethod
+    def _after(expr, value, ascending):
+        """
+        Condition for rows strictly after value in one column, or None when
+        none can be. NULLs sort first ascending and last descending, as in
+        ORDER BY and the indexes, and never compare with < or >.
+        """
+        if ascending:
+            if value is None:
+                return f"{expr} IS NOT NULL", []
+            return f"{expr} > %s", [value]
+        if value is None:
+            return None
+        return f"({expr} < %s OR {expr} IS NULL)", [value]
+
+    def _seek_condition(self, key, forward):
+        """
+        Builds (a > x) OR (a <=> x AND b > y) OR ... honouring each column's
+        direction; going backwards flips every comparison. NULL-safe, so
+        rows whose sort key is NULL are neither skipped nor repeated.
+        """
+        clauses = []
+        params = []
+        sort = self.listing["sort"]
+        for i, (expr, direction) in enumerate(sort):
+            ascending = (direction.upper() == "ASC") == forward
+            after = self._after(expr, key[i], ascending)
+            if after is None:
+                continue
+            parts = [f"{prev_expr} <=> %s" for prev_expr, _ in sort[:i]]
+            parts.append(after[0])
+            clauses.append("(" + " AND ".join(parts) + ")")
+            params.extend(key[:i])
+            params.extend(after[1])
+        if not clauses:
+            return "FALSE", []
+        return "(" + " OR ".join(clauses) + ")", params
+
+    def page_query(self, key=None, forward=True):
+        """
+        (sql, params) of the page after key (before it when not forward),
+        or of the first page without a key. Fetches page_size + 1 rows.
+        """
+        listing = self.listing
+        sort = listing["sort"]
+        seek_columns = ", ".join(f"{expr} AS _seek_{i}" for i, (expr, _) in enumerate(sort))
+
+        conditions = [listing["where"]] if listing.get("where") else []
+        params = []
+        if key is not None:
+            condition, params = self._seek_condition(key, forward)
+            conditions.append(condition)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        def order(direction):
+            ascending = (direction.upper() == "ASC") == forward
+            return "ASC" if ascending else "DESC"
+        order_by = ", ".join(f"{expr} {order(direction)}" for expr, direction in sort)
+
+        sql = (f"SELECT {listing['columns']}, {seek_columns} FROM {listing['from']} "
+               f"{where} ORDER BY {order_by} LIMIT %s")
+        # One extra row tells us whether another page exists
+        return sql, params + [self.page_size + 1]
+
+    def _fetch(self, key, forward):
+        sql, params = self.page_query(key, forward)
+        with self.conn.cursor() as cur:
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+
+        more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if not forward:
+            rows.reverse()
+        return rows, more
+
+    def _set_page(self, rows):
+        names = [f"_seek_{i}" for i in range(len(self.listing["sort"]))]
+        self.first_key = [rows[0][name] for name in names]
+        self.last_key = [rows[-1][name] for name in names]
+        for row in rows:
+            for name in names:
+                del row[name]
+        return rows
+
+    def next_page(self):
+        """Returns the rows of the following page ([] at the end)."""
+        if not self.has_next:
+            return []
+        rows, more = self._fetch(self.last_key, forward=True)
+        if not rows:
+            self.has_next = False
+            return []
+        self.has_prev = self.page_number > 0
+        self.page_number += 1
+        self.has_next = more
+        return self._set_page(rows)
+
+    def prev_page(self):
+        """Returns the rows of the preceding page ([] on the first page)."""
+        if not self.has_prev:
+            return []
+        rows, more = self._fetch(self.first_key, forward=False)
+        if not rows:
+            self.has_prev = False
+            return []
+        self.page_number -= 1
+        self.has_prev = more
+        self.has_next = True
+        return self._set_page(rows)
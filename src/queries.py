@@ -0,0 +1,326 @@
+"""
+SQL for the read operations in main_app.py
+Kept in one place so the menu, benchmarks and tooling run identical queries
+"""
+
+# READ 1: Human operatives in a company, by rank and last name
+HUMANS_BY_COMPANY_SQL = """
+    SELECT h.Human_ID, h.F_Name, h.L_Name, h.Rank, h.Weapon_Type,
+           c.Name as Company_Name, c.Ethics_Rating,
+           s.Soul_ID, s.State as Soul_State
+    FROM Human h
+    JOIN Company c ON h.Company_ID = c.Company_ID
+    JOIN Soul s ON h.Soul_ID = s.Soul_ID
+    WHERE c.Company_ID = %s
+    ORDER BY h.Rank, h.L_Name
+"""
+
+# READ 2: Na'vi in a clan with alliance details, oldest first
+NAVI_BY_CLAN_SQL = """
+    SELECT n.Navi_ID, n.Name, n.Age,
+           c.Clan_Name,
+           a.Name as Alliance_Name, a.Objective as Alliance_Objective,
+           s.State as Soul_State
+    FROM Navi n
+    JOIN Clan c ON n.Clan_ID = c.Clan_ID
+    LEFT JOIN Alliance a ON c.Alliance_ID = a.Alliance_ID
+    JOIN Soul s ON n.Soul_ID = s.Soul_ID
+    WHERE c.Clan_ID = %s
+    ORDER BY n.Age DESC
+"""
+
+# READ 3: Active avatar links, most linked hours first
+AVATAR_LINKS_SQL = """
+    SELECT av.Human_ID, av.Navi_ID, av.Link_Status, av.Total_Linked_Hours,
+           CONCAT(h.F_Name, ' ', h.L_Name) as Human_Name, h.Rank,
+           n.Name as Navi_Name, n.Age as Navi_Age,
+           c.Clan_Name,
+           co.Name as Company_Name
+    FROM Avatar av
+    JOIN Human h ON av.Human_ID = h.Human_ID
+    JOIN Navi n ON av.Navi_ID = n.Navi_ID
+    JOIN Clan c ON n.Clan_ID = c.Clan_ID
+    LEFT JOIN Company co ON h.Company_ID = co.Company_ID
+    WHERE av.Link_Status = 'Active'
+    ORDER BY av.Total_Linked_Hours DESC
+"""
+
+# READ 4: Na'vi with (or without) bonded animals
+NAVI_BONDED_ANIMALS_SQL = """
+    SELECT n.Navi_ID, n.Name as Navi_Name, n.Age,
+           ba.Name as Bonded_Animal,
+           c.Clan_Name,
+           a.Name as Alliance_Name
+    FROM Navi n
+    LEFT JOIN Bonded_Animal ba ON n.Navi_ID = ba.Navi_ID
+    JOIN Clan c ON n.Clan_ID = c.Clan_ID
+    LEFT JOIN Alliance a ON c.Alliance_ID = a.Alliance_ID
+    ORDER BY c.Clan_Name, n.Name
+"""
+
+# READ 5: Claimed-site resource totals per alliance
+# Reads the trigger-maintained Alliance_Resource_Summary (see summaries.py)
+ALLIANCE_RESOURCES_SQL = """
+    SELECT a.Alliance_ID, a.Name as Alliance_Name, a.Objective,
+           s.Sites_Controlled,
+           s.Total_Resources,
+           COALESCE(s.Total_Resources / NULLIF(s.Quantity_Sites, 0), 0) as Avg_Resources_Per_Site
+    FROM Alliance_Resource_Summary s
+    JOIN Alliance a ON a.Alliance_ID = s.Alliance_ID
+    ORDER BY s.Total_Resources DESC
+"""
+
+# Tables READ 5 depends on (query_cache invalidation); the summary is
+# derived from Aetherium_Site, so site writes invalidate it
+ALLIANCE_RESOURCES_TABLES = ("Alliance", "Aetherium_Site")
+
+# READ 6: Company-clan partnerships
+COMPANY_CLAN_PARTNERSHIPS_SQL = """
+    SELECT p.Company_ID, p.Clan_ID,
+           co.Name as Company_Name, co.Ethics_Rating,
+           c.Clan_Name,
+           a.Name as Alliance_Name, a.Objective
+    FROM Partnership p
+    JOIN Company co ON p.Company_ID = co.Company_ID
+    JOIN Clan c ON p.Clan_ID = c.Clan_ID
+    LEFT JOIN Alliance a ON p.Alliance_ID = a.Alliance_ID
+    ORDER BY a.Name, co.Name
+"""
+
+# READ 7: Clans with at least N wars
+WAR_ACTIVE_CLANS_SQL = """
+    SELECT c.Clan_ID, c.Clan_Name,
+           a.Name as Alliance_Name,
+           COUNT(fi.War_ID) as Wars_Participated,
+           AVG(fi.Strength_Value) as Avg_Strength
+    FROM Clan c
+    JOIN Fights_In fi ON c.Clan_ID = fi.Clan_ID
+    LEFT JOIN Alliance a ON c.Alliance_ID = a.Alliance_ID
+    GROUP BY c.Clan_ID
+    HAVING COUNT(fi.War_ID) >= %s
+    ORDER BY Wars_Participated DESC, Avg_Strength DESC
+"""
+
+WAR_ACTIVE_CLANS_TABLES = ("Clan", "Fights_In", "Alliance")
+
+# READ 8: Wars an alliance attacked or defended in. The UNION runs two
+# lookups on the Attack_Alliance_ID / Defense_Alliance_ID foreign-key
+# indexes (an OR of the two columns scans War) and drops a war the alliance
+# is on both sides of; clans are counted per war on Fights_In's War_ID index
+# instead of grouping the joined rows. Same rows as the OR + GROUP BY form.
+WAR_HISTORY_SQL = """
+    SELECT w.War_ID, w.Casualties, w.Outcome,
+           a_attack.Name as Attacking_Alliance,
+           a_defend.Name as Defending_Alliance,
+           (SELECT COUNT(*) FROM Fights_In fi
+            WHERE fi.War_ID = w.War_ID) as Clans_Involved
+    FROM (SELECT War_ID FROM War WHERE Attack_Alliance_ID = %s
+          UNION
+          SELECT War_ID FROM War WHERE Defense_Alliance_ID = %s) aw
+    JOIN War w ON w.War_ID = aw.War_ID
+    JOIN Alliance a_attack ON w.Attack_Alliance_ID = a_attack.Alliance_ID
+    JOIN Alliance a_defend ON w.Defense_Alliance_ID = a_defend.Alliance_ID
+    ORDER BY w.Casualties DESC, w.War_ID
+"""
+
+# READ 9: Sites in an ecosystem with flora
+SITES_BY_ECOSYSTEM_SQL = """
+    SELECT e.Name as Ecosystem_Name, e.Biome_Type, e.Dominant_Species,
+           ast.Site_ID, ast.Resource_Quantity, ast.Status,
+           a.Name as Controlled_By_Alliance,
+           GROUP_CONCAT(DISTINCT ef.Flora_Name SEPARATOR ', ') as Flora_Species
+    FROM Ecosystem e
+    LEFT JOIN Aetherium_Site ast ON e.Eco_ID = ast.Eco_ID
+    LEFT JOIN Alliance a ON ast.Alliance_ID = a.Alliance_ID
+    LEFT JOIN Ecosystem_Flora ef ON e.Eco_ID = ef.Eco_ID
+    WHERE e.Eco_ID = %s
+    GROUP BY ast.Site_ID
+    ORDER BY ast.Resource_Quantity DESC
+"""
+
+# READ 10: Threat report aggregates per ecosystem, over hot and archived
+# reports alike (see retention.py)
+ECOSYSTEM_THREAT_SQL = """
+    SELECT e.Eco_ID, e.Name as Ecosystem_Name, e.Biome_Type,
+           COUNT(DISTINCT ro.Report_ID) as Threat_Reports,
+           AVG(ro.Danger_Level) as Avg_Danger_Level,
+           SUM(ro.Resource_Estimate_Change) as Total_Resource_Loss
+    FROM Ecosystem e
+    JOIN Aetherium_Site ast ON e.Eco_ID = ast.Eco_ID
+    JOIN Report_Site_All rs ON ast.Site_ID = rs.Site_ID
+    JOIN Report_Observation_All ro ON rs.Report_ID = ro.Report_ID
+    GROUP BY e.Eco_ID
+    HAVING COUNT(ro.Report_ID) > 0
+    ORDER BY Avg_Danger_Level DESC, Threat_Reports DESC
+"""
+
+ECOSYSTEM_THREAT_TABLES = ("Ecosystem", "Aetherium_Site", "Report_Site",
+                           "Report_Observation", "Report_Site_Archive", "Report_Archive")
+
+# READ 10 over a time window: sums the hourly Ecosystem_Threat_Rollup buckets
+# from the start of the hour `%s hours` ago, via idx_threat_rollup_bucket,
+# instead of joining every report ever filed. Same columns as above.
+ECOSYSTEM_THREAT_WINDOW_SQL = """
+    SELECT e.Eco_ID, e.Name as Ecosystem_Name, e.Biome_Type,
+           SUM(r.Reports) as Threat_Reports,
+           CAST(SUM(r.Danger_Sum) / NULLIF(SUM(r.Danger_Count), 0) AS DECIMAL(7,4))
+               as Avg_Danger_Level,
+           IF(SUM(r.Resource_Count) = 0, NULL, SUM(r.Resource_Change)) as Total_Resource_Loss
+    FROM Ecosystem_Threat_Rollup r
+    JOIN Ecosystem e ON r.Eco_ID = e.Eco_ID
+    WHERE r.Bucket_Start >= DATE_FORMAT(NOW() - INTERVAL %s HOUR, '%%Y-%%m-%%d %%H:00:00')
+    GROUP BY e.Eco_ID
+    HAVING Threat_Reports > 0
+    ORDER BY Avg_Danger_Level DESC, Threat_Reports DESC
+"""
+
+# WRITE 3 pickers: Humans / Na'vi without an avatar link, first N in name
+# order. {filters} is "" or extra "AND ..." conditions on the name prefix and
+# company / clan; idx_human_lname, idx_human_company_lname, idx_navi_name and
+# idx_navi_clan_name return rows in ORDER BY order so the scan stops at LIMIT,
+# and NOT EXISTS probes Avatar's primary key / UNIQUE (Navi_ID).
+AVAILABLE_HUMANS_SQL = """
+    SELECT h.Human_ID, CONCAT(h.F_Name, ' ', h.L_Name) as Name, c.Name as Company
+    FROM Human h
+    LEFT JOIN Company c ON h.Company_ID = c.Company_ID
+    WHERE NOT EXISTS (SELECT 1 FROM Avatar av WHERE av.Human_ID = h.Human_ID)
+          {filters}
+    ORDER BY h.L_Name, h.Human_ID
+    LIMIT %s
+"""
+
+AVAILABLE_NAVI_SQL = """
+    SELECT n.Navi_ID, n.Name, cl.Clan_Name
+    FROM Navi n
+    LEFT JOIN Clan cl ON n.Clan_ID = cl.Clan_ID
+    WHERE NOT EXISTS (SELECT 1 FROM Avatar av WHERE av.Navi_ID = n.Navi_ID)
+          {filters}
+    ORDER BY n.Name, n.Navi_ID
+    LIMIT %s
+"""
+
+# Proximity reads: the sites each of the companies found (by the in-memory
+# grid) staffs, looked up on Staffs' (Company_ID, Site_ID) primary key; a
+# company staffing no site still gets one row
+COMPANY_SITES_SQL = """
+    SELECT c.Company_ID, s.Site_ID, s.Status as Site_Status,
+           s.Resource_Quantity, e.Name as Ecosystem
+    FROM Company c
+    LEFT JOIN Staffs st ON st.Company_ID = c.Company_ID
+    LEFT JOIN Aetherium_Site s ON s.Site_ID = st.Site_ID
+    LEFT JOIN Ecosystem e ON e.Eco_ID = s.Eco_ID
+    WHERE c.Company_ID IN ({ids})
+    ORDER BY c.Company_ID, s.Site_ID
+"""
+
+# Search: reports whose threat description matches, ranked by FULLTEXT
+# relevance. {mode} is the AGAINST modifier and {filters} the optional
+# alliance / ecosystem / time conditions; the search terms are bound twice
+# (MySQL evaluates the identical MATCH once).
+SEARCH_REPORTS_SQL = """
+    SELECT ro.Report_ID, rm.Timestamp, ro.Danger_Level, a.Name as Alliance,
+           ro.Threat_Description,
+           MATCH(ro.Threat_Description) AGAINST (%s {mode}) as Relevance
+    FROM Report_Observation ro
+    JOIN Report_Meta rm ON rm.Report_ID = ro.Report_ID
+    LEFT JOIN Alliance a ON a.Alliance_ID = ro.Alliance_ID
+    WHERE MATCH(ro.Threat_Description) AGAINST (%s {mode})
+          {filters}
+    ORDER BY Relevance DESC, rm.Timestamp DESC, ro.Report_ID DESC
+    LIMIT %s
+"""
+
+SEARCH_REPORTS_ECOSYSTEM_FILTER = """
+          AND EXISTS (SELECT 1 FROM Report_Site rs
+                      JOIN Aetherium_Site s ON s.Site_ID = rs.Site_ID
+                      WHERE rs.Report_ID = ro.Report_ID AND s.Eco_ID = %s)"""
+
+SEARCH_ALLIANCES_SQL = """
+    SELECT Alliance_ID, Name, Objective,
+           MATCH(Objective) AGAINST (%s {mode}) as Relevance
+    FROM Alliance
+    WHERE MATCH(Objective) AGAINST (%s {mode})
+    ORDER BY Relevance DESC, Alliance_ID
+    LIMIT %s
+"""
+
+# WRITE 6 preview: rows a DELETE FROM Alliance would set to NULL. Each count
+# is its own subquery on the referencing table's Alliance_ID foreign-key
+# index, so no clans x sites product is built; a war the alliance both
+# attacked and defended is counted once.
+ALLIANCE_IMPACT_SELECT = """
+    SELECT a.Alliance_ID, a.Name, a.Objective,
+           (SELECT COUNT(*) FROM Clan c
+            WHERE c.Alliance_ID = a.Alliance_ID) as Clans,
+           (SELECT COUNT(*) FROM Aetherium_Site ast
+            WHERE ast.Alliance_ID = a.Alliance_ID) as Sites,
+           (SELECT COUNT(*) FROM Partnership p
+            WHERE p.Alliance_ID = a.Alliance_ID) as Partnerships,
+           (SELECT COUNT(*) FROM War w
+            WHERE w.Attack_Alliance_ID = a.Alliance_ID)
+         + (SELECT COUNT(*) FROM War w
+            WHERE w.Defense_Alliance_ID = a.Alliance_ID
+              AND NOT (w.Attack_Alliance_ID <=> a.Alliance_ID)) as Wars,
+           (SELECT COUNT(*) FROM Report_Observation ro
+            WHERE ro.Alliance_ID = a.Alliance_ID) as Reports
+    FROM Alliance a
+"""
+
+ALLIANCE_IMPACT_SQL = ALLIANCE_IMPACT_SELECT + "    ORDER BY a.Name\n"
+
+ALLIANCE_IMPACT_ONE_SQL = ALLIANCE_IMPACT_SELECT + "    WHERE a.Alliance_ID = %s\n"
+
+# ------------------------------------------------------------
+# Keyset-paginated listings (see pagination.KeysetPager)
+# Sort keys end in primary-key columns so every row has a unique position
+# ------------------------------------------------------------
+
+# READ 3 paged: served by idx_avatar_status_hours
+AVATAR_LINKS_LISTING = {
+    "columns": """av.Human_ID, av.Navi_ID, av.Link_Status, av.Total_Linked_Hours,
+           CONCAT(h.F_Name, ' ', h.L_Name) as Human_Name, h.Rank,
+           n.Name as Navi_Name, n.Age as Navi_Age,
+           c.Clan_Name,
+           co.Name as Company_Name""",
+    "from": """Avatar av
+    JOIN Human h ON av.Human_ID = h.Human_ID
+    JOIN Navi n ON av.Navi_ID = n.Navi_ID
+    JOIN Clan c ON n.Clan_ID = c.Clan_ID
+    LEFT JOIN Company co ON h.Company_ID = co.Company_ID""",
+    "where": "av.Link_Status = 'Active'",
+    "sort": [("av.Total_Linked_Hours", "DESC"), ("av.Human_ID", "ASC"),
+             ("av.Navi_ID", "ASC")],
+}
+
+# READ 4 paged: by clan name, then Na'vi name. The clan name is read from
+# Navi's own copy (migration 009), so idx_navi_clan_sort returns the rows in
+# order and a page reads page_size + 1 index entries instead of sorting the
+# whole join; the other joins are primary-key probes.
+NAVI_BONDED_ANIMALS_LISTING = {
+    "columns": """n.Navi_ID, n.Name as Navi_Name, n.Age,
+           ba.Name as Bonded_Animal,
+           c.Clan_Name,
+           a.Name as Alliance_Name""",
+    "from": """Navi n
+    LEFT JOIN Bonded_Animal ba ON n.Navi_ID = ba.Navi_ID
+    JOIN Clan c ON n.Clan_ID = c.Clan_ID
+    LEFT JOIN Alliance a ON c.Alliance_ID = a.Alliance_ID""",
+    "sort": [("n.Clan_Sort_Name", "ASC"), ("n.Clan_ID", "ASC"), ("n.Name", "ASC"),
+             ("n.Navi_ID", "ASC")],
+}
+
+# READ 6 paged: by alliance name, partnerships without an alliance first as
+# in READ 6, then company name; Partnership's copies of both names are
+# ordered by idx_partnership_sort (migration 009), as in READ 4
+COMPANY_CLAN_PARTNERSHIPS_LISTING = {
+    "columns": """p.Company_ID, p.Clan_ID,
+           co.Name as Company_Name, co.Ethics_Rating,
+           c.Clan_Name,
+           a.Name as Alliance_Name, a.Objective""",
+    "from": """Partnership p
+    JOIN Company co ON p.Company_ID = co.Company_ID
+    JOIN Clan c ON p.Clan_ID = c.Clan_ID
+    LEFT JOIN Alliance a ON p.Alliance_ID = a.Alliance_ID""",
+    "sort": [("p.Alliance_Sort_Name", "ASC"), ("p.Company_Sort_Name", "ASC"),
+             ("p.Company_ID", "ASC"), ("p.Clan_ID", "ASC")],
+}
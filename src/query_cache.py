@@ -0,0 +1,130 @@
+"""
+Read-through result cache for the analytical READ operations
+
+Results are keyed by (sql, params) and expire after a TTL; the least
+recently used entry is evicted once the cache is full. Every entry records
+the tables it was computed from, and write operations invalidate exactly the
+entries that depend on the tables they touched.
+
+The cache lives in this process only: writes made by other clients become
+visible when the TTL runs out.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class QueryCache:
+    """Thread-safe TTL + LRU cache of query results with table-based invalidation."""
+
+    def __init__(self, max_entries=128, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()     # key -> (expires_at, tables, rows)
+        self._by_table = {}               # table -> set of keys
+        self._versions = {}               # table -> invalidation counter
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(sql, params):
+        return (sql, tuple(params) if params is not None else None)
+
+    def _drop(self, key):
+        _, tables, _ = self._entries.pop(key)
+        for table in tables:
+            keys = self._by_table.get(table)
+            if keys:
+                keys.discard(key)
+
+    def get(self, sql, params=None):
+        """Returns cached rows, or None on a miss or expired entry."""
+        key = self.make_key(sql, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, sql, params, tables, rows, versions=None):
+        """
+        Stores rows computed from the given tables. When versions (taken
+        before the query ran) no longer match, a write raced the query and
+        the result is not cached.
+        """
+        key = self.make_key(sql, params)
+        tables = tuple(tables)
+        with self._lock:
+            if versions is not None and versions != self._table_versions(tables):
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, tables, rows)
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _table_versions(self, tables):
+        return tuple(self._versions.get(table, 0) for table in tables)
+
+    def versions(self, tables):
+        """Invalidation counters of the tables; they change on every invalidate()."""
+        with self._lock:
+            return self._table_versions(tables)
+
+    def fetch(self, conn, sql, params=None, tables=()):
+        """
+        Read-through lookup: returns cached rows or runs the query on conn,
+        caches the result and returns it. Treat the returned list as read-only.
+        """
+        rows = self.get(sql, params)
+        if rows is not None:
+            return rows
+        with self._lock:
+            versions = self._table_versions(tables)
+        with conn.cursor() as cur:
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+        self.put(sql, params, tables, rows, versions)
+        return rows
+
+    def invalidate(self, *tables):
+        """Drops every entry computed from any of the given tables."""
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+                for key in list(self._by_table.pop(table, ())):
+                    if key in self._entries:
+                        self._drop(key)
+                        self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+
+    def stats(self):
+        """Hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,212 @@
+"""
+Per-query profiling for Pandora Chronicles Database
+Timing, slow-query log and EXPLAIN capture for every cursor.execute
+
+Pool connections use the profiled cursor classes below. While profiling is
+off, each execute/fetch costs one attribute check. When it is on, every
+statement records the time spent in execute and fetch calls, the rows
+returned and the approximate bytes fetched, grouped by the operation that
+ran it (e.g. "READ 8 view_war_history"). Statements slower than the
+threshold are appended to a JSON-lines slow-query log with their EXPLAIN.
+
+Settings come from the environment and can be changed at runtime:
+    PANDORA_PROFILE=1            start with profiling on
+    PANDORA_SLOW_MS=200          slow-query threshold in milliseconds
+    PANDORA_SLOW_LOG=slow.log    slow-query log file
+"""
+
+import datetime
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pymysql
+
+_local = threading.local()
+
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE", "TABLE")
+
+
+def operation_tag(func):
+    """'READ 8 view_war_history' from the 'READ 8: ...' docstring convention."""
+    doc = (func.__doc__ or "").strip().splitlines()
+    label = doc[0].split(":", 1)[0].strip() if doc and ":" in doc[0] else ""
+    return f"{label} {func.__name__}".strip()
+
+
+def current_operation():
+    return getattr(_local, "operation", None) or "(none)"
+
+
+@contextmanager
+def operation(name):
+    """Tags every statement run in this thread inside the block."""
+    previous = getattr(_local, "operation", None)
+    _local.operation = name
+    try:
+        yield
+    finally:
+        _local.operation = previous
+
+
+def approximate_size(row):
+    """Rough wire size of a fetched row."""
+    if isinstance(row, dict):
+        row = row.values()
+    size = 0
+    for value in row:
+        if isinstance(value, (str, bytes, bytearray)):
+            size += len(value)
+        elif value is not None:
+            size += 8
+    return size
+
+
+class QueryProfiler:
+    """Collects per-operation statistics and writes the slow-query log."""
+
+    def __init__(self, enabled=False, slow_ms=200.0, slow_log="slow_queries.log"):
+        self.enabled = enabled
+        self.slow_ms = slow_ms
+        self.slow_log = slow_log
+        self._stats = {}        # operation -> counters
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls(enabled=os.environ.get("PANDORA_PROFILE", "") not in ("", "0"),
+                   slow_ms=float(os.environ.get("PANDORA_SLOW_MS", 200)),
+                   slow_log=os.environ.get("PANDORA_SLOW_LOG", "slow_queries.log"))
+
+    def record(self, conn, sql, operation_name, elapsed, rows, size):
+        """Adds one finished statement; logs it with EXPLAIN when slow."""
+        elapsed_ms = elapsed * 1000
+        slow = elapsed_ms >= self.slow_ms
+        with self._lock:
+            stats = self._stats.setdefault(operation_name, {
+                "statements": 0, "total_ms": 0.0, "max_ms": 0.0,
+                "rows": 0, "bytes": 0, "slow": 0})
+            stats["statements"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            stats["rows"] += rows
+            stats["bytes"] += size
+            stats["slow"] += slow
+        if slow and self.slow_log:
+            self._log_slow(conn, sql, operation_name, elapsed_ms, rows, size)
+
+    def _log_slow(self, conn, sql, operation_name, elapsed_ms, rows, size):
+        entry = {
+            "time": datetime.datetime.now().isoformat(timespec="seconds"),
+            "operation": operation_name,
+            "elapsed_ms": round(elapsed_ms, 3),
+            "rows": rows,
+            "bytes": size,
+            "sql": sql,
+            "explain": explain(conn, sql),
+        }
+        with self._lock:
+            with open(self.slow_log, "a", encoding="utf-8") as log:
+                log.write(json.dumps(entry, default=str) + "\n")
+
+    def stats(self):
+        """Per-operation counters, slowest total first."""
+        with self._lock:
+            rows = [dict(operation=name, **counters) for name, counters in self._stats.items()]
+        for row in rows:
+            row["avg_ms"] = round(row["total_ms"] / row["statements"], 3)
+            row["total_ms"] = round(row["total_ms"], 3)
+            row["max_ms"] = round(row["max_ms"], 3)
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+PROFILER = QueryProfiler.from_env()
+
+
+def explain(conn, sql):
+    """EXPLAIN FORMAT=JSON of a statement as a dict, or the error text."""
+    if sql.lstrip().split(None, 1)[0].upper() not in EXPLAINABLE:
+        return None
+    try:
+        with conn.cursor(pymysql.cursors.Cursor) as cur:
+            cur.execute("EXPLAIN FORMAT=JSON " + sql)
+            return json.loads(cur.fetchone()[0])
+    except (pymysql.Error, ValueError, TypeError) as e:
+        return f"EXPLAIN failed: {e}"
+
+
+# ============================================================
+# PROFILED CURSORS
+# ============================================================
+class ProfilingMixin:
+    """
+    Times execute and fetch calls of a pymysql cursor. A statement is
+    recorded when the next one starts or the cursor closes, so the rows of
+    unbuffered cursors are counted as they are fetched.
+    """
+    profiler = PROFILER
+    unbuffered = False
+    _pending = None         # [sql, operation, elapsed, rows, bytes]
+
+    def _finish(self, conn):
+        pending, self._pending = self._pending, None
+        if pending and conn is not None:
+            self.profiler.record(conn, *pending)
+
+    def execute(self, query, args=None):
+        if not self.profiler.enabled:
+            return super().execute(query, args)
+        self._finish(self.connection)
+        sql = self.mogrify(query, args)
+        started = time.perf_counter()
+        result = super().execute(sql)
+        elapsed = time.perf_counter() - started
+        self._pending = [sql, current_operation(), elapsed, 0, 0]
+        if not self.unbuffered and self._rows:
+            # Buffered cursors have fetched everything during execute
+            self._pending[3] = len(self._rows)
+            self._pending[4] = sum(approximate_size(row) for row in self._rows)
+        return result
+
+    def _timed_fetch(self, fetch, *args, single=False):
+        pending = self._pending
+        if pending is None or not self.unbuffered:
+            return fetch(*args)
+        started = time.perf_counter()
+        result = fetch(*args)
+        pending[2] += time.perf_counter() - started
+        rows = ([result] if result is not None else []) if single else (result or [])
+        pending[3] += len(rows)
+        pending[4] += sum(approximate_size(row) for row in rows)
+        return result
+
+    def fetchone(self):
+        return self._timed_fetch(super().fetchone, single=True)
+
+    def fetchmany(self, size=None):
+        return self._timed_fetch(super().fetchmany, size)
+
+    def fetchall(self):
+        return self._timed_fetch(super().fetchall)
+
+    def close(self):
+        conn = self.connection
+        try:
+            super().close()
+        finally:
+            self._finish(conn)
+
+
+class ProfiledDictCursor(ProfilingMixin, pymysql.cursors.DictCursor):
+    """Buffered dict cursor with profiling; the pool's default."""
+
+
+class ProfiledSSDictCursor(ProfilingMixin, pymysql.cursors.SSDictCursor):
+    """Unbuffered (server-side) dict cursor with profiling."""
+    unbuffered = True
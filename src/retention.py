@@ -0,0 +1,257 @@
+"""
+Report Retention for Pandora Chronicles Database
+Moves old intelligence reports into the partitioned archive tier
+
+Reports older than the horizon are copied into Report_Archive (meta and
+observation in one compressed row) and Report_Site_Archive, then deleted
+from the hot tables in batches of --batch-size, one transaction each. The
+archive tables are partitioned by year of Timestamp; the partitions a run
+needs are created first. Archived reports stay visible to the reads over
+all history (READ 10, the threat rollup) through the *_All views, while
+Report_Meta / Report_Observation / Report_Site only hold recent reports.
+
+Usage:
+    python retention.py --status
+    python retention.py --archive --horizon-days 365
+    python retention.py --archive --before 2179-01-01
+    python retention.py --purge-before 2170     # drop archived years < 2170
+"""
+
+import argparse
+import sys
+
+import pymysql
+
+from db_pool import create_pool
+import operations as ops
+
+DEFAULT_HORIZON_DAYS = 365
+DEFAULT_BATCH_SIZE = 1000
+
+ARCHIVE_TABLES = ("Report_Archive", "Report_Site_Archive")
+REPORT_TABLES = ("Report_Meta", "Report_Observation", "Report_Site") + ARCHIVE_TABLES
+
+PARTITIONS_SQL = """
+    SELECT PARTITION_NAME as Name, TABLE_ROWS as Approx_Rows
+    FROM information_schema.PARTITIONS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    ORDER BY PARTITION_ORDINAL_POSITION
+"""
+
+ARCHIVE_REPORTS_SQL = """
+    INSERT INTO Report_Archive
+        (Report_ID, Timestamp, Observed, Threat_Description, Resource_Estimate_Change,
+         Danger_Level_Observed, Danger_Level, Alliance_ID)
+    SELECT rm.Report_ID, rm.Timestamp, ro.Report_ID IS NOT NULL, ro.Threat_Description,
+           ro.Resource_Estimate_Change, ro.Danger_Level_Observed, ro.Danger_Level,
+           ro.Alliance_ID
+    FROM Report_Meta rm
+    LEFT JOIN Report_Observation ro ON ro.Report_ID = rm.Report_ID
+    WHERE rm.Report_ID IN ({ids})
+"""
+
+ARCHIVE_SITES_SQL = """
+    INSERT INTO Report_Site_Archive (Site_ID, Report_ID, Timestamp)
+    SELECT rs.Site_ID, rs.Report_ID, rm.Timestamp
+    FROM Report_Site rs
+    JOIN Report_Meta rm ON rm.Report_ID = rs.Report_ID
+    WHERE rs.Report_ID IN ({ids})
+"""
+
+
+# ============================================================
+# PARTITIONS
+# ============================================================
+def archive_partitions(conn, table):
+    """[{Name, Approx_Rows}, ...] of an archive table, oldest first."""
+    with conn.cursor() as cur:
+        cur.execute(PARTITIONS_SQL, (table,))
+        return cur.fetchall()
+
+
+def partition_years(conn, table):
+    """Years with their own partition: p2179 holds rows before 2180-01-01."""
+    return [int(p["Name"][1:]) for p in archive_partitions(conn, table)
+            if p["Name"][1:].isdigit()]
+
+
+def ensure_year_partitions(conn, years):
+    """
+    Splits a partition per year off p_future in both archive tables. Years at
+    or below the newest existing partition already have a home.
+    Returns the partitions created.
+    """
+    created = []
+    for table in ARCHIVE_TABLES:
+        newest = max(partition_years(conn, table), default=None)
+        for year in sorted(set(years)):
+            if newest is not None and year <= newest:
+                continue
+            with conn.cursor() as cur:
+                # DDL: commits implicitly, so never run inside a batch
+                cur.execute(f"""
+                    ALTER TABLE {table} REORGANIZE PARTITION p_future INTO (
+                        PARTITION p{year} VALUES LESS THAN ('{year + 1}-01-01'),
+                        PARTITION p_future VALUES LESS THAN (MAXVALUE))
+                """)
+            newest = year
+            created.append(f"{table}.p{year}")
+    return created
+
+
+# ============================================================
+# ARCHIVING
+# ============================================================
+def horizon_cutoff(conn, days):
+    """The server's current time minus days."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT NOW() - INTERVAL %s DAY AS cutoff", (days,))
+        return cur.fetchone()["cutoff"]
+
+
+def archive_reports(conn, cutoff, batch_size=DEFAULT_BATCH_SIZE, on_batch=None):
+    """
+    Moves every report with Timestamp < cutoff to the archive tier, oldest
+    first, batch_size reports per transaction. on_batch(archived so far)
+    is called after each commit. Returns the number of reports archived.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT DISTINCT YEAR(Timestamp) AS year FROM Report_Meta "
+                    "WHERE Timestamp < %s", (cutoff,))
+        years = [row["year"] for row in cur.fetchall()]
+    conn.commit()
+    if not years:
+        return 0
+    ensure_year_partitions(conn, years)
+
+    archived = 0
+    try:
+        while True:
+            with conn.cursor() as cur:
+                cur.execute("""SELECT Report_ID FROM Report_Meta
+                               WHERE Timestamp < %s
+                               ORDER BY Timestamp, Report_ID
+                               LIMIT %s FOR UPDATE""", (cutoff, batch_size))
+                ids = [row["Report_ID"] for row in cur.fetchall()]
+                if not ids:
+                    conn.commit()
+                    break
+                placeholders = ", ".join(["%s"] * len(ids))
+                cur.execute(ARCHIVE_REPORTS_SQL.format(ids=placeholders), ids)
+                cur.execute(ARCHIVE_SITES_SQL.format(ids=placeholders), ids)
+                # ON DELETE CASCADE removes the observation and site links
+                # without firing triggers, so the threat rollup keeps them
+                cur.execute(f"DELETE FROM Report_Meta WHERE Report_ID IN ({placeholders})", ids)
+            conn.commit()
+            archived += len(ids)
+            if on_batch:
+                on_batch(archived)
+    except pymysql.Error:
+        conn.rollback()
+        raise
+    finally:
+        # Batches committed before a failure are kept
+        if archived:
+            ops.invalidate(*REPORT_TABLES)
+    return archived
+
+
+def purge_archive(conn, before_year):
+    """
+    Drops the archive partitions holding only reports from before
+    before_year, together with their threat rollup buckets. Refuses while
+    hot reports that old remain (archive them first). Returns the
+    partitions dropped.
+    """
+    boundary = f"{before_year}-01-01"
+    with conn.cursor() as cur:
+        cur.execute("SELECT 1 FROM Report_Meta WHERE Timestamp < %s LIMIT 1", (boundary,))
+        if cur.fetchone():
+            raise ValueError(f"reports before {boundary} are not archived yet; archive them first")
+
+    dropped, dropped_years = [], set()
+    for table in ARCHIVE_TABLES:
+        years = [year for year in partition_years(conn, table) if year < before_year]
+        if years:
+            with conn.cursor() as cur:
+                cur.execute(f"ALTER TABLE {table} DROP PARTITION "
+                            + ", ".join(f"p{year}" for year in years))
+            dropped += [f"{table}.p{year}" for year in years]
+            dropped_years.update(years)
+    if dropped:
+        try:
+            # Only the buckets of the years dropped: later ones up to
+            # before_year may still count archived reports
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM Ecosystem_Threat_Rollup WHERE Bucket_Start < %s",
+                            (f"{max(dropped_years) + 1}-01-01",))
+            conn.commit()
+        except pymysql.Error:
+            conn.rollback()
+            raise
+        finally:
+            ops.invalidate(*REPORT_TABLES)
+    return dropped
+
+
+def retention_status(conn):
+    """Rows per tier: the hot reports, then each archive partition."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT COUNT(*) AS Reports, MIN(Timestamp) AS Oldest, "
+                    "MAX(Timestamp) AS Newest FROM Report_Meta")
+        hot = cur.fetchone()
+    rows = [{"Tier": "hot", "Partition": "Report_Meta", "Approx_Rows": hot["Reports"],
+             "Oldest": hot["Oldest"], "Newest": hot["Newest"]}]
+    for partition in archive_partitions(conn, "Report_Archive"):
+        rows.append({"Tier": "archive", "Partition": partition["Name"],
+                     "Approx_Rows": partition["Approx_Rows"], "Oldest": None, "Newest": None})
+    return rows
+
+
+# ============================================================
+# MAIN ENTRY POINT
+# ============================================================
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Archive or purge old intelligence reports.")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--status", action="store_true", help="show rows per tier")
+    action.add_argument("--archive", action="store_true",
+                        help="move reports older than the horizon to the archive")
+    action.add_argument("--purge-before", type=int, metavar="YEAR",
+                        help="drop archived reports from before this year")
+    parser.add_argument("--horizon-days", type=int, default=DEFAULT_HORIZON_DAYS,
+                        help="keep this many days of reports in the hot tables")
+    parser.add_argument("--before", help="archive reports before this date instead")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="reports moved per transaction")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    pool = create_pool(pool_size=1)
+    try:
+        with pool.connection() as conn:
+            if args.status:
+                for row in retention_status(conn):
+                    span = f"  {row['Oldest']} .. {row['Newest']}" if row["Oldest"] else ""
+                    print(f"  {row['Tier']:<8} {row['Partition']:<12} "
+                          f"{row['Approx_Rows'] or 0:>12,} rows{span}")
+            elif args.archive:
+                cutoff = args.before or horizon_cutoff(conn, args.horizon_days)
+                archived = archive_reports(
+                    conn, cutoff, args.batch_size,
+                    lambda n: print(f"  … {n:,} reports archived", file=sys.stderr))
+                print(f"✓ Archived {archived:,} reports older than {cutoff}")
+            else:
+                dropped = purge_archive(conn, args.purge_before)
+                print(f"✓ Dropped {len(dropped)} partition(s): {', '.join(dropped) or 'none'}")
+    except (ValueError, pymysql.Error) as e:
+        print(f"✗ Retention failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -11,13 +11,15 @@ CREATE TABLE Soul (
 CREATE TABLE Alliance (
     Alliance_ID INT AUTO_INCREMENT PRIMARY KEY,
     Name VARCHAR(100) NOT NULL,
-    Objective TEXT
+    Objective TEXT,
+    FULLTEXT INDEX ft_alliance_objective (Objective)
 );
 
 CREATE TABLE Clan (
     Clan_ID INT AUTO_INCREMENT PRIMARY KEY,
     Clan_Name VARCHAR(100) NOT NULL,
     Alliance_ID INT,
+    INDEX idx_clan_name (Clan_Name),
     FOREIGN KEY (Alliance_ID) REFERENCES Alliance(Alliance_ID)
         ON DELETE SET NULL
         ON UPDATE CASCADE
@@ -46,6 +48,9 @@ CREATE TABLE Human (
     Weapon_Type VARCHAR(100),
     Soul_ID INT UNIQUE NOT NULL,
     Company_ID INT,
+    INDEX idx_human_company_rank_lname (Company_ID, `Rank`, L_Name),
+    INDEX idx_human_lname (L_Name),
+    INDEX idx_human_company_lname (Company_ID, L_Name),
     FOREIGN KEY (Soul_ID) REFERENCES Soul(Soul_ID)
         ON DELETE CASCADE
         ON UPDATE CASCADE,
@@ -60,6 +65,12 @@ CREATE TABLE Navi (
     Age INT,
     Soul_ID INT UNIQUE NOT NULL,
     Clan_ID INT,
+    -- Copy of Clan.Clan_Name, the first sort key of READ 4 (see section 22)
+    Clan_Sort_Name VARCHAR(100),
+    INDEX idx_navi_clan_age (Clan_ID, Age),
+    INDEX idx_navi_clan_name (Clan_ID, Name),
+    INDEX idx_navi_name (Name),
+    INDEX idx_navi_clan_sort (Clan_Sort_Name, Clan_ID, Name),
     FOREIGN KEY (Soul_ID) REFERENCES Soul(Soul_ID)
         ON DELETE CASCADE
         ON UPDATE CASCADE,
@@ -86,6 +97,7 @@ CREATE TABLE Avatar (
     Total_Linked_Hours INT CHECK (Total_Linked_Hours >= 0),
     PRIMARY KEY (Human_ID, Navi_ID),
     UNIQUE (Navi_ID),
+    INDEX idx_avatar_status_hours (Link_Status, Total_Linked_Hours DESC, Human_ID),
     FOREIGN KEY (Human_ID) REFERENCES Human(Human_ID)
         ON DELETE CASCADE
         ON UPDATE CASCADE,
@@ -101,7 +113,11 @@ CREATE TABLE Partnership (
     Company_ID INT,
     Clan_ID INT,
     Alliance_ID INT NULL,
+    -- Copies of Alliance.Name and Company.Name, READ 6's sort keys (see section 22)
+    Alliance_Sort_Name VARCHAR(100),
+    Company_Sort_Name VARCHAR(150),
     PRIMARY KEY (Company_ID, Clan_ID),
+    INDEX idx_partnership_sort (Alliance_Sort_Name, Company_Sort_Name, Company_ID, Clan_ID),
     FOREIGN KEY (Company_ID) REFERENCES Company(Company_ID)
         ON DELETE CASCADE
         ON UPDATE CASCADE,
@@ -137,7 +153,13 @@ CREATE TABLE Fights_In (
     Clan_ID INT,
     War_ID INT,
     Strength VARCHAR(50),
+    -- Parsed Strength so aggregates and range filters avoid a per-row CAST
+    Strength_Value SMALLINT UNSIGNED AS (
+        CASE WHEN TRIM(Strength) REGEXP '^[0-9]{1,5}$'
+                  AND CAST(TRIM(Strength) AS UNSIGNED) <= 65535
+             THEN CAST(TRIM(Strength) AS UNSIGNED) END) STORED,
     PRIMARY KEY (Clan_ID, War_ID),
+    INDEX idx_fights_clan_strength (Clan_ID, Strength_Value),
     FOREIGN KEY (Clan_ID) REFERENCES Clan(Clan_ID)
         ON DELETE CASCADE
         ON UPDATE CASCADE,
@@ -155,6 +177,8 @@ CREATE TABLE Aetherium_Site (
     Status VARCHAR(50) CHECK (Status IN ('Unclaimed', 'Claimed', 'Depleted')),
     Alliance_ID INT,
     Eco_ID INT,
+    INDEX idx_site_alliance_status_qty (Alliance_ID, Status, Resource_Quantity),
+    INDEX idx_site_eco_qty (Eco_ID, Resource_Quantity),
     FOREIGN KEY (Alliance_ID) REFERENCES Alliance(Alliance_ID)
         ON DELETE SET NULL
         ON UPDATE CASCADE,
@@ -195,7 +219,8 @@ CREATE TABLE Ecosystem_Flora (
 -- =========================================================
 CREATE TABLE Report_Meta (
     Report_ID INT AUTO_INCREMENT PRIMARY KEY,
-    Timestamp DATETIME NOT NULL
+    Timestamp DATETIME NOT NULL,
+    INDEX idx_report_meta_timestamp (Timestamp)
 );
 
 -- =========================================================
@@ -206,7 +231,14 @@ CREATE TABLE Report_Observation (
     Threat_Description TEXT,
     Resource_Estimate_Change INT,
     Danger_Level_Observed VARCHAR(50),
+    -- Parsed Danger_Level_Observed (1-10), indexed for range filters
+    Danger_Level TINYINT UNSIGNED AS (
+        CASE WHEN TRIM(Danger_Level_Observed) REGEXP '^[0-9]{1,3}$'
+                  AND CAST(TRIM(Danger_Level_Observed) AS UNSIGNED) <= 255
+             THEN CAST(TRIM(Danger_Level_Observed) AS UNSIGNED) END) STORED,
     Alliance_ID INT,
+    INDEX idx_observation_danger (Danger_Level, Resource_Estimate_Change),
+    FULLTEXT INDEX ft_observation_threat (Threat_Description),
     FOREIGN KEY (Report_ID) REFERENCES Report_Meta(Report_ID)
         ON DELETE CASCADE
         ON UPDATE CASCADE,
@@ -228,4 +260,328 @@ CREATE TABLE Report_Site (
     FOREIGN KEY (Report_ID) REFERENCES Report_Meta(Report_ID)
         ON DELETE CASCADE
         ON UPDATE CASCADE
-);
\ No newline at end of file
+);
+
+-- =========================================================
+-- 19. ALLIANCE RESOURCE SUMMARY (maintained by triggers)
+-- =========================================================
+-- One row per alliance with its claimed-site totals, kept current by the
+-- triggers below so READ 5 does not aggregate Aetherium_Site on every call.
+CREATE TABLE Alliance_Resource_Summary (
+    Alliance_ID INT PRIMARY KEY,
+    Sites_Controlled INT NOT NULL DEFAULT 0,
+    Total_Resources BIGINT NOT NULL DEFAULT 0,
+    -- Claimed sites with a known Resource_Quantity (denominator of the average)
+    Quantity_Sites INT NOT NULL DEFAULT 0,
+    INDEX idx_summary_total_resources (Total_Resources),
+    FOREIGN KEY (Alliance_ID) REFERENCES Alliance(Alliance_ID)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+);
+
+CREATE TRIGGER trg_alliance_summary_insert AFTER INSERT ON Alliance
+FOR EACH ROW
+    INSERT INTO Alliance_Resource_Summary (Alliance_ID) VALUES (NEW.Alliance_ID);
+
+CREATE TRIGGER trg_site_summary_insert AFTER INSERT ON Aetherium_Site
+FOR EACH ROW
+    UPDATE Alliance_Resource_Summary
+    SET Sites_Controlled = Sites_Controlled + 1,
+        Total_Resources = Total_Resources + COALESCE(NEW.Resource_Quantity, 0),
+        Quantity_Sites = Quantity_Sites + (NEW.Resource_Quantity IS NOT NULL)
+    WHERE Alliance_ID = NEW.Alliance_ID AND NEW.Status <=> 'Claimed';
+
+CREATE TRIGGER trg_site_summary_update AFTER UPDATE ON Aetherium_Site
+FOR EACH ROW
+    UPDATE Alliance_Resource_Summary
+    SET Sites_Controlled = Sites_Controlled
+            - (Alliance_ID <=> OLD.Alliance_ID AND OLD.Status <=> 'Claimed')
+            + (Alliance_ID <=> NEW.Alliance_ID AND NEW.Status <=> 'Claimed'),
+        Total_Resources = Total_Resources
+            - IF(Alliance_ID <=> OLD.Alliance_ID AND OLD.Status <=> 'Claimed',
+                 COALESCE(OLD.Resource_Quantity, 0), 0)
+            + IF(Alliance_ID <=> NEW.Alliance_ID AND NEW.Status <=> 'Claimed',
+                 COALESCE(NEW.Resource_Quantity, 0), 0),
+        Quantity_Sites = Quantity_Sites
+            - (Alliance_ID <=> OLD.Alliance_ID AND OLD.Status <=> 'Claimed'
+               AND OLD.Resource_Quantity IS NOT NULL)
+            + (Alliance_ID <=> NEW.Alliance_ID AND NEW.Status <=> 'Claimed'
+               AND NEW.Resource_Quantity IS NOT NULL)
+    WHERE Alliance_ID IN (OLD.Alliance_ID, NEW.Alliance_ID);
+
+CREATE TRIGGER trg_site_summary_delete AFTER DELETE ON Aetherium_Site
+FOR EACH ROW
+    UPDATE Alliance_Resource_Summary
+    SET Sites_Controlled = Sites_Controlled - 1,
+        Total_Resources = Total_Resources - COALESCE(OLD.Resource_Quantity, 0),
+        Quantity_Sites = Quantity_Sites - (OLD.Resource_Quantity IS NOT NULL)
+    WHERE Alliance_ID = OLD.Alliance_ID AND OLD.Status <=> 'Claimed';
+
+-- =========================================================
+-- 20. ECOSYSTEM THREAT ROLLUP (maintained by triggers)
+-- =========================================================
+-- One row per ecosystem and hour of Report_Meta.Timestamp with the sums
+-- READ 10 needs, so time-windowed threat analysis reads only the buckets in
+-- the window. Cascaded deletes do not fire triggers; see summaries.py.
+CREATE TABLE Ecosystem_Threat_Rollup (
+    Eco_ID INT NOT NULL,
+    Bucket_Start DATETIME NOT NULL,
+    -- Distinct reports filed against the ecosystem in this hour
+    Reports INT NOT NULL DEFAULT 0,
+    -- Sums over report x site rows, as READ 10 aggregates them
+    Danger_Sum BIGINT NOT NULL DEFAULT 0,
+    Danger_Count INT NOT NULL DEFAULT 0,
+    Resource_Change BIGINT NOT NULL DEFAULT 0,
+    Resource_Count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (Eco_ID, Bucket_Start),
+    INDEX idx_threat_rollup_bucket (Bucket_Start),
+    FOREIGN KEY (Eco_ID) REFERENCES Ecosystem(Eco_ID)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+);
+
+-- A site link arrives: one more report x site row; a new report for the
+-- ecosystem when it is the report's first site there
+CREATE TRIGGER trg_report_site_threat_insert AFTER INSERT ON Report_Site
+FOR EACH ROW
+    INSERT INTO Ecosystem_Threat_Rollup
+        (Eco_ID, Bucket_Start, Reports, Danger_Sum, Danger_Count,
+         Resource_Change, Resource_Count)
+    SELECT * FROM (
+        SELECT ast.Eco_ID,
+               DATE_FORMAT(rm.Timestamp, '%Y-%m-%d %H:00:00') as Bucket,
+               (SELECT COUNT(*) FROM Report_Site rs
+                JOIN Aetherium_Site s ON rs.Site_ID = s.Site_ID
+                WHERE rs.Report_ID = NEW.Report_ID AND s.Eco_ID = ast.Eco_ID) = 1 as New_Report,
+               COALESCE(ro.Danger_Level, 0) as Danger,
+               ro.Danger_Level IS NOT NULL as Has_Danger,
+               COALESCE(ro.Resource_Estimate_Change, 0) as Change_Value,
+               ro.Resource_Estimate_Change IS NOT NULL as Has_Change
+        FROM Aetherium_Site ast
+        JOIN Report_Meta rm ON rm.Report_ID = NEW.Report_ID
+        JOIN Report_Observation ro ON ro.Report_ID = NEW.Report_ID
+        WHERE ast.Site_ID = NEW.Site_ID
+    ) d
+    ON DUPLICATE KEY UPDATE
+        Reports = Reports + d.New_Report,
+        Danger_Sum = Danger_Sum + d.Danger,
+        Danger_Count = Danger_Count + d.Has_Danger,
+        Resource_Change = Resource_Change + d.Change_Value,
+        Resource_Count = Resource_Count + d.Has_Change;
+
+-- A site link goes: take back its row; the report leaves the ecosystem
+-- when no other site there still links it
+CREATE TRIGGER trg_report_site_threat_delete AFTER DELETE ON Report_Site
+FOR EACH ROW
+    UPDATE Ecosystem_Threat_Rollup r
+    JOIN Aetherium_Site ast ON ast.Site_ID = OLD.Site_ID AND r.Eco_ID = ast.Eco_ID
+    JOIN Report_Meta rm ON rm.Report_ID = OLD.Report_ID
+        AND r.Bucket_Start = DATE_FORMAT(rm.Timestamp, '%Y-%m-%d %H:00:00')
+    JOIN Report_Observation ro ON ro.Report_ID = OLD.Report_ID
+    SET r.Reports = r.Reports - NOT EXISTS (
+            SELECT 1 FROM Report_Site rs
+            JOIN Aetherium_Site s ON rs.Site_ID = s.Site_ID
+            WHERE rs.Report_ID = OLD.Report_ID AND s.Eco_ID = ast.Eco_ID),
+        r.Danger_Sum = r.Danger_Sum - COALESCE(ro.Danger_Level, 0),
+        r.Danger_Count = r.Danger_Count - (ro.Danger_Level IS NOT NULL),
+        r.Resource_Change = r.Resource_Change - COALESCE(ro.Resource_Estimate_Change, 0),
+        r.Resource_Count = r.Resource_Count - (ro.Resource_Estimate_Change IS NOT NULL);
+
+-- An observation arrives: one report per ecosystem its sites are in, one
+-- row per linked site
+CREATE TRIGGER trg_observation_threat_insert AFTER INSERT ON Report_Observation
+FOR EACH ROW
+    INSERT INTO Ecosystem_Threat_Rollup
+        (Eco_ID, Bucket_Start, Reports, Danger_Sum, Danger_Count,
+         Resource_Change, Resource_Count)
+    SELECT * FROM (
+        SELECT ast.Eco_ID,
+               DATE_FORMAT(rm.Timestamp, '%Y-%m-%d %H:00:00') as Bucket,
+               1 as New_Report,
+               COUNT(*) * COALESCE(NEW.Danger_Level, 0) as Danger,
+               COUNT(*) * (NEW.Danger_Level IS NOT NULL) as Has_Danger,
+               COUNT(*) * COALESCE(NEW.Resource_Estimate_Change, 0) as Change_Value,
+               COUNT(*) * (NEW.Resource_Estimate_Change IS NOT NULL) as Has_Change
+        FROM Report_Site rs
+        JOIN Aetherium_Site ast ON rs.Site_ID = ast.Site_ID
+        JOIN Report_Meta rm ON rm.Report_ID = NEW.Report_ID
+        WHERE rs.Report_ID = NEW.Report_ID
+        GROUP BY ast.Eco_ID, rm.Timestamp
+    ) d
+    ON DUPLICATE KEY UPDATE
+        Reports = Reports + d.New_Report,
+        Danger_Sum = Danger_Sum + d.Danger,
+        Danger_Count = Danger_Count + d.Has_Danger,
+        Resource_Change = Resource_Change + d.Change_Value,
+        Resource_Count = Resource_Count + d.Has_Change;
+
+-- An observation changes: replace its old values with the new ones
+CREATE TRIGGER trg_observation_threat_update AFTER UPDATE ON Report_Observation
+FOR EACH ROW
+    UPDATE Ecosystem_Threat_Rollup r
+    JOIN (SELECT ast.Eco_ID,
+                 DATE_FORMAT(rm.Timestamp, '%Y-%m-%d %H:00:00') as Bucket,
+                 COUNT(*) as Site_Rows
+          FROM Report_Site rs
+          JOIN Aetherium_Site ast ON rs.Site_ID = ast.Site_ID
+          JOIN Report_Meta rm ON rm.Report_ID = NEW.Report_ID
+          WHERE rs.Report_ID = NEW.Report_ID
+          GROUP BY ast.Eco_ID, rm.Timestamp) d
+        ON r.Eco_ID = d.Eco_ID AND r.Bucket_Start = d.Bucket
+    SET r.Danger_Sum = r.Danger_Sum + d.Site_Rows
+            * (COALESCE(NEW.Danger_Level, 0) - COALESCE(OLD.Danger_Level, 0)),
+        r.Danger_Count = r.Danger_Count + d.Site_Rows
+            * ((NEW.Danger_Level IS NOT NULL) - (OLD.Danger_Level IS NOT NULL)),
+        r.Resource_Change = r.Resource_Change + d.Site_Rows
+            * (COALESCE(NEW.Resource_Estimate_Change, 0)
+               - COALESCE(OLD.Resource_Estimate_Change, 0)),
+        r.Resource_Count = r.Resource_Count + d.Site_Rows
+            * ((NEW.Resource_Estimate_Change IS NOT NULL)
+               - (OLD.Resource_Estimate_Change IS NOT NULL));
+
+-- An observation goes: the report leaves every ecosystem it was counted in
+CREATE TRIGGER trg_observation_threat_delete AFTER DELETE ON Report_Observation
+FOR EACH ROW
+    UPDATE Ecosystem_Threat_Rollup r
+    JOIN (SELECT ast.Eco_ID,
+                 DATE_FORMAT(rm.Timestamp, '%Y-%m-%d %H:00:00') as Bucket,
+                 COUNT(*) as Site_Rows
+          FROM Report_Site rs
+          JOIN Aetherium_Site ast ON rs.Site_ID = ast.Site_ID
+          JOIN Report_Meta rm ON rm.Report_ID = OLD.Report_ID
+          WHERE rs.Report_ID = OLD.Report_ID
+          GROUP BY ast.Eco_ID, rm.Timestamp) d
+        ON r.Eco_ID = d.Eco_ID AND r.Bucket_Start = d.Bucket
+    SET r.Reports = r.Reports - 1,
+        r.Danger_Sum = r.Danger_Sum - d.Site_Rows * COALESCE(OLD.Danger_Level, 0),
+        r.Danger_Count = r.Danger_Count - d.Site_Rows * (OLD.Danger_Level IS NOT NULL),
+        r.Resource_Change = r.Resource_Change
+            - d.Site_Rows * COALESCE(OLD.Resource_Estimate_Change, 0),
+        r.Resource_Count = r.Resource_Count
+            - d.Site_Rows * (OLD.Resource_Estimate_Change IS NOT NULL);
+
+-- =========================================================
+-- 21. REPORT ARCHIVE (see retention.py)
+-- =========================================================
+-- Reports older than the retention horizon, one compressed row per report
+-- plus its site links, partitioned by year of Timestamp. The *_All views
+-- combine the hot and archived reports for reads over all history.
+CREATE TABLE Report_Archive (
+    Report_ID INT NOT NULL,
+    Timestamp DATETIME NOT NULL,
+    -- FALSE when the report had no Report_Observation row
+    Observed BOOLEAN NOT NULL DEFAULT TRUE,
+    Threat_Description TEXT,
+    Resource_Estimate_Change INT,
+    Danger_Level_Observed VARCHAR(50),
+    Danger_Level TINYINT UNSIGNED,
+    Alliance_ID INT,
+    PRIMARY KEY (Report_ID, Timestamp)
+) ROW_FORMAT=COMPRESSED
+PARTITION BY RANGE COLUMNS (Timestamp) (
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+CREATE TABLE Report_Site_Archive (
+    Site_ID INT NOT NULL,
+    Report_ID INT NOT NULL,
+    Timestamp DATETIME NOT NULL,
+    PRIMARY KEY (Site_ID, Report_ID, Timestamp),
+    INDEX idx_site_archive_report (Report_ID)
+) ROW_FORMAT=COMPRESSED
+PARTITION BY RANGE COLUMNS (Timestamp) (
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+CREATE VIEW Report_Meta_All AS
+    SELECT Report_ID, Timestamp FROM Report_Meta
+    UNION ALL
+    SELECT Report_ID, Timestamp FROM Report_Archive;
+
+CREATE VIEW Report_Observation_All AS
+    SELECT Report_ID, Threat_Description, Resource_Estimate_Change,
+           Danger_Level_Observed, Danger_Level, Alliance_ID
+    FROM Report_Observation
+    UNION ALL
+    SELECT Report_ID, Threat_Description, Resource_Estimate_Change,
+           Danger_Level_Observed, Danger_Level, Alliance_ID
+    FROM Report_Archive
+    WHERE Observed;
+
+CREATE VIEW Report_Site_All AS
+    SELECT Site_ID, Report_ID FROM Report_Site
+    UNION ALL
+    SELECT Site_ID, Report_ID FROM Report_Site_Archive;
+
+-- =========================================================
+-- 22. LISTING SORT NAMES (maintained by triggers)
+-- =========================================================
+-- Navi.Clan_Sort_Name and Partnership.Alliance_Sort_Name / Company_Sort_Name
+-- copy the names the paged READ 4 / READ 6 listings sort on, so one index
+-- on the driving table returns each listing in order.
+CREATE TRIGGER trg_navi_sort_insert BEFORE INSERT ON Navi
+FOR EACH ROW
+    SET NEW.Clan_Sort_Name = (SELECT Clan_Name FROM Clan WHERE Clan_ID = NEW.Clan_ID);
+
+-- Only a move to another clan looks the name up; the clan triggers below
+-- set it directly
+CREATE TRIGGER trg_navi_sort_update BEFORE UPDATE ON Navi
+FOR EACH ROW
+    SET NEW.Clan_Sort_Name = IF(NEW.Clan_ID <=> OLD.Clan_ID, NEW.Clan_Sort_Name,
+        (SELECT Clan_Name FROM Clan WHERE Clan_ID = NEW.Clan_ID));
+
+CREATE TRIGGER trg_clan_sort_update AFTER UPDATE ON Clan
+FOR EACH ROW
+    UPDATE Navi SET Clan_Sort_Name = NEW.Clan_Name
+    WHERE Clan_ID = NEW.Clan_ID AND NOT (Clan_Sort_Name <=> NEW.Clan_Name);
+
+CREATE TRIGGER trg_clan_sort_delete BEFORE DELETE ON Clan
+FOR EACH ROW
+    UPDATE Navi SET Clan_Sort_Name = NULL WHERE Clan_ID = OLD.Clan_ID;
+
+CREATE TRIGGER trg_partnership_sort_insert BEFORE INSERT ON Partnership
+FOR EACH ROW
+    SET NEW.Alliance_Sort_Name = (SELECT Name FROM Alliance WHERE Alliance_ID = NEW.Alliance_ID),
+        NEW.Company_Sort_Name = (SELECT Name FROM Company WHERE Company_ID = NEW.Company_ID);
+
+CREATE TRIGGER trg_partnership_sort_update BEFORE UPDATE ON Partnership
+FOR EACH ROW
+    SET NEW.Alliance_Sort_Name = IF(NEW.Alliance_ID <=> OLD.Alliance_ID, NEW.Alliance_Sort_Name,
+            (SELECT Name FROM Alliance WHERE Alliance_ID = NEW.Alliance_ID)),
+        NEW.Company_Sort_Name = IF(NEW.Company_ID <=> OLD.Company_ID, NEW.Company_Sort_Name,
+            (SELECT Name FROM Company WHERE Company_ID = NEW.Company_ID));
+
+CREATE TRIGGER trg_alliance_sort_update AFTER UPDATE ON Alliance
+FOR EACH ROW
+    UPDATE Partnership SET Alliance_Sort_Name = NEW.Name
+    WHERE Alliance_ID = NEW.Alliance_ID AND NOT (Alliance_Sort_Name <=> NEW.Name);
+
+CREATE TRIGGER trg_alliance_sort_delete BEFORE DELETE ON Alliance
+FOR EACH ROW
+    UPDATE Partnership SET Alliance_Sort_Name = NULL WHERE Alliance_ID = OLD.Alliance_ID;
+
+CREATE TRIGGER trg_company_sort_update AFTER UPDATE ON Company
+FOR EACH ROW
+    UPDATE Partnership SET Company_Sort_Name = NEW.Name
+    WHERE Company_ID = NEW.Company_ID AND NOT (Company_Sort_Name <=> NEW.Name);
+
+-- =========================================================
+-- SCHEMA MIGRATIONS
+-- =========================================================
+-- This file already contains every migration in migrations/;
+-- record them so migrate.py has nothing to apply on a fresh install.
+CREATE TABLE Schema_Migration (
+    Version VARCHAR(100) PRIMARY KEY,
+    Applied_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO Schema_Migration (Version) VALUES
+ ('001_workload_indexes'),
+ ('002_numeric_strength_danger'),
+ ('003_keyset_pagination_indexes'),
+ ('004_alliance_resource_summary'),
+ ('005_avatar_typeahead_indexes'),
+ ('006_ecosystem_threat_rollup'),
+ ('007_report_archive'),
+ ('008_fulltext_search'),
+ ('009_listing_sort_names');
@@ -0,0 +1,165 @@
+"""
+Company Proximity Index for Pandora Chronicles Database
+Company coordinates bucketed on a latitude / longitude grid in memory
+
+Companies are filed under the grid cell (cell_degrees square) holding their
+Latitude / Longitude; their coordinates sit in array('d') buffers. A radius
+query visits only the cells overlapping the circle's bounding box and
+computes great-circle distance for the companies in them. A nearest query
+runs radius queries over a doubling radius until k companies are found.
+Companies without coordinates are left out.
+
+refresh(conn) reloads the grid when Company was written through
+operations.invalidate() since it was loaded, or when it is older than
+max_age (writes by other clients), the same way alliance_graph.py does.
+"""
+
+import math
+import threading
+import time
+from array import array
+
+DEFAULT_MAX_AGE = 300
+CELL_DEGREES = 1.0
+
+# Pandora's mean radius (11,447 km across)
+PLANET_RADIUS_KM = 5723.5
+
+COMPANY_TABLES = ("Company",)
+
+
+def great_circle_km(lat1, lon1, lat2, lon2, radius_km=PLANET_RADIUS_KM):
+    """Haversine distance between two points given in degrees."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * radius_km * math.asin(min(1.0, math.sqrt(a)))
+
+
+class CompanyGrid:
+    """Immutable grid of company coordinates answering radius and nearest queries."""
+
+    def __init__(self, rows, cell_degrees=CELL_DEGREES, radius_km=PLANET_RADIUS_KM):
+        """rows: dicts with Company_ID, Name, Latitude, Longitude."""
+        self.cell_degrees = cell_degrees
+        self.radius_km = radius_km
+        self.columns = math.ceil(360 / cell_degrees)
+        self.ids = array("i")
+        self.latitudes = array("d")
+        self.longitudes = array("d")
+        self.names = []
+        self.cells = {}               # (row, column) -> [company index, ...]
+        for r in rows:
+            if r["Latitude"] is None or r["Longitude"] is None:
+                continue
+            lat, lon = float(r["Latitude"]), float(r["Longitude"])
+            self.cells.setdefault(self._cell(lat, lon), []).append(len(self.ids))
+            self.ids.append(r["Company_ID"])
+            self.latitudes.append(lat)
+            self.longitudes.append(lon)
+            self.names.append(r["Name"])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _cell(self, lat, lon):
+        return (math.floor(lat / self.cell_degrees),
+                math.floor((lon + 180) / self.cell_degrees) % self.columns)
+
+    def _candidate_cells(self, lat, lon, radius_km):
+        """Cells overlapping the bounding box of the circle."""
+        angle = radius_km / self.radius_km
+        south, north = lat - math.degrees(angle), lat + math.degrees(angle)
+        if south <= -90 or north >= 90 or angle >= math.pi / 2:
+            # The circle covers a pole: every longitude
+            columns = range(self.columns)
+        else:
+            span = math.degrees(math.asin(min(1.0, math.sin(angle) / math.cos(math.radians(lat)))))
+            first = math.floor((lon - span + 180) / self.cell_degrees)
+            last = math.floor((lon + span + 180) / self.cell_degrees)
+            columns = (range(self.columns) if last - first + 1 >= self.columns
+                       else [c % self.columns for c in range(first, last + 1)])
+        rows = range(math.floor(max(south, -90) / self.cell_degrees),
+                     math.floor(min(north, 90) / self.cell_degrees) + 1)
+        return [(row, column) for row in rows for column in columns]
+
+    def within(self, lat, lon, radius_km):
+        """[(distance_km, company index), ...] within radius_km of the point, nearest first."""
+        found = []
+        for cell in self._candidate_cells(lat, lon, radius_km):
+            for i in self.cells.get(cell, ()):
+                distance = great_circle_km(lat, lon, self.latitudes[i], self.longitudes[i],
+                                           self.radius_km)
+                if distance <= radius_km:
+                    found.append((distance, i))
+        found.sort()
+        return found
+
+    def nearest(self, lat, lon, k):
+        """The k [(distance_km, company index), ...] nearest the point, nearest first."""
+        radius = self.cell_degrees * math.radians(1) * self.radius_km
+        while True:
+            found = self.within(lat, lon, radius)
+            if len(found) >= k or radius >= math.pi * self.radius_km:
+                return found[:k]
+            radius *= 2
+
+
+# ============================================================
+# COMPANY LOCATOR
+# ============================================================
+def load_grid(conn, cell_degrees=CELL_DEGREES):
+    """CompanyGrid of every company with coordinates."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT Company_ID, Name, Latitude, Longitude FROM Company "
+                    "ORDER BY Company_ID")
+        return CompanyGrid(cur.fetchall(), cell_degrees)
+
+
+class CompanyLocator:
+    """
+    The company grid, reloaded on demand by refresh(). A reload swaps in a
+    new grid, so queries running in other threads never see a half-built one.
+    """
+
+    def __init__(self, cache=None, max_age=DEFAULT_MAX_AGE, cell_degrees=CELL_DEGREES):
+        self.cache = cache                # QueryCache whose invalidations mark writes
+        self.max_age = max_age
+        self.cell_degrees = cell_degrees
+        self._loaded = None               # (grid, versions, loaded_at)
+        self._lock = threading.Lock()
+        self.reloads = 0
+
+    def _versions(self):
+        return self.cache.versions(COMPANY_TABLES) if self.cache is not None else None
+
+    def stale(self):
+        return (self._loaded is None or self._loaded[1] != self._versions()
+                or time.monotonic() - self._loaded[2] >= self.max_age)
+
+    def refresh(self, conn, force=False):
+        """Reloads the grid if stale (always with force). Returns True when it reloaded."""
+        with self._lock:
+            if not (force or self.stale()):
+                return False
+            # Taken before loading: a write racing the load marks it stale again
+            versions = self._versions()
+            grid = load_grid(conn, self.cell_degrees)
+            conn.commit()                 # end the read snapshot
+            self._loaded = (grid, versions, time.monotonic())
+            self.reloads += 1
+            return True
+
+    @property
+    def grid(self):
+        """The CompanyGrid as of the last refresh."""
+        return self._loaded[0]
+
+    def stats(self):
+        """Size and age of the loaded grid."""
+        if self._loaded is None:
+            return {}
+        grid, _, loaded_at = self._loaded
+        return {"companies": len(grid), "cells": len(grid.cells),
+                "cell_degrees": grid.cell_degrees,
+                "age_seconds": round(time.monotonic() - loaded_at, 1)}
@@ -0,0 +1,258 @@
+"""
+Streaming SQL Script Loader for Pandora Chronicles Database
+Splits and executes .sql files (schema.sql, populate.sql, generated dumps)
+
+The tokenizer reads the script line by line and tracks quotes, comments
+and the mysql client's DELIMITER command, so a ';' inside a string or a
+trigger body never ends a statement. Each line is scanned once with regular
+expressions and statements are assembled from slices, so the cost is linear
+in the file size and memory is bounded by the longest statement.
+
+On a connection opened with CLIENT.MULTI_STATEMENTS, statements are sent in
+batches of up to max_batch_bytes per round trip; otherwise one at a time.
+
+Usage:
+    python sql_script.py schema.sql populate.sql
+    python sql_script.py big.sql --batch-bytes 4000000
+"""
+
+import argparse
+import re
+import sys
+import time
+
+import pymysql
+from pymysql.constants import CLIENT
+
+from db_pool import ConnectionPool, load_db_config
+
+DEFAULT_BATCH_BYTES = 1_000_000
+
+# Rest of a quoted token up to and including its closing quote; a backslash
+# escapes the next character and a doubled quote simply reopens the string.
+_STRING_END = {
+    "'": re.compile(r"[^'\\]*(?:\\.[^'\\]*)*'", re.S),
+    '"': re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.S),
+    "`": re.compile(r"[^`]*`"),
+}
+_DELIMITER_COMMAND = re.compile(r"\s*delimiter\s+(\S+)", re.I)
+
+
+def _scanner(delimiter):
+    """
+    Returns (plain, token) patterns for a delimiter. plain consumes ordinary
+    text and complete string literals in one match; token recognises what
+    stopped it. '-- ' needs trailing whitespace in MySQL, and '/*!' / '/*+'
+    comments are executable, so they are kept.
+    """
+    starts = {"'": [""], '"': [""], "`": [""], "#": [""],
+              "-": [r"-(?:\s|$)"], "/": [r"\*"]}
+    starts.setdefault(delimiter[0], []).append(re.escape(delimiter[1:]))
+    alternatives = ["[^" + "".join(re.escape(c) for c in starts) + "]+"]
+    alternatives += [f"{q}{pattern.pattern}" for q, pattern in _STRING_END.items()]
+    for char, tails in starts.items():
+        if "" not in tails:
+            alternatives.append(f"{re.escape(char)}(?!{'|'.join(tails)})")
+    plain = re.compile("(?:" + "|".join(alternatives) + ")*", re.S)
+    token = re.compile(r"""['"`#]|--|/\*[!+]?|""" + re.escape(delimiter))
+    return plain, token
+
+
+def iter_statements(lines):
+    """
+    Yields the statements of a script given as an iterable of lines (an open
+    file works), without their delimiter and with comments removed.
+    """
+    delimiter = ";"
+    plain, tokens = _scanner(delimiter)
+    parts = []              # slices of the statement being assembled
+    blank = True            # parts hold nothing but whitespace so far
+    state = None            # None, a quote character, or '/*' inside a comment
+    keep_comment = False    # inside a /*! ... */ executable comment
+
+    for line in lines:
+        if state is None and blank:
+            command = _DELIMITER_COMMAND.match(line)
+            if command:
+                delimiter = command.group(1)
+                plain, tokens = _scanner(delimiter)
+                parts = []
+                continue
+
+        pos = 0
+        end = len(line)
+        while pos < end:
+            if state in _STRING_END:
+                match = _STRING_END[state].match(line, pos)
+                if not match:
+                    parts.append(line[pos:])
+                    break
+                parts.append(line[pos:match.end()])
+                pos = match.end()
+                state = None
+            elif state == "/*":
+                close = line.find("*/", pos)
+                if close < 0:
+                    if keep_comment:
+                        parts.append(line[pos:])
+                    break
+                if keep_comment:
+                    parts.append(line[pos:close + 2])
+                else:
+                    parts.append(" ")
+                pos = close + 2
+                state = None
+            else:
+                run = plain.match(line, pos).end()
+                parts.append(line[pos:run])
+                if run == end:
+                    break
+                pos = run
+                match = tokens.match(line, pos)
+                token = match.group()
+                if token in _STRING_END:
+                    # A string that continues on the next line
+                    parts.append(token)
+                    state = token
+                    pos = match.end()
+                elif token in ("--", "#"):
+                    parts.append("\n")
+                    break
+                elif token.startswith("/*"):
+                    keep_comment = token != "/*"
+                    if keep_comment:
+                        parts.append(token)
+                    state = "/*"
+                    pos = match.end()
+                else:
+                    statement = "".join(parts).strip()
+                    if statement:
+                        yield statement
+                    parts = []
+                    blank = True
+                    pos = match.end()
+
+        # Drop whitespace between statements so it never piles up in parts
+        if blank:
+            if "".join(parts).strip():
+                blank = False
+            else:
+                parts = []
+
+    statement = "".join(parts).strip()
+    if statement:
+        yield statement
+
+
+def split_statements(script):
+    """Splits a script held in a string; see iter_statements."""
+    return list(iter_statements(script.splitlines(keepends=True)))
+
+
+def batch_statements(statements, max_batch_bytes=DEFAULT_BATCH_BYTES):
+    """Groups statements into lists of roughly max_batch_bytes of SQL."""
+    batch = []
+    size = 0
+    for statement in statements:
+        if batch and size + len(statement) > max_batch_bytes:
+            yield batch
+            batch = []
+            size = 0
+        batch.append(statement)
+        size += len(statement) + 2
+    if batch:
+        yield batch
+
+
+def _execute_batch(cur, batch):
+    """
+    Runs a batch as one multi-statement query. Returns how many statements
+    succeeded and the error that stopped the batch (or None); the server
+    does not run anything after a failing statement.
+    """
+    done = 0
+    try:
+        cur.execute(";\n".join(batch))
+        done = 1
+        while cur.nextset():
+            done += 1
+    except pymysql.Error as e:
+        return done, e
+    return done, None
+
+
+def execute_script(conn, lines, max_batch_bytes=DEFAULT_BATCH_BYTES, on_error=None):
+    """
+    Executes every statement of a script and commits. on_error(statement,
+    error) is called for a failing statement and execution continues after
+    it; without on_error the error is raised. Returns (executed, failed).
+    """
+    multi = bool(getattr(conn, "client_flag", 0) & CLIENT.MULTI_STATEMENTS)
+    executed = 0
+    failed = 0
+    with conn.cursor() as cur:
+        for batch in batch_statements(iter_statements(lines),
+                                      max_batch_bytes if multi else 0):
+            while batch:
+                if multi:
+                    done, error = _execute_batch(cur, batch)
+                else:
+                    done, error = 1, None
+                    try:
+                        cur.execute(batch[0])
+                    except pymysql.Error as e:
+                        done, error = 0, e
+                executed += done
+                if error is None:
+                    break
+                failed += 1
+                if on_error is None:
+                    raise error
+                on_error(batch[done], error)
+                batch = batch[done + 1:]
+    conn.commit()
+    return executed, failed
+
+
+def execute_file(conn, path, max_batch_bytes=DEFAULT_BATCH_BYTES, on_error=None):
+    """Streams a .sql file into execute_script."""
+    with open(path, encoding="utf-8") as f:
+        return execute_script(conn, f, max_batch_bytes, on_error)
+
+
+# ============================================================
+# MAIN ENTRY POINT
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Execute SQL script files.")
+    parser.add_argument("paths", nargs="+", metavar="FILE")
+    parser.add_argument("--batch-bytes", type=int, default=DEFAULT_BATCH_BYTES,
+                        help="SQL bytes sent per round trip")
+    parser.add_argument("--keep-going", action="store_true",
+                        help="report failing statements and continue")
+    args = parser.parse_args(argv)
+
+    def report(statement, error):
+        print(f"  ✗ {error.args[-1]}\n    {statement[:100]}", file=sys.stderr)
+
+    config = load_db_config()
+    config["pool_size"] = 1
+    pool = ConnectionPool(config, client_flag=CLIENT.MULTI_STATEMENTS)
+    try:
+        with pool.connection() as conn:
+            for path in args.paths:
+                started = time.perf_counter()
+                executed, failed = execute_file(conn, path, args.batch_bytes,
+                                                report if args.keep_going else None)
+                elapsed = time.perf_counter() - started
+                print(f"✓ {path}: {executed:,} statements in {elapsed:.1f}s"
+                      + (f", {failed} failed" if failed else ""))
+    except (OSError, pymysql.Error) as e:
+        print(f"✗ {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
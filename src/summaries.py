@@ -0,0 +1,191 @@
+"""
+Maintained Summary Tables for Pandora Chronicles Database
+Drift checks and full rebuilds for tables kept current by triggers
+
+Usage:
+    python summaries.py --check      # report rows that disagree with the base tables
+    python summaries.py --rebuild    # recompute every summary from scratch
+"""
+
+import argparse
+import sys
+
+import pymysql
+
+from db_pool import create_pool
+
+# ============================================================
+# ALLIANCE RESOURCE SUMMARY
+# ============================================================
+# Recomputes what the triggers on Alliance / Aetherium_Site maintain
+ALLIANCE_SUMMARY_SOURCE_SQL = """
+    SELECT a.Alliance_ID,
+           COUNT(ast.Site_ID) as Sites_Controlled,
+           COALESCE(SUM(ast.Resource_Quantity), 0) as Total_Resources,
+           COUNT(ast.Resource_Quantity) as Quantity_Sites
+    FROM Alliance a
+    LEFT JOIN Aetherium_Site ast ON a.Alliance_ID = ast.Alliance_ID
+        AND ast.Status = 'Claimed'
+    GROUP BY a.Alliance_ID
+"""
+
+ALLIANCE_SUMMARY_DRIFT_SQL = f"""
+    SELECT src.Alliance_ID,
+           s.Sites_Controlled, src.Sites_Controlled as Expected_Sites,
+           s.Total_Resources, src.Total_Resources as Expected_Resources,
+           s.Quantity_Sites, src.Quantity_Sites as Expected_Quantity_Sites
+    FROM ({ALLIANCE_SUMMARY_SOURCE_SQL}) src
+    LEFT JOIN Alliance_Resource_Summary s ON s.Alliance_ID = src.Alliance_ID
+    WHERE NOT (s.Sites_Controlled <=> src.Sites_Controlled)
+       OR NOT (s.Total_Resources <=> src.Total_Resources)
+       OR NOT (s.Quantity_Sites <=> src.Quantity_Sites)
+"""
+
+
+def check_alliance_summary(conn):
+    """Returns the alliances whose summary row is missing or out of date."""
+    with conn.cursor() as cur:
+        cur.execute(ALLIANCE_SUMMARY_DRIFT_SQL)
+        return cur.fetchall()
+
+
+def rebuild_alliance_summary(conn):
+    """
+    Recomputes Alliance_Resource_Summary in one transaction.
+    Returns the number of summary rows written.
+    """
+    try:
+        with conn.cursor() as cur:
+            # Lock the source rows so concurrent site writes wait for the rebuild
+            cur.execute("SELECT COUNT(*) AS cnt FROM Aetherium_Site FOR SHARE")
+            cur.execute("DELETE FROM Alliance_Resource_Summary")
+            cur.execute(f"""
+                INSERT INTO Alliance_Resource_Summary
+                    (Alliance_ID, Sites_Controlled, Total_Resources, Quantity_Sites)
+                {ALLIANCE_SUMMARY_SOURCE_SQL}
+            """)
+            written = cur.rowcount
+        conn.commit()
+        return written
+    except pymysql.Error:
+        conn.rollback()
+        raise
+
+
+# ============================================================
+# ECOSYSTEM THREAT ROLLUP
+# ============================================================
+# Recomputes what the triggers on Report_Site / Report_Observation maintain;
+# archived reports stay in the rollup, so the source covers both tiers
+THREAT_ROLLUP_SOURCE_SQL = """
+    SELECT ast.Eco_ID,
+           DATE_FORMAT(rm.Timestamp, '%Y-%m-%d %H:00:00') as Bucket_Start,
+           COUNT(DISTINCT ro.Report_ID) as Reports,
+           COALESCE(SUM(ro.Danger_Level), 0) as Danger_Sum,
+           COUNT(ro.Danger_Level) as Danger_Count,
+           COALESCE(SUM(ro.Resource_Estimate_Change), 0) as Resource_Change,
+           COUNT(ro.Resource_Estimate_Change) as Resource_Count
+    FROM Report_Site_All rs
+    JOIN Aetherium_Site ast ON rs.Site_ID = ast.Site_ID
+    JOIN Report_Meta_All rm ON rs.Report_ID = rm.Report_ID
+    JOIN Report_Observation_All ro ON rs.Report_ID = ro.Report_ID
+    GROUP BY ast.Eco_ID, DATE_FORMAT(rm.Timestamp, '%Y-%m-%d %H:00:00')
+"""
+
+THREAT_ROLLUP_COLUMNS = ("Reports", "Danger_Sum", "Danger_Count",
+                         "Resource_Change", "Resource_Count")
+
+# Buckets whose counters differ from the base tables, in either direction;
+# emptied buckets (all zero) left behind by deletes are not drift
+THREAT_ROLLUP_DRIFT_SQL = f"""
+    SELECT src.Eco_ID, src.Bucket_Start,
+           r.Reports, src.Reports as Expected_Reports,
+           r.Danger_Sum, src.Danger_Sum as Expected_Danger_Sum
+    FROM ({THREAT_ROLLUP_SOURCE_SQL}) src
+    LEFT JOIN Ecosystem_Threat_Rollup r
+        ON r.Eco_ID = src.Eco_ID AND r.Bucket_Start = src.Bucket_Start
+    WHERE {" OR ".join(f"NOT (r.{c} <=> src.{c})" for c in THREAT_ROLLUP_COLUMNS)}
+    UNION ALL
+    SELECT r.Eco_ID, r.Bucket_Start, r.Reports, 0, r.Danger_Sum, 0
+    FROM Ecosystem_Threat_Rollup r
+    LEFT JOIN ({THREAT_ROLLUP_SOURCE_SQL}) src
+        ON r.Eco_ID = src.Eco_ID AND r.Bucket_Start = src.Bucket_Start
+    WHERE src.Eco_ID IS NULL
+      AND ({" OR ".join(f"r.{c} <> 0" for c in THREAT_ROLLUP_COLUMNS)})
+"""
+
+
+def check_threat_rollup(conn):
+    """Returns the (ecosystem, hour) buckets that are missing or out of date."""
+    with conn.cursor() as cur:
+        cur.execute(THREAT_ROLLUP_DRIFT_SQL)
+        return cur.fetchall()
+
+
+def rebuild_threat_rollup(conn):
+    """
+    Recomputes Ecosystem_Threat_Rollup in one transaction.
+    Returns the number of buckets written.
+    """
+    try:
+        with conn.cursor() as cur:
+            # Lock the source rows so concurrent report writes wait for the rebuild
+            cur.execute("SELECT COUNT(*) AS cnt FROM Report_Site FOR SHARE")
+            cur.execute("SELECT COUNT(*) AS cnt FROM Report_Observation FOR SHARE")
+            cur.execute("DELETE FROM Ecosystem_Threat_Rollup")
+            cur.execute(f"""
+                INSERT INTO Ecosystem_Threat_Rollup
+                    (Eco_ID, Bucket_Start, {", ".join(THREAT_ROLLUP_COLUMNS)})
+                {THREAT_ROLLUP_SOURCE_SQL}
+            """)
+            written = cur.rowcount
+        conn.commit()
+        return written
+    except pymysql.Error:
+        conn.rollback()
+        raise
+
+
+# name -> (check, rebuild)
+SUMMARIES = {
+    "Alliance_Resource_Summary": (check_alliance_summary, rebuild_alliance_summary),
+    "Ecosystem_Threat_Rollup": (check_threat_rollup, rebuild_threat_rollup),
+}
+
+
+# ============================================================
+# MAIN ENTRY POINT
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check or rebuild summary tables.")
+    parser.add_argument("--check", action="store_true", help="report drift only")
+    parser.add_argument("--rebuild", action="store_true", help="recompute all summaries")
+    args = parser.parse_args(argv)
+    if not (args.check or args.rebuild):
+        parser.error("choose --check and/or --rebuild")
+
+    pool = create_pool(pool_size=1)
+    drifted = 0
+    try:
+        with pool.connection() as conn:
+            for name, (check, rebuild) in SUMMARIES.items():
+                if args.check:
+                    rows = check(conn)
+                    drifted += len(rows)
+                    status = "OK" if not rows else f"{len(rows)} drifted row(s)"
+                    print(f"  {name:<30} {status}")
+                if args.rebuild:
+                    written = rebuild(conn)
+                    print(f"✓ Rebuilt {name} ({written} rows)")
+    except pymysql.Error as e:
+        print(f"✗ Database error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        pool.close()
+
+    if drifted and not args.rebuild:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,35 @@ Comprehensive Testing Script for Pandora Chronicles Database
 Tests schema creation, data population, and all 15 operations
 """
 
+import csv
+import gzip
+import io
+import json
+import os
 import pymysql
 import sys
+from pymysql.constants import CLIENT
 from getpass import getpass
 
+from bulk_import import import_records
+from cli import run_batch
+from export import export
+from retention import archive_reports, purge_archive
+from spatial_index import great_circle_km
+from ingest_reports import clean_report, load_batch
+from operations import (alliance_allies, alliance_impact, alliance_opponents, available_humans,
+                        available_navi, companies_within, conflict_path, ecosystem_threats,
+                        invalidate, iter_listing, nearest_companies, reference_list,
+                        search_reports, update_company_ethics)
+from summaries import check_threat_rollup
+from pagination import listing_query
+from queries import (
+    AVATAR_LINKS_LISTING, NAVI_BONDED_ANIMALS_LISTING, COMPANY_CLAN_PARTNERSHIPS_LISTING,
+    WAR_HISTORY_SQL,
+)
+from query_log import PROFILER, ProfiledDictCursor, operation
+from sql_script import execute_file
+
 # Color codes for terminal output
 GREEN = '\033[92m'
 RED = '\033[91m'
@@ -27,7 +52,8 @@ def get_connection(db_name=None):
                 user=user,
                 password=password,
                 database=db_name,
-                cursorclass=pymysql.cursors.DictCursor
+                cursorclass=pymysql.cursors.DictCursor,
+                client_flag=CLIENT.MULTI_STATEMENTS
             )
         else:
             conn = pymysql.connect(
@@ -55,78 +81,11 @@ def test_result(test_name, success, message=""):
 
 def run_sql_file(conn, filename, test_name):
     """Execute SQL file and return success status"""
+    def warn(statement, error):
+        print(f"{YELLOW}  Warning: {str(error)[:100]}{RESET}")
+    
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            sql_content = f.read()
-        
-        cursor = conn.cursor()
-        
-        # Remove comments
-        lines = sql_content.split('\n')
-        cleaned_lines = []
-        for line in lines:
-            # Remove line comments
-            if '--' in line:
-                line = line[:line.index('--')]
-            cleaned_lines.append(line)
-        sql_content = '\n'.join(cleaned_lines)
-        
-        # Split by semicolons (simple approach - execute entire file at once for MySQL)
-        # MySQL can handle multiple statements with cursor.execute() if we use the right approach
-        # Instead, let's use a different method:
-        
-        executed = 0
-        errors = 0
-        
-        # Split on semicolons more carefully
-        statements = []
-        current = ""
-        in_string = False
-        string_char = None
-        
-        i = 0
-        while i < len(sql_content):
-            char = sql_content[i]
-            
-            # Handle string literals
-            if char in ("'", '"') and (i == 0 or sql_content[i-1] != '\\'):
-                if not in_string:
-                    in_string = True
-                    string_char = char
-                elif char == string_char:
-                    in_string = False
-                    string_char = None
-            
-            # Handle semicolons outside strings
-            if char == ';' and not in_string:
-                stmt = current.strip()
-                if stmt and not stmt.startswith('--'):
-                    statements.append(stmt)
-                current = ""
-            else:
-                current += char
-            
-            i += 1
-        
-        # Add last statement if exists
-        if current.strip() and not current.strip().startswith('--'):
-            statements.append(current.strip())
-        
-        # Execute each statement
-        for statement in statements:
-            if not statement or len(statement) < 5:
-                continue
-            try:
-                cursor.execute(statement)
-                executed += 1
-            except Exception as e:
-                errors += 1
-                error_msg = str(e)[:100]
-                print(f"{YELLOW}  Warning: {error_msg}{RESET}")
-        
-        conn.commit()
-        cursor.close()
-        
+        executed, errors = execute_file(conn, filename, on_error=warn)
         if errors > 0:
             return test_result(test_name, True, f"Executed {executed} statements ({errors} warnings)")
         return test_result(test_name, True, f"Executed {executed} statements")
@@ -165,6 +124,38 @@ def test_table_counts(conn):
     else:
         return test_result("Schema: All 18 tables created", True)
 
+def test_workload_indexes(conn):
+    """Verify the secondary indexes used by the READ operations exist"""
+    expected_indexes = [
+        ('Aetherium_Site', 'idx_site_alliance_status_qty'),
+        ('Aetherium_Site', 'idx_site_eco_qty'),
+        ('Human', 'idx_human_company_rank_lname'),
+        ('Navi', 'idx_navi_clan_age'),
+        ('Human', 'idx_human_lname'),
+        ('Human', 'idx_human_company_lname'),
+        ('Navi', 'idx_navi_name'),
+        ('Avatar', 'idx_avatar_status_hours'),
+        ('Report_Meta', 'idx_report_meta_timestamp'),
+        ('Fights_In', 'idx_fights_clan_strength'),
+        ('Report_Observation', 'idx_observation_danger'),
+        ('Report_Observation', 'ft_observation_threat'),
+        ('Alliance', 'ft_alliance_objective'),
+    ]
+    
+    cursor = conn.cursor()
+    missing = []
+    for table, index in expected_indexes:
+        cursor.execute(f"SHOW INDEX FROM {table} WHERE Key_name = %s", (index,))
+        if not cursor.fetchall():
+            missing.append(f"{table}.{index}")
+    cursor.close()
+    
+    if missing:
+        return test_result("Schema: Workload indexes created", False,
+                          f"Missing indexes: {', '.join(missing)}")
+    return test_result("Schema: Workload indexes created", True,
+                      f"{len(expected_indexes)} indexes present")
+
 def test_data_population(conn):
     """Verify data was populated"""
     cursor = conn.cursor()
@@ -266,6 +257,7 @@ def main():
         sys.exit(1)
     
     test_table_counts(conn)
+    test_workload_indexes(conn)
     
     # Step 4: Populate data
     print(f"\n{YELLOW}[STEP 3] Data Population{RESET}")
@@ -359,7 +351,7 @@ def main():
             """SELECT 
                cl.Clan_Name,
                COUNT(DISTINCT fi.War_ID) as Wars_Participated,
-               AVG(CAST(fi.Strength as UNSIGNED)) as Avg_Strength
+               AVG(fi.Strength_Value) as Avg_Strength
                FROM Clan cl
                JOIN Fights_In fi ON cl.Clan_ID = fi.Clan_ID
                GROUP BY cl.Clan_ID, cl.Clan_Name
@@ -393,6 +385,154 @@ def main():
         test_result("READ: Alliance War History (5-table JOIN + GROUP BY)", False,
                    "War table missing (CHECK constraint issue)")
     
+    # READ 8 as shipped (UNION of the two FK lookups) returns exactly the
+    # rows of the OR + GROUP BY form, for every alliance
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT Alliance_ID FROM Alliance")
+        alliance_ids = [row['Alliance_ID'] for row in cursor.fetchall()]
+        mismatched = []
+        for alliance_id in alliance_ids:
+            cursor.execute("""SELECT w.War_ID, w.Casualties, w.Outcome,
+                                     a_attack.Name as Attacking_Alliance,
+                                     a_defend.Name as Defending_Alliance,
+                                     COUNT(DISTINCT fi.Clan_ID) as Clans_Involved
+                              FROM War w
+                              JOIN Alliance a_attack ON w.Attack_Alliance_ID = a_attack.Alliance_ID
+                              JOIN Alliance a_defend ON w.Defense_Alliance_ID = a_defend.Alliance_ID
+                              LEFT JOIN Fights_In fi ON w.War_ID = fi.War_ID
+                              WHERE w.Attack_Alliance_ID = %s OR w.Defense_Alliance_ID = %s
+                              GROUP BY w.War_ID
+                              ORDER BY w.Casualties DESC, w.War_ID""", (alliance_id, alliance_id))
+            expected = cursor.fetchall()
+            cursor.execute(WAR_HISTORY_SQL, (alliance_id, alliance_id))
+            if cursor.fetchall() != expected:
+                mismatched.append(alliance_id)
+        cursor.close()
+        test_result("READ: War history UNION rewrite matches OR filter", not mismatched,
+                    f"{len(alliance_ids)} alliance(s) compared"
+                    + (f", mismatched: {mismatched}" if mismatched else ""))
+    except Exception as e:
+        test_result("READ: War history UNION rewrite matches OR filter", False, str(e))
+    
+    # Alliance graph (CSR, in memory) answers the same as SQL over War,
+    # Clan and Partnership
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""SELECT Attack_Alliance_ID as a, Defense_Alliance_ID as b, COUNT(*) as wars
+                          FROM War
+                          WHERE Attack_Alliance_ID <> Defense_Alliance_ID
+                          GROUP BY Attack_Alliance_ID, Defense_Alliance_ID""")
+        expected_wars = {}
+        for row in cursor.fetchall():
+            for a, b in ((row['a'], row['b']), (row['b'], row['a'])):
+                expected_wars.setdefault(a, {})
+                expected_wars[a][b] = expected_wars[a].get(b, 0) + row['wars']
+        cursor.execute("""WITH members AS (
+                              SELECT Alliance_ID, CONCAT('clan ', Clan_ID) as m FROM Clan
+                              UNION SELECT Alliance_ID, CONCAT('clan ', Clan_ID) FROM Partnership
+                              UNION SELECT Alliance_ID, CONCAT('company ', Company_ID) FROM Partnership)
+                          SELECT DISTINCT x.Alliance_ID as a, y.Alliance_ID as b
+                          FROM members x JOIN members y ON x.m = y.m AND x.Alliance_ID <> y.Alliance_ID""")
+        expected_allies = {}
+        for row in cursor.fetchall():
+            expected_allies.setdefault(row['a'], set()).add(row['b'])
+        cursor.execute("SELECT Alliance_ID FROM Alliance")
+        alliance_ids = [row['Alliance_ID'] for row in cursor.fetchall()]
+        cursor.close()
+        
+        mismatched = []
+        for alliance_id in alliance_ids:
+            opponents = {r['Alliance_ID']: r['Wars'] for r in alliance_opponents(conn, alliance_id)}
+            allies = {r['Alliance_ID'] for r in alliance_allies(conn, alliance_id, 1)}
+            if (opponents != expected_wars.get(alliance_id, {})
+                    or allies != expected_allies.get(alliance_id, set())):
+                mismatched.append(alliance_id)
+        # Every consecutive pair on a conflict path fought each other
+        path = conflict_path(conn, alliance_ids[0], alliance_ids[-1])
+        path_ok = all(step['Alliance_ID'] in expected_wars.get(prev['Alliance_ID'], {})
+                      for prev, step in zip(path, path[1:]))
+        test_result("GRAPH: Allies, opponents and conflict paths match SQL",
+                    not mismatched and path_ok,
+                    f"{len(alliance_ids)} alliance(s), path of {max(len(path) - 1, 0)} war link(s)"
+                    + (f", mismatched: {mismatched}" if mismatched else ""))
+    except Exception as e:
+        test_result("GRAPH: Allies, opponents and conflict paths match SQL", False, str(e))
+    
+    # Company grid index answers the same as a haversine scan of every company
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT Company_ID, Latitude, Longitude FROM Company "
+                       "WHERE Latitude IS NOT NULL AND Longitude IS NOT NULL")
+        companies = cursor.fetchall()
+        cursor.execute("SELECT COUNT(*) as n FROM Staffs")
+        staffed = cursor.fetchone()['n']
+        cursor.close()
+        
+        lat, lon = float(companies[0]['Latitude']), float(companies[0]['Longitude'])
+        scan = sorted((great_circle_km(lat, lon, float(c['Latitude']), float(c['Longitude'])),
+                       c['Company_ID']) for c in companies)
+        within = [r['Company_ID'] for r in companies_within(conn, lat, lon, 500)]
+        nearest = [r['Company_ID'] for r in nearest_companies(conn, lat, lon, 3)]
+        everyone = nearest_companies(conn, lat, lon, len(companies), with_sites=True)
+        site_rows = sum(1 for r in everyone if r['Site_ID'] is not None)
+        passed = (within == [c for d, c in scan if d <= 500]
+                  and nearest == [c for d, c in scan[:3]]
+                  and site_rows == staffed)
+        test_result("PROXIMITY: Grid index matches haversine scan",
+                    passed, f"{len(within)} within 500 km, {site_rows} staffed site row(s)")
+    except Exception as e:
+        test_result("PROXIMITY: Grid index matches haversine scan", False, str(e))
+    
+    # Keyset paging returns every row of a listing in order, including rows
+    # whose sort key is NULL (avatar links without hours)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""UPDATE Avatar SET Total_Linked_Hours = NULL
+                          WHERE Link_Status = 'Active' ORDER BY Human_ID LIMIT 2""")
+        nulled = cursor.rowcount
+        cursor.execute(listing_query(AVATAR_LINKS_LISTING))
+        expected = [(r['Human_ID'], r['Navi_ID']) for r in cursor.fetchall()]
+        cursor.close()
+        paged = [(r['Human_ID'], r['Navi_ID'])
+                 for r in iter_listing(conn, AVATAR_LINKS_LISTING, page_size=1)]
+        conn.rollback()
+        test_result("PAGING: Keyset pages keep rows with NULL sort keys",
+                    paged == expected and nulled > 0,
+                    f"{len(paged)} of {len(expected)} rows, {nulled} with NULL hours")
+    except Exception as e:
+        conn.rollback()
+        test_result("PAGING: Keyset pages keep rows with NULL sort keys", False, str(e))
+    
+    # Paged listings sort on copied names; renames reach the copies, so the
+    # pages stay in the order of the joined tables' names
+    try:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE Clan SET Clan_Name = 'Aaa Renamed Clan' ORDER BY Clan_ID DESC LIMIT 1")
+        cursor.execute("UPDATE Alliance SET Name = 'Zzz Renamed Alliance' ORDER BY Alliance_ID LIMIT 1")
+        cursor.execute("""SELECT n.Navi_ID FROM Navi n JOIN Clan c ON n.Clan_ID = c.Clan_ID
+                          ORDER BY c.Clan_Name, c.Clan_ID, n.Name, n.Navi_ID""")
+        expected_navi = [r['Navi_ID'] for r in cursor.fetchall()]
+        cursor.execute("""SELECT p.Company_ID, p.Clan_ID FROM Partnership p
+                          JOIN Company co ON p.Company_ID = co.Company_ID
+                          JOIN Clan c ON p.Clan_ID = c.Clan_ID
+                          LEFT JOIN Alliance a ON p.Alliance_ID = a.Alliance_ID
+                          ORDER BY a.Name, co.Name, p.Company_ID, p.Clan_ID""")
+        expected_partners = [(r['Company_ID'], r['Clan_ID']) for r in cursor.fetchall()]
+        cursor.close()
+        paged_navi = [r['Navi_ID']
+                      for r in iter_listing(conn, NAVI_BONDED_ANIMALS_LISTING, page_size=2)]
+        paged_partners = [(r['Company_ID'], r['Clan_ID'])
+                          for r in iter_listing(conn, COMPANY_CLAN_PARTNERSHIPS_LISTING,
+                                                page_size=2)]
+        conn.rollback()
+        test_result("PAGING: Listings keep name order after renames",
+                    paged_navi == expected_navi and paged_partners == expected_partners,
+                    f"{len(paged_navi)} Na'vi, {len(paged_partners)} partnerships")
+    except Exception as e:
+        conn.rollback()
+        test_result("PAGING: Listings keep name order after renames", False, str(e))
+    
     # READ 9: Sites by Ecosystem
     test_read_operation(conn, "Sites by Ecosystem (3-table JOIN + GROUP_CONCAT)",
         """SELECT 
@@ -414,7 +554,7 @@ def main():
         """SELECT 
            e.Name as Ecosystem_Name, e.Biome_Type,
            COUNT(DISTINCT rm.Report_ID) as Total_Reports,
-           AVG(CAST(ro.Danger_Level_Observed as UNSIGNED)) as Avg_Danger_Level,
+           AVG(ro.Danger_Level) as Avg_Danger_Level,
            SUM(ro.Resource_Estimate_Change) as Total_Resource_Loss
            FROM Ecosystem e
            JOIN Aetherium_Site ae ON e.Eco_ID = ae.Eco_ID
@@ -425,6 +565,22 @@ def main():
            HAVING Total_Reports > 0
            ORDER BY Avg_Danger_Level DESC, Total_Resource_Loss DESC""")
     
+    # Trigger-maintained threat rollup agrees with the report tables, and a
+    # window covering all history matches the full analysis
+    try:
+        drift = check_threat_rollup(conn)
+        cursor = conn.cursor()
+        cursor.execute("SELECT TIMESTAMPDIFF(HOUR, MIN(Timestamp), NOW()) + 1 as hrs FROM Report_Meta")
+        hours = max(cursor.fetchone()['hrs'] or 1, 1)
+        cursor.close()
+        full = {r['Eco_ID']: r['Threat_Reports'] for r in ecosystem_threats(conn)}
+        windowed = {r['Eco_ID']: r['Threat_Reports'] for r in ecosystem_threats(conn, f"{hours}h")}
+        test_result("READ: Threat analysis by time window (hourly rollup)",
+                    not drift and windowed == full,
+                    f"{len(drift)} drifted bucket(s), {len(windowed)} ecosystem(s)")
+    except Exception as e:
+        test_result("READ: Threat analysis by time window (hourly rollup)", False, str(e))
+    
     # Step 6: Test WRITE operations
     print(f"\n{YELLOW}[STEP 5] Testing WRITE Operations (5 total){RESET}")
     
@@ -466,6 +622,18 @@ def main():
         (human_id, navi_id, 'Active', 10),
         f"SELECT * FROM Avatar WHERE Human_ID = {human_id} AND Navi_ID = {navi_id}")
     
+    # Unlinked pools: the human and Na'vi just linked drop out of the typeahead
+    try:
+        humans = available_humans(conn, "Hum", limit=50)
+        navis = available_navi(conn, "Test_", limit=50)
+        literal = available_navi(conn, "Test%", limit=50)
+        test_result("Avatar typeahead excludes linked operatives",
+                    human_id not in [h['Human_ID'] for h in humans]
+                    and navi_id not in [n['Navi_ID'] for n in navis] and not literal,
+                    f"{len(humans)} human(s), {len(navis)} Na'vi still available")
+    except Exception as e:
+        test_result("Avatar typeahead excludes linked operatives", False, str(e))
+    
     # WRITE 4: Update Site Status
     test_write_operation(conn, "Update Site Status (UPDATE)",
         """UPDATE Aetherium_Site 
@@ -474,6 +642,22 @@ def main():
         ('Depleted', None, 1),
         "SELECT Status FROM Aetherium_Site WHERE Site_ID = 1")
     
+    # Trigger-maintained summary must still match the sites it summarizes
+    cursor = conn.cursor()
+    cursor.execute("""SELECT COUNT(*) as cnt
+                      FROM Alliance a
+                      LEFT JOIN Alliance_Resource_Summary s ON s.Alliance_ID = a.Alliance_ID
+                      LEFT JOIN (SELECT Alliance_ID, COUNT(*) as Sites,
+                                        COALESCE(SUM(Resource_Quantity), 0) as Total
+                                 FROM Aetherium_Site WHERE Status = 'Claimed'
+                                 GROUP BY Alliance_ID) t ON t.Alliance_ID = a.Alliance_ID
+                      WHERE NOT (s.Sites_Controlled <=> COALESCE(t.Sites, 0))
+                         OR NOT (s.Total_Resources <=> COALESCE(t.Total, 0))""")
+    drifted = cursor.fetchone()['cnt']
+    cursor.close()
+    test_result("Alliance resource summary maintained by triggers", drifted == 0,
+                f"{drifted} alliance(s) out of date")
+    
     # WRITE 5: Update Company Ethics
     test_write_operation(conn, "Update Company Ethics (UPDATE)",
         """UPDATE Company 
@@ -482,6 +666,148 @@ def main():
         (5.5, 1),
         "SELECT Ethics_Rating FROM Company WHERE Company_ID = 1")
     
+    # Reference lists: loaded once, reloaded after a write to their table
+    try:
+        first = reference_list(conn, "companies")
+        cached = reference_list(conn, "companies") is first
+        update_company_ethics(conn, 1, 5.5)
+        reloaded = reference_list(conn, "companies")
+        test_result("CACHE: Company picker cached until a write",
+                    cached and reloaded is not first and len(reloaded) == len(first),
+                    f"{len(reloaded)} companies")
+    except Exception as e:
+        test_result("CACHE: Company picker cached until a write", False, str(e))
+    
+    # Delete preview: per-table counts must match what the DELETE would touch
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""SELECT a.Alliance_ID,
+                                 COUNT(DISTINCT c.Clan_ID) as Clans,
+                                 COUNT(DISTINCT ast.Site_ID) as Sites
+                          FROM Alliance a
+                          LEFT JOIN Clan c ON a.Alliance_ID = c.Alliance_ID
+                          LEFT JOIN Aetherium_Site ast ON a.Alliance_ID = ast.Alliance_ID
+                          GROUP BY a.Alliance_ID""")
+        expected = {row['Alliance_ID']: (row['Clans'], row['Sites']) for row in cursor.fetchall()}
+        cursor.execute("""SELECT COUNT(*) as cnt FROM War
+                          WHERE Attack_Alliance_ID = 1 OR Defense_Alliance_ID = 1""")
+        wars = cursor.fetchone()['cnt']
+        cursor.close()
+        impact = {row['Alliance_ID']: row for row in alliance_impact(conn)}
+        one = alliance_impact(conn, 1)
+        test_result("Delete Alliance impact preview (no fan-out)",
+                    {k: (v['Clans'], v['Sites']) for k, v in impact.items()} == expected
+                    and (not one or one[0]['Wars'] == wars),
+                    f"{len(impact)} alliance(s) previewed")
+    except Exception as e:
+        test_result("Delete Alliance impact preview (no fan-out)", False, str(e))
+    
+    # Bulk import: valid rows land with their own Soul, invalid rows are rejected
+    try:
+        records = [(1, {"F_Name": "Bulk", "L_Name": "One", "Company_ID": "1"}),
+                   (2, {"F_Name": "Bulk", "L_Name": "Two"}),
+                   (3, {"F_Name": "Bulk", "L_Name": ""}),
+                   (4, {"F_Name": "Bulk", "L_Name": "Four", "Company_ID": "99999"})]
+        imported, rejected = import_records(conn, "humans", iter(records), chunk_size=2)
+        cursor = conn.cursor()
+        cursor.execute("""SELECT COUNT(*) as cnt FROM Human h
+                          JOIN Soul s ON h.Soul_ID = s.Soul_ID
+                          WHERE h.F_Name = 'Bulk' AND s.State = 'Alive'""")
+        landed = cursor.fetchone()['cnt']
+        cursor.close()
+        test_result("BULK: Import Humans (multi-row INSERT)",
+                    (imported, rejected, landed) == (2, 2, 2),
+                    f"{imported} imported, {rejected} rejected")
+    except Exception as e:
+        test_result("BULK: Import Humans (multi-row INSERT)", False, str(e))
+    
+    # Report ingestion: one batch writes all three report tables and the rollup
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COALESCE(SUM(Reports), 0) as cnt FROM Ecosystem_Threat_Rollup")
+        reports_before = cursor.fetchone()['cnt']
+        cursor.close()
+        records = [{"Timestamp": "2154-06-01 08:15:00", "Threat_Description": "Ingest test",
+                    "Resource_Estimate_Change": -10, "Danger_Level_Observed": "6",
+                    "Sites": [1, 2]},
+                   {"Timestamp": "2154-06-01 09:40:00", "Threat_Description": "Ingest test",
+                    "Danger_Level_Observed": "3", "Sites": [2]}]
+        batch = [(i, clean_report(r, set(), {1, 2}), r) for i, r in enumerate(records, start=1)]
+        rejected = []
+        stored = load_batch(conn, batch, rejected)
+        cursor = conn.cursor()
+        cursor.execute("""SELECT COUNT(DISTINCT ro.Report_ID) as reports, COUNT(rs.Site_ID) as links
+                          FROM Report_Observation ro
+                          JOIN Report_Site rs ON rs.Report_ID = ro.Report_ID
+                          WHERE ro.Threat_Description = 'Ingest test'""")
+        landed = cursor.fetchone()
+        cursor.execute("SELECT COALESCE(SUM(Reports), 0) as cnt FROM Ecosystem_Threat_Rollup")
+        reports_after = cursor.fetchone()['cnt']
+        cursor.close()
+        test_result("INGEST: Report batch (Meta + Site + Observation)",
+                    stored == 2 and not rejected and (landed['reports'], landed['links']) == (2, 3)
+                    and reports_after > reports_before and not check_threat_rollup(conn),
+                    f"{stored} reports, {landed['links']} site links")
+    except Exception as e:
+        test_result("INGEST: Report batch (Meta + Site + Observation)", False, str(e))
+    
+    # Search: the FULLTEXT index already holds the reports ingested above
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""SELECT ro.Report_ID, MIN(s.Eco_ID) as Eco_ID
+                          FROM Report_Observation ro
+                          JOIN Report_Site rs ON rs.Report_ID = ro.Report_ID
+                          JOIN Aetherium_Site s ON s.Site_ID = rs.Site_ID
+                          WHERE ro.Threat_Description = 'Ingest test'
+                          GROUP BY ro.Report_ID""")
+        ingested = {row['Report_ID']: row['Eco_ID'] for row in cursor.fetchall()}
+        cursor.close()
+        found = search_reports(conn, "ingest", limit=1000)
+        eco_id = next(iter(ingested.values()))
+        in_eco = {r['Report_ID'] for r in search_reports(conn, "ingest", eco_id=eco_id, limit=1000)}
+        excluded = search_reports(conn, "+ingest -test", limit=1000, mode="boolean")
+        passed = (set(ingested) <= {r['Report_ID'] for r in found}
+                  and all('ingest' in r['Threat_Description'].lower() for r in found)
+                  and {rid for rid, eco in ingested.items() if eco == eco_id} <= in_eco
+                  and not set(ingested) & {r['Report_ID'] for r in excluded})
+        test_result("SEARCH: FULLTEXT report search (ranked, filtered)", passed,
+                    f"{len(found)} match(es), {len(in_eco)} in ecosystem {eco_id}")
+    except Exception as e:
+        test_result("SEARCH: FULLTEXT report search (ranked, filtered)", False, str(e))
+    
+    # Retention: archiving moves reports out of the hot tables, not out of the reports
+    try:
+        invalidate("Report_Observation")    # the ingest test above bypassed the cache
+        before = {r['Eco_ID']: r['Threat_Reports'] for r in ecosystem_threats(conn)}
+        archived = archive_reports(conn, "2155-01-01", batch_size=1)
+        after = {r['Eco_ID']: r['Threat_Reports'] for r in ecosystem_threats(conn)}
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) as cnt FROM Report_Meta WHERE Timestamp < '2155-01-01'")
+        hot_left = cursor.fetchone()['cnt']
+        cursor.close()
+        drift = check_threat_rollup(conn)
+        test_result("RETENTION: Archive old reports (partitioned tier)",
+                    archived == 2 and hot_left == 0 and after == before and not drift,
+                    f"{archived} archived, {len(drift)} drifted bucket(s)")
+    except Exception as e:
+        test_result("RETENTION: Archive old reports (partitioned tier)", False, str(e))
+    
+    # Retention: purging drops the archived years and only their rollup buckets
+    try:
+        dropped = purge_archive(conn, 2155)
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) as cnt FROM Ecosystem_Threat_Rollup "
+                       "WHERE Bucket_Start < '2155-01-01'")
+        buckets_left = cursor.fetchone()['cnt']
+        cursor.close()
+        drift = check_threat_rollup(conn)
+        test_result("RETENTION: Purge archived years",
+                    sorted(dropped) == ["Report_Archive.p2154", "Report_Site_Archive.p2154"]
+                    and buckets_left == 0 and not drift,
+                    f"dropped {', '.join(dropped) or 'nothing'}, {len(drift)} drifted bucket(s)")
+    except Exception as e:
+        test_result("RETENTION: Purge archived years", False, str(e))
+    
     # Step 7: Test constraints
     print(f"\n{YELLOW}[STEP 6] Testing Constraints & Data Integrity{RESET}")
     
@@ -540,6 +866,120 @@ def main():
         test_result("UNIQUE constraint on Soul (Human)", True, "Duplicate soul rejected")
         conn.rollback()
     
+    # Test generated numeric columns match their VARCHAR source, parsed the
+    # way migration 002 defines them; non-numeric text maps to NULL
+    try:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE Fights_In SET Strength = 'High' LIMIT 1")
+        cursor.execute("UPDATE Report_Observation SET Danger_Level_Observed = 'High' LIMIT 1")
+        cursor.execute("""SELECT COUNT(*) as cnt FROM Fights_In
+                          WHERE NOT (Strength_Value <=>
+                              CASE WHEN TRIM(Strength) REGEXP '^[0-9]{1,5}$'
+                                        AND CAST(TRIM(Strength) AS UNSIGNED) <= 65535
+                                   THEN CAST(TRIM(Strength) AS UNSIGNED) END)""")
+        strength_mismatches = cursor.fetchone()['cnt']
+        cursor.execute("""SELECT COUNT(*) as cnt FROM Report_Observation
+                          WHERE NOT (Danger_Level <=>
+                              CASE WHEN TRIM(Danger_Level_Observed) REGEXP '^[0-9]{1,3}$'
+                                        AND CAST(TRIM(Danger_Level_Observed) AS UNSIGNED) <= 255
+                                   THEN CAST(TRIM(Danger_Level_Observed) AS UNSIGNED) END)""")
+        danger_mismatches = cursor.fetchone()['cnt']
+        cursor.execute("""SELECT COUNT(*) as cnt FROM Fights_In
+                          WHERE Strength = 'High' AND Strength_Value IS NULL""")
+        text_nulls = cursor.fetchone()['cnt']
+        cursor.execute("""SELECT COUNT(*) as cnt FROM Report_Observation
+                          WHERE Danger_Level_Observed = 'High' AND Danger_Level IS NULL""")
+        text_nulls += cursor.fetchone()['cnt']
+        cursor.close()
+        conn.rollback()
+        test_result("Generated columns Strength_Value / Danger_Level",
+                    strength_mismatches == 0 and danger_mismatches == 0 and text_nulls == 2,
+                    f"{strength_mismatches + danger_mismatches} mismatched rows, "
+                    f"'High' -> NULL in {text_nulls} of 2")
+    except pymysql.Error as e:
+        conn.rollback()
+        test_result("Generated columns Strength_Value / Danger_Level", False, str(e))
+    
+    # Numbers too large for the generated column become NULL instead of
+    # failing the write
+    try:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE Fights_In SET Strength = '70000' LIMIT 1")
+        cursor.execute("SELECT Strength_Value FROM Fights_In WHERE Strength = '70000'")
+        strength = cursor.fetchone()
+        cursor.execute("""UPDATE Report_Observation
+                          SET Danger_Level_Observed = '300' LIMIT 1""")
+        cursor.execute("""SELECT Danger_Level FROM Report_Observation
+                          WHERE Danger_Level_Observed = '300'""")
+        danger = cursor.fetchone()
+        cursor.close()
+        conn.rollback()
+        test_result("Generated columns: out-of-range values map to NULL",
+                    strength is not None and strength['Strength_Value'] is None
+                    and danger is not None and danger['Danger_Level'] is None,
+                    "Strength '70000', Danger_Level_Observed '300'")
+    except pymysql.Error as e:
+        conn.rollback()
+        test_result("Generated columns: out-of-range values map to NULL", False, str(e))
+    
+    # Non-interactive batch mode: one JSON line in, one JSON line out per request
+    requests = io.StringIO(
+        '{"id": 1, "op": "war-history", "args": {"alliance_id": 1}}\n'
+        '{"id": 2, "op": "update-company-ethics", "args": {"company_id": 1, "rating": 5.5}}\n'
+        '{"id": 3, "op": "update-company-ethics", "args": {"company_id": 1, "rating": 42}}\n'
+        '{"id": 4, "op": ["war-history"], "args": {"alliance_id": 1}}\n')
+    responses = io.StringIO()
+    try:
+        failed = run_batch(conn, requests, responses)
+        answers = [json.loads(line) for line in responses.getvalue().splitlines()]
+        test_result("CLI: batch mode (JSON lines)",
+                    failed == 2 and [a["ok"] for a in answers] == [True, True, False, False]
+                    and answers[1]["result"]["updated"] in (0, 1),
+                    f"{len(answers)} responses, {failed} rejected as expected")
+    except Exception as e:
+        test_result("CLI: batch mode (JSON lines)", False, str(e))
+    
+    # Streaming export: every row of a read lands in the file, header included
+    export_path = "test_export.csv.gz"
+    try:
+        written = export(conn, "war-history", {"alliance_id": 1}, "csv", export_path,
+                         compression="gzip", chunk_size=2)
+        with gzip.open(export_path, "rt", encoding="utf-8") as f:
+            lines = sum(1 for _ in csv.reader(f))
+        cursor = conn.cursor()
+        cursor.execute(WAR_HISTORY_SQL, (1, 1))
+        expected = len(cursor.fetchall())
+        cursor.close()
+        test_result("EXPORT: War history to gzip CSV (chunked)",
+                    written == expected and lines == expected + 1,
+                    f"{written} rows written")
+    except Exception as e:
+        test_result("EXPORT: War history to gzip CSV (chunked)", False, str(e))
+    finally:
+        if os.path.exists(export_path):
+            os.remove(export_path)
+    
+    # Query profiling: timings per operation, slow statements logged with EXPLAIN
+    slow_log = "test_slow_queries.log"
+    PROFILER.enabled, PROFILER.slow_ms, PROFILER.slow_log = True, 0, slow_log
+    try:
+        with operation("TEST profiling"):
+            with conn.cursor(ProfiledDictCursor) as cur:
+                cur.execute("SELECT Soul_ID FROM Soul WHERE State = %s", ("Alive",))
+                alive = len(cur.fetchall())
+        stats = {row["operation"]: row for row in PROFILER.stats()}.get("TEST profiling", {})
+        with open(slow_log, encoding="utf-8") as log:
+            entry = json.loads(log.readlines()[-1])
+        test_result("Query profiling + slow-query log",
+                    stats.get("rows") == alive and isinstance(entry["explain"], dict),
+                    f"{stats.get('statements', 0)} statement(s), {stats.get('rows', 0)} rows")
+    except Exception as e:
+        test_result("Query profiling + slow-query log", False, str(e))
+    finally:
+        PROFILER.enabled = False
+        if os.path.exists(slow_log):
+            os.remove(slow_log)
+    
     # Final summary
     print(f"\n{BLUE}{'='*70}{RESET}")
     print(f"{GREEN}✓ Testing Complete!{RESET}")
@@ -552,7 +992,7 @@ def main():
     cursor.close()
     
     print("Summary:")
-    print(f"  • Schema: {table_count}/18 tables created")
+    print(f"  • Schema: {table_count} tables created (18 required)")
     if table_count < 18:
         print(f"    {YELLOW}Note: Some tables missing - check schema errors{RESET}")
     print(f"  • Data: All available tables populated")